@@ -1,18 +1,29 @@
 # study-assistant-backend/app/api/ai.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from app.core.deps import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.core.deps import get_current_user, get_owned_file
 from app.models.user import UserDB
-from app.services.ai_generator import AIGenerator
-from app.services.usage_tracker import UsageTracker
+from app.services.ai_generator import AIGenerator, run_ai_task
+from app.services.answer_cache import TutorAnswerCache, get_answer_cache
+from app.services.executor import AIExecutor, get_ai_executor
+from app.services.model_registry import get_model_registry
+from app.services.usage_tracker import FLASHCARD, QNA, UsageTracker, start_usage_tracker
 from app.db.mongodb import get_mongo_db
 from app.db.milvus import get_milvus_collection
 from app.crud.flashcards import FlashcardCRUD
 from app.crud.quizzes import QuizCRUD
-from app.crud.usage_logs import UsageLogCRUD
-from app.crud.files import FileCRUD
+from app.crud.file_contents import FileContentCRUD
+from app.crud.content_sections import ContentSectionCRUD
+from app.crud.generation_cache import GenerationCacheCRUD
+from app.crud.keyword_indexes import KeywordIndexCRUD
+from app.services.generation_planner import GenerationPlanner
+from app.services.hybrid_retrieval import HybridRetriever, get_keyword_index_store
+from app.services.retrieval_batcher import get_retrieval_batcher
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Callable, List
+import json
+import time
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -25,49 +36,99 @@ class TutorRequest(BaseModel):
     question: str
 
 def get_ai_generator():
-    """Dependency for the AI Generator service."""
-    return AIGenerator()
+    """Dependency for the AI Generator service, backed by the shared model registry."""
+    return AIGenerator(get_model_registry())
+
+def get_retriever(
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """Dependency for tutor retrieval: batched Milvus vector search fused with the document's keyword index."""
+    return HybridRetriever(
+        executor,
+        get_retrieval_batcher(),
+        get_keyword_index_store(),
+        KeywordIndexCRUD(db.keyword_indexes).get_index,
+        ContentSectionCRUD(db.content_sections).get_sections,
+    )
 
 def get_usage_tracker(db: AsyncIOMotorDatabase = Depends(get_mongo_db)):
-    """Dependency for the Usage Tracker service."""
-    return UsageTracker(UsageLogCRUD(db.usage_logs))
+    """Dependency for the process-wide Usage Tracker service."""
+    return start_usage_tracker(db)
+
+# Streamed flashcards and quizzes are persisted in batches of this size
+STREAM_PERSIST_BATCH = 5
+
+async def get_file_sections(db: AsyncIOMotorDatabase, file_id: str, user: UserDB) -> AsyncIterator[str]:
+    """
+    Returns a lazy iterator over the text sections of a file the user owns,
+    or raises 404. Sections are read from MongoDB as they are consumed.
+    """
+    file_doc = await get_owned_file(db, file_id, user)
+    content = await FileContentCRUD(db.file_contents).get_content(file_doc.content_hash)
+    if not content or content.status != "ready" or not content.section_count:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or text content is not available."
+        )
+    return ContentSectionCRUD(db.content_sections).iter_sections(content.id)
+
+async def stream_section_items(executor: AIExecutor, generate: Callable, sections: AsyncIterator[str]) -> AsyncIterator:
+    """Streams generated items section by section."""
+    async for section in sections:
+        async for item in executor.stream("cpu", generate, section):
+            yield item
+
+def sse_event(event: str, data) -> str:
+    """Formats one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_and_persist(items: AsyncIterator, save_batch) -> AsyncIterator[str]:
+    """Forwards generated items as SSE events, saving them in small batches as they arrive."""
+    batch: List = []
+    count = 0
+    async for item in items:
+        batch.append(item)
+        count += 1
+        yield sse_event("item", item.model_dump())
+        if len(batch) >= STREAM_PERSIST_BATCH:
+            await save_batch(batch)
+            batch = []
+    if batch:
+        await save_batch(batch)
+    yield sse_event("done", {"count": count})
 
 @router.post("/flashcards")
 async def generate_flashcards(
     request: FileProcessRequest,
-    background_tasks: BackgroundTasks,
     current_user: Annotated[UserDB, Depends(get_current_user)],
-    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
     usage_tracker: Annotated[UsageTracker, Depends(get_usage_tracker)],
     db: AsyncIOMotorDatabase = Depends(get_mongo_db)
 ):
     """
     Generates flashcards from an uploaded file.
     """
-    # Check usage limits
-    can_generate = await usage_tracker.check_flashcard_limit(current_user)
-    if not can_generate:
+    # Check and consume usage quota in one step
+    charged_day = await usage_tracker.try_consume(current_user, FLASHCARD)
+    if charged_day is None:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail="You have exceeded your flashcard generation limit. Please upgrade your plan."
         )
 
-    # Get the file content from MongoDB
-    files_crud = FileCRUD(db.files)
-    file_doc = await files_crud.get_file_by_id(request.file_id)
-    if not file_doc or not file_doc.text_content:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found or text content is not available."
-        )
+    try:
+        # Get the file content from MongoDB, one section at a time
+        sections = await get_file_sections(db, request.file_id, current_user)
 
-    # Generate and store flashcards
-    flashcard_crud = FlashcardCRUD(db.flashcards)
-    flashcards = ai_gen.generate_flashcards(file_doc.text_content)
-    await flashcard_crud.create_flashcards(request.file_id, flashcards)
-    
-    # Track usage in the background
-    background_tasks.add_task(usage_tracker.increment_flashcard_count, str(current_user.id))
+        # Generate flashcards for all sections in parallel, then merge and store them
+        planner = GenerationPlanner(executor, GenerationCacheCRUD(db.generation_cache))
+        flashcards = await planner.run("flashcards", sections)
+        flashcard_crud = FlashcardCRUD(db.flashcards)
+        await flashcard_crud.create_flashcards(request.file_id, flashcards)
+    except Exception:
+        await usage_tracker.refund(current_user, FLASHCARD, charged_day)
+        raise
     
     return {"message": "Flashcards generated successfully."}
 
@@ -76,7 +137,7 @@ async def generate_flashcards(
 async def generate_quizzes(
     request: FileProcessRequest,
     current_user: Annotated[UserDB, Depends(get_current_user)],
-    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
     db: AsyncIOMotorDatabase = Depends(get_mongo_db)
 ):
     """
@@ -89,16 +150,11 @@ async def generate_quizzes(
             detail="Quizzes are a premium feature. Please upgrade your plan to access them."
         )
     
-    files_crud = FileCRUD(db.files)
-    file_doc = await files_crud.get_file_by_id(request.file_id)
-    if not file_doc or not file_doc.text_content:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found or text content is not available."
-        )
+    sections = await get_file_sections(db, request.file_id, current_user)
 
+    planner = GenerationPlanner(executor, GenerationCacheCRUD(db.generation_cache))
+    quizzes = await planner.run("quizzes", sections)
     quiz_crud = QuizCRUD(db.quizzes)
-    quizzes = ai_gen.generate_quizzes(file_doc.text_content)
     await quiz_crud.create_quizzes(request.file_id, quizzes)
     
     return {"message": "Quizzes generated successfully."}
@@ -107,36 +163,191 @@ async def generate_quizzes(
 @router.post("/tutor")
 async def tutor_chat(
     request: TutorRequest,
-    background_tasks: BackgroundTasks,
     current_user: Annotated[UserDB, Depends(get_current_user)],
-    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
     usage_tracker: Annotated[UsageTracker, Depends(get_usage_tracker)],
+    answer_cache: Annotated[TutorAnswerCache, Depends(get_answer_cache)],
+    retriever: Annotated[HybridRetriever, Depends(get_retriever)],
     db: AsyncIOMotorDatabase = Depends(get_mongo_db)
 ):
     """
     Handles a Q&A session with the AI tutor.
+    Answers to repeated or near-identical questions are served from the answer cache.
     """
-    # Check usage limits
-    can_generate = await usage_tracker.check_qna_limit(current_user)
-    if not can_generate:
+    # Check and consume usage quota in one step
+    charged_day = await usage_tracker.try_consume(current_user, QNA)
+    if charged_day is None:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail="You have exceeded your Q&A limit. Please upgrade your plan."
         )
     
-    # Retrieve relevant text chunks from Milvus
-    milvus_collection = get_milvus_collection()
-    context = ai_gen.retrieve_context_from_milvus(
-        milvus_collection, request.question, request.file_id
-    )
-    
-    if not context:
-        return {"response": "I don't have enough information in the notes."}
+    try:
+        # Chunks are stored by content hash, shared by every upload of the same bytes
+        file_doc = await get_owned_file(db, request.file_id, current_user)
+
+        # Serve repeated questions without touching Milvus or the generator
+        cached = answer_cache.get_exact(file_doc.content_hash, request.question)
+        if cached is None:
+            question_vector = await retriever.batcher.embed(request.question)
+            cached = answer_cache.get_similar(file_doc.content_hash, question_vector)
+        if cached is not None:
+            return {"response": cached}
+
+        started = time.perf_counter()
+
+        # Retrieve relevant text chunks from the keyword index and Milvus
+        context = await retriever.retrieve_context(
+            get_milvus_collection(), request.question, file_doc.content_hash, question_vector=question_vector
+        )
     
-    # Generate the step-by-step response
-    response = ai_gen.generate_tutor_response(context, request.question)
+        if not context:
+            await usage_tracker.refund(current_user, QNA, charged_day)
+            return {"response": "I don't have enough information in the notes."}
     
-    # Track usage in the background
-    background_tasks.add_task(usage_tracker.increment_qna_count, str(current_user.id))
+        # Generate the step-by-step response
+        response = await executor.run("cpu", run_ai_task, "generate_tutor_response", context, request.question)
+        answer_cache.put(
+            file_doc.content_hash, request.question, question_vector, response, time.perf_counter() - started
+        )
+    except Exception:
+        await usage_tracker.refund(current_user, QNA, charged_day)
+        raise
+
+    return {"response": response}
+
+
+@router.post("/flashcards/stream")
+async def stream_flashcards(
+    request: FileProcessRequest,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
+    usage_tracker: Annotated[UsageTracker, Depends(get_usage_tracker)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """
+    Generates flashcards from an uploaded file, sending each one over SSE as soon as it is parsed.
+    """
+    charged_day = await usage_tracker.try_consume(current_user, FLASHCARD)
+    if charged_day is None:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="You have exceeded your flashcard generation limit. Please upgrade your plan."
+        )
+
+    try:
+        sections = await get_file_sections(db, request.file_id, current_user)
+    except HTTPException:
+        await usage_tracker.refund(current_user, FLASHCARD, charged_day)
+        raise
+    flashcard_crud = FlashcardCRUD(db.flashcards)
+
+    async def save_batch(batch):
+        await flashcard_crud.create_flashcards(request.file_id, batch)
+
+    async def events():
+        try:
+            items = stream_section_items(executor, ai_gen.stream_flashcards, sections)
+            async for event in stream_and_persist(items, save_batch):
+                yield event
+        except Exception:
+            await usage_tracker.refund(current_user, FLASHCARD, charged_day)
+            raise
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/quizzes/stream")
+async def stream_quizzes(
+    request: FileProcessRequest,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """
+    Generates quiz questions from an uploaded file, sending each one over SSE as soon as it is parsed.
+    """
+    if current_user.plan == "free":
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="Quizzes are a premium feature. Please upgrade your plan to access them."
+        )
+
+    sections = await get_file_sections(db, request.file_id, current_user)
+    quiz_crud = QuizCRUD(db.quizzes)
+
+    async def save_batch(batch):
+        await quiz_crud.create_quizzes(request.file_id, batch)
+
+    items = stream_section_items(executor, ai_gen.stream_quizzes, sections)
+    return StreamingResponse(stream_and_persist(items, save_batch), media_type="text/event-stream")
+
+
+@router.post("/tutor/stream")
+async def stream_tutor_chat(
+    request: TutorRequest,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    ai_gen: Annotated[AIGenerator, Depends(get_ai_generator)],
+    executor: Annotated[AIExecutor, Depends(get_ai_executor)],
+    usage_tracker: Annotated[UsageTracker, Depends(get_usage_tracker)],
+    answer_cache: Annotated[TutorAnswerCache, Depends(get_answer_cache)],
+    retriever: Annotated[HybridRetriever, Depends(get_retriever)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """
+    Handles a Q&A session with the AI tutor, streaming the answer over SSE as it is generated.
+    """
+    charged_day = await usage_tracker.try_consume(current_user, QNA)
+    if charged_day is None:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="You have exceeded your Q&A limit. Please upgrade your plan."
+        )
+
+    try:
+        file_doc = await get_owned_file(db, request.file_id, current_user)
+    except HTTPException:
+        await usage_tracker.refund(current_user, QNA, charged_day)
+        raise
+
+    async def events():
+        try:
+            async for event in answer_events():
+                yield event
+        except Exception:
+            await usage_tracker.refund(current_user, QNA, charged_day)
+            raise
+
+    async def answer_events():
+        cached = answer_cache.get_exact(file_doc.content_hash, request.question)
+        if cached is None:
+            question_vector = await retriever.batcher.embed(request.question)
+            cached = answer_cache.get_similar(file_doc.content_hash, question_vector)
+        if cached is not None:
+            yield sse_event("token", {"text": cached})
+            yield sse_event("done", {"cached": True})
+            return
+
+        started = time.perf_counter()
+        context = await retriever.retrieve_context(
+            get_milvus_collection(), request.question, file_doc.content_hash, question_vector=question_vector
+        )
+        if not context:
+            await usage_tracker.refund(current_user, QNA, charged_day)
+            yield sse_event("token", {"text": "I don't have enough information in the notes."})
+            yield sse_event("done", {"cached": False})
+            return
+
+        fragments = []
+        async for fragment in executor.stream("cpu", ai_gen.stream_tutor_response, context, request.question):
+            fragments.append(fragment)
+            yield sse_event("token", {"text": fragment})
+        answer_cache.put(
+            file_doc.content_hash, request.question, question_vector, "".join(fragments),
+            time.perf_counter() - started
+        )
+        yield sse_event("done", {"cached": False})
 
-    return {"response": response}
\ No newline at end of file
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -2,28 +2,53 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.models.user import UserCreate, UserDB
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.models.user import UserCreate, UserPublic
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_password,
+)
 from app.crud.users import UserCRUD
 from app.db.mongodb import get_mongo_db
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter()
 
-@router.post("/signup", response_model=UserDB)
+def hasher_busy_error() -> HTTPException:
+    """503 response telling clients to back off while the hashing pool is saturated."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+def email_taken_error() -> HTTPException:
+    """409 response for an email that already has an account, whether caught by the pre-check or the unique index."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Email already registered"
+    )
+
+@router.post("/signup", response_model=UserPublic)
 async def signup(user: UserCreate, db: AsyncIOMotorDatabase = Depends(get_mongo_db)):
     """Registers a new user with a hashed password."""
     users_crud = UserCRUD(db.users)
     
     existing_user = await users_crud.get_user_by_email(user.email)
     if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
+        raise email_taken_error()
     
-    hashed_password = get_password_hash(user.password)
-    new_user = await users_crud.create_user(user, hashed_password)
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_error()
+    try:
+        new_user = await users_crud.create_user(user, hashed_password)
+    except DuplicateKeyError:
+        # A concurrent signup with the same email won the unique index
+        raise email_taken_error()
     
     if not new_user:
         raise HTTPException(
@@ -39,12 +64,23 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncIOMot
     users_crud = UserCRUD(db.users)
     user = await users_crud.get_user_by_email(form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    is_valid, new_hash = False, None
+    if user:
+        try:
+            is_valid, new_hash = await verify_and_update_password(form_data.password, user.password_hash)
+        except PasswordHasherBusy:
+            raise hasher_busy_error()
+
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Re-hash with the current cost factor when the stored hash is outdated
+    if new_hash:
+        await users_crud.update_password_hash(str(user.id), new_hash)
         
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -1,18 +1,51 @@
 # study-assistant-backend/app/api/files.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from app.core.deps import get_current_user
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.core.config import EXPORT_BATCH_SIZE, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.core.deps import get_current_user, get_owned_file
 from app.models.user import UserDB
 from app.crud.files import FileCRUD
+from app.crud.flashcards import FlashcardCRUD
+from app.crud.quizzes import QuizCRUD
 from app.db.mongodb import get_mongo_db
-from app.services.file_processor import process_and_embed_file
+from app.crud.file_contents import FileContentCRUD
+from app.crud.jobs import JobCRUD
+from app.services.file_processor import release_file_content
+from app.services.ingestion_queue import cancel_ingestion, enqueue_ingestion
+from app.utils.uploads import UploadTooLarge, spool_upload
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Annotated, List
-import shutil
+from pydantic import BaseModel
+from typing import Annotated, AsyncIterator, Literal, Optional
+import asyncio
 import os
 
 router = APIRouter()
 
+PageSize = Annotated[int, Query(ge=1, le=PAGE_SIZE_MAX)]
+ReadFormat = Literal["json", "ndjson"]
+
+
+async def read_page(get_page, owner_id: str, limit: int, cursor: Optional[str]) -> dict:
+    """Fetches one keyset page, mapping a malformed cursor to a 400."""
+    try:
+        items, next_cursor = await get_page(owner_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def ndjson_response(items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Streams models one JSON document per line, never holding the full result set."""
+    async def lines():
+        async for item in items:
+            yield item.model_dump_json(by_alias=True) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/upload")
 async def upload_file(
     file: Annotated[UploadFile, File()], 
@@ -20,7 +53,8 @@ async def upload_file(
     db: AsyncIOMotorDatabase = Depends(get_mongo_db)
 ):
     """
-    Uploads a file, saves it, and starts the text extraction and embedding process.
+    Uploads a file, saves it, and queues the text extraction and embedding process.
+    Returns immediately with a job id that can be polled for progress.
     """
     files_crud = FileCRUD(db.files)
     
@@ -33,31 +67,78 @@ async def upload_file(
             detail="Invalid file type. Only PDF, DOCX, and TXT are allowed."
         )
 
-    # Save the file to a temporary location
+    # Stream the file to a unique spool path, hashing it as it is written
     try:
-        temp_dir = "./temp_uploads"
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_file_path = os.path.join(temp_dir, file.filename)
-        
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        spooled = await spool_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {e}"
         )
 
-    # Create a database record for the file
-    new_file_db = await files_crud.create_file(str(current_user.id), file.filename)
+    # Create a database record for the file, linked to its content by hash
+    new_file_db = await files_crud.create_file(str(current_user.id), file.filename, spooled.sha256)
+    contents_crud = FileContentCRUD(db.file_contents)
+    content = await contents_crud.acquire(spooled.sha256)
+
+    # Identical bytes were already ingested (or are being ingested): reuse them
+    if not await contents_crud.claim_ingestion(spooled.sha256):
+        await asyncio.to_thread(os.remove, spooled.path)
+        return {
+            "message": "File uploaded; matching content was already processed.",
+            "file_id": str(new_file_db.id),
+            "job_id": None,
+            "status": content.status
+        }
 
-    # Start the async processing
-    # Note: For production, you would use a dedicated background task queue like Celery.
-    # We'll use a simple async call for this example.
-    await process_and_embed_file(
-        temp_file_path, str(current_user.id), str(new_file_db.id), db
-    )
+    # Queue the processing; the in-process ingestion workers pick it up from MongoDB
+    try:
+        job = await enqueue_ingestion(
+            db, spooled.path, str(current_user.id), str(new_file_db.id), spooled.sha256
+        )
+    except Exception:
+        # No job will process the claimed content; release the claim so the next upload retries it
+        await contents_crud.mark_failed(spooled.sha256)
+        await asyncio.to_thread(os.remove, spooled.path)
+        raise
     
-    return {"message": "File uploaded and processing started.", "file_id": str(new_file_db.id)}
+    return {
+        "message": "File uploaded and processing started.",
+        "file_id": str(new_file_db.id),
+        "job_id": job.id,
+        "status": "pending"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """
+    Returns the status of a file processing job.
+    """
+    jobs_crud = JobCRUD(db.jobs)
+    job = await jobs_crud.get_job_by_id(job_id)
+    if not job or job.payload.get("user_id") != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found."
+        )
+    return {
+        "job_id": job.id,
+        "file_id": job.payload.get("file_id"),
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error
+    }
 
 
 @router.get("/list")
@@ -70,4 +151,82 @@ async def list_files(
     """
     files_crud = FileCRUD(db.files)
     files = await files_crud.get_all_files_by_user(str(current_user.id))
-    return files
\ No newline at end of file
+    return files
+
+
+@router.get("/")
+async def read_files(
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db),
+    limit: PageSize = PAGE_SIZE_DEFAULT,
+    cursor: Optional[str] = None,
+    format: ReadFormat = "json",
+    batch_size: PageSize = EXPORT_BATCH_SIZE
+):
+    """
+    Lists the current user's files newest first, one page at a time.
+    Pass the returned next_cursor to get the following page, or
+    format=ndjson to stream every file as newline-delimited JSON.
+    """
+    files_crud = FileCRUD(db.files)
+    user_id = str(current_user.id)
+    if format == "ndjson":
+        return ndjson_response(files_crud.iter_files(user_id, batch_size))
+    return await read_page(files_crud.get_files_page, user_id, limit, cursor)
+
+
+@router.get("/{file_id}/flashcards")
+async def read_flashcards(
+    file_id: str,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db),
+    limit: PageSize = PAGE_SIZE_DEFAULT,
+    cursor: Optional[str] = None,
+    format: ReadFormat = "json",
+    batch_size: PageSize = EXPORT_BATCH_SIZE
+):
+    """
+    Lists a file's saved flashcards in creation order, paginated like GET /files/.
+    """
+    await get_owned_file(db, file_id, current_user)
+    flashcards_crud = FlashcardCRUD(db.flashcards)
+    if format == "ndjson":
+        return ndjson_response(flashcards_crud.iter_flashcards(file_id, batch_size))
+    return await read_page(flashcards_crud.get_flashcards_page, file_id, limit, cursor)
+
+
+@router.get("/{file_id}/quizzes")
+async def read_quizzes(
+    file_id: str,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db),
+    limit: PageSize = PAGE_SIZE_DEFAULT,
+    cursor: Optional[str] = None,
+    format: ReadFormat = "json",
+    batch_size: PageSize = EXPORT_BATCH_SIZE
+):
+    """
+    Lists a file's saved quiz questions in creation order, paginated like GET /files/.
+    """
+    await get_owned_file(db, file_id, current_user)
+    quizzes_crud = QuizCRUD(db.quizzes)
+    if format == "ndjson":
+        return ndjson_response(quizzes_crud.iter_quizzes(file_id, batch_size))
+    return await read_page(quizzes_crud.get_quizzes_page, file_id, limit, cursor)
+
+
+@router.delete("/{file_id}")
+async def delete_file(
+    file_id: str,
+    current_user: Annotated[UserDB, Depends(get_current_user)],
+    db: AsyncIOMotorDatabase = Depends(get_mongo_db)
+):
+    """
+    Deletes a file. Its text and embeddings are removed once no other file shares them.
+    """
+    await get_owned_file(db, file_id, current_user)
+    files_crud = FileCRUD(db.files)
+    deleted = await files_crud.delete_file(file_id)
+    if deleted and await release_file_content(db, deleted.content_hash):
+        await cancel_ingestion(db, deleted.content_hash)
+    return {"message": "File deleted."}
\ No newline at end of file
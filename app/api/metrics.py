@@ -0,0 +1,162 @@
+# study-assistant-backend/app/api/metrics.py
+
+import re
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.security import hashing_stats, token_cache
+from app.db.milvus import get_milvus_collection
+from app.services.answer_cache import get_answer_cache
+from app.services.embedding_cache import get_embedding_cache
+from app.services.embedding_pipeline import pipeline_stats
+from app.services.executor import get_ai_executor
+from app.services.hybrid_retrieval import get_keyword_index_store, retrieval_stats
+from app.services.metrics import Histogram, metrics
+from app.services.model_registry import model_registry_stats
+from app.services.profiler import get_slow_request_profiler
+from app.services.retrieval_batcher import retrieval_batcher_stats
+from app.services.usage_tracker import usage_tracker_stats
+from app.services.user_cache import user_cache
+from app.utils.uploads import upload_stats
+from typing import Dict, List, Tuple
+
+router = APIRouter()
+
+PREFIX = "app"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_NAME_PART = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+Labels = Dict[str, str]
+
+
+def service_stats() -> Dict[str, dict]:
+    """The counters each service already keeps, by section."""
+    collection = get_milvus_collection()
+    profiler = get_slow_request_profiler()
+    return {
+        "executor": get_ai_executor().stats(),
+        "model_registry": model_registry_stats(),
+        "embedding_cache": get_embedding_cache().stats(),
+        "embedding_pipeline": pipeline_stats.snapshot(),
+        "answer_cache": get_answer_cache().stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hashing": hashing_stats(),
+        "uploads": upload_stats.snapshot(),
+        "usage": usage_tracker_stats(),
+        "retrieval": retrieval_stats.snapshot(),
+        "retrieval_batcher": retrieval_batcher_stats(),
+        "keyword_indexes": get_keyword_index_store().stats(),
+        "milvus_pool": collection.stats() if collection is not None else {},
+        "profiler": profiler.stats() if profiler is not None else {},
+    }
+
+
+class _Exposition:
+    """Collects samples by metric family and renders the Prometheus text format."""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def add(self, name: str, kind: str, help_text: str, labels: Labels, value: float, suffix: str = ""):
+        family = self._families.setdefault(name, (kind, help_text, []))
+        family[2].append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def add_histogram(self, name: str, help_text: str, labels: Labels, histogram: Histogram):
+        for bound, count in histogram.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            self.add(name, "histogram", help_text, {**labels, "le": le}, count, "_bucket")
+        self.add(name, "histogram", help_text, labels, histogram.sum, "_sum")
+        self.add(name, "histogram", help_text, labels, histogram.count, "_count")
+
+    def add_stats(self, name: str, value, labels: Labels, info: Labels):
+        """Flattens a stats dict: numbers become samples, strings become labels of an info sample."""
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            self.add(name, "untyped", "", labels, value)
+        elif isinstance(value, str):
+            info[name] = value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                key = str(key)
+                if _NAME_PART.fullmatch(key):
+                    self.add_stats(f"{name}_{key}", item, labels, info)
+                else:
+                    # Bucket sizes, model names and the like are labels, not name parts
+                    self.add_stats(name, item, {**labels, "key": key}, info)
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help_text, samples) in self._families.items():
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics() -> str:
+    """Renders request, stage, event-loop and service metrics in the Prometheus text format."""
+    exposition = _Exposition()
+    snapshot = metrics.snapshot()
+
+    for (method, route, status), histogram in snapshot["requests"].items():
+        exposition.add_histogram(
+            f"{PREFIX}_http_request_duration_seconds", "HTTP request latency by route template.",
+            {"method": method, "route": route, "status": status}, histogram,
+        )
+    exposition.add(
+        f"{PREFIX}_http_requests_in_flight", "gauge", "HTTP requests being served.", {}, snapshot["requests_in_flight"]
+    )
+
+    for stage, stage_metrics in snapshot["stages"].items():
+        exposition.add_histogram(
+            f"{PREFIX}_stage_duration_seconds", "Latency of one stage of request handling or ingestion.",
+            {"stage": stage}, stage_metrics.latency,
+        )
+    for stage, stage_metrics in snapshot["stages"].items():
+        exposition.add(
+            f"{PREFIX}_stage_in_flight", "gauge", "Calls of a stage currently running.", {"stage": stage},
+            stage_metrics.in_flight,
+        )
+    for stage, stage_metrics in snapshot["stages"].items():
+        exposition.add(
+            f"{PREFIX}_stage_errors_total", "counter", "Calls of a stage that raised.", {"stage": stage},
+            stage_metrics.errors,
+        )
+
+    exposition.add_histogram(
+        f"{PREFIX}_event_loop_lag_seconds", "How late event-loop timers fire.", {}, snapshot["loop_lag"]
+    )
+    exposition.add(
+        f"{PREFIX}_event_loop_lag_max_seconds", "gauge", "Largest event-loop lag seen.", {}, snapshot["max_loop_lag"]
+    )
+
+    for section, stats in service_stats().items():
+        info: Labels = {}
+        prefix = f"{PREFIX}_{section}"
+        exposition.add_stats(prefix, stats, {}, info)
+        if info:
+            labels = {name[len(prefix) + 1:]: value for name, value in info.items()}
+            exposition.add(f"{prefix}_info", "gauge", "", labels, 1)
+    return exposition.render()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Prometheus scrape endpoint. Not authenticated; keep it off the public ingress."""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
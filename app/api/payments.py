@@ -0,0 +1,6 @@
+# study-assistant-backend/app/api/payments.py
+
+from fastapi import APIRouter
+
+# Payment endpoints are not implemented yet; the router is mounted so the app boots
+router = APIRouter()
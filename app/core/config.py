@@ -0,0 +1,136 @@
+# study-assistant-backend/app/core/config.py
+
+import os
+
+# Model registry configuration
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+GENERATION_MODEL_NAME = os.getenv("GENERATION_MODEL_NAME", "google/flan-t5-base")
+MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", 4))
+# A streamed generation that produces no token for this long is abandoned
+GENERATION_STREAM_TIMEOUT_SECONDS = float(os.getenv("GENERATION_STREAM_TIMEOUT_SECONDS", 60))
+# Load the models in the master of a pre-fork server (gunicorn.conf.py) so
+# forked workers share the weights copy-on-write instead of loading their own
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "true").lower() in ("1", "true", "yes")
+
+# AI executor configuration
+# "thread" shares the warm models from the registry; "process" gives each worker its own copy
+AI_CPU_EXECUTOR_MODE = os.getenv("AI_CPU_EXECUTOR_MODE", "thread")
+AI_IO_WORKERS = int(os.getenv("AI_IO_WORKERS", 8))
+AI_CPU_WORKERS = int(os.getenv("AI_CPU_WORKERS", 2))
+AI_IO_CONCURRENCY = int(os.getenv("AI_IO_CONCURRENCY", 16))
+AI_CPU_CONCURRENCY = int(os.getenv("AI_CPU_CONCURRENCY", 4))
+
+# Background ingestion queue configuration
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", 2))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", 3))
+INGESTION_LEASE_SECONDS = int(os.getenv("INGESTION_LEASE_SECONDS", 300))
+INGESTION_POLL_SECONDS = float(os.getenv("INGESTION_POLL_SECONDS", 1.0))
+INGESTION_RETRY_DELAY_SECONDS = int(os.getenv("INGESTION_RETRY_DELAY_SECONDS", 30))
+
+# Upload configuration
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "./temp_uploads")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 50 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 1024 * 1024))
+
+# Milvus configuration
+MILVUS_HOST = os.getenv("MILVUS_HOST", "localhost")
+MILVUS_PORT = os.getenv("MILVUS_PORT", "19530")
+MILVUS_COLLECTION_NAME = os.getenv("MILVUS_COLLECTION_NAME", "document_chunks")
+# gRPC connections shared by the I/O threads that talk to Milvus
+MILVUS_POOL_SIZE = int(os.getenv("MILVUS_POOL_SIZE", 4))
+# Partition-key partitions for new collections (hashed on content_hash); 0 disables
+MILVUS_PARTITIONS = int(os.getenv("MILVUS_PARTITIONS", 64))
+MILVUS_REPLICAS = int(os.getenv("MILVUS_REPLICAS", 1))
+# Vector index for new collections: IVF_FLAT or HNSW
+MILVUS_INDEX_TYPE = os.getenv("MILVUS_INDEX_TYPE", "IVF_FLAT")
+MILVUS_NLIST = int(os.getenv("MILVUS_NLIST", 1024))
+MILVUS_HNSW_M = int(os.getenv("MILVUS_HNSW_M", 16))
+MILVUS_HNSW_EF_CONSTRUCTION = int(os.getenv("MILVUS_HNSW_EF_CONSTRUCTION", 200))
+# Default search effort; can be overridden per query
+MILVUS_SEARCH_NPROBE = int(os.getenv("MILVUS_SEARCH_NPROBE", 10))
+MILVUS_SEARCH_EF = int(os.getenv("MILVUS_SEARCH_EF", 64))
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", 384))
+
+# Text chunking configuration
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1000))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 200))
+
+# Embedding cache configuration (an empty EMBEDDING_CACHE_DIR disables the disk tier)
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "./embedding_cache")
+# The disk tier keeps its newest half once its vector file grows past this
+EMBEDDING_CACHE_DISK_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024))
+
+# Ingestion embedding pipeline configuration
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 64))
+MILVUS_INSERT_BATCH_SIZE = int(os.getenv("MILVUS_INSERT_BATCH_SIZE", 2048))
+
+# Tutor answer cache configuration
+TUTOR_CACHE_TTL_SECONDS = int(os.getenv("TUTOR_CACHE_TTL_SECONDS", 3600))
+TUTOR_CACHE_SIMILARITY = float(os.getenv("TUTOR_CACHE_SIMILARITY", 0.92))
+TUTOR_CACHE_MAX_PER_FILE = int(os.getenv("TUTOR_CACHE_MAX_PER_FILE", 256))
+TUTOR_CACHE_MAX_FILES = int(os.getenv("TUTOR_CACHE_MAX_FILES", 1024))
+
+# Authentication cache configuration
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+
+# Password hashing configuration
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+# Usage accounting configuration
+FREE_DAILY_QNA_LIMIT = int(os.getenv("FREE_DAILY_QNA_LIMIT", 20))
+FREE_DAILY_FLASHCARD_LIMIT = int(os.getenv("FREE_DAILY_FLASHCARD_LIMIT", 3))
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", 5.0))
+# "database" uses one atomic MongoDB round trip per request and stays exact across
+# worker processes; "memory" enforces limits per process with write-behind, so it
+# only holds for a single worker (each worker would admit up to the limit)
+USAGE_ENFORCEMENT = os.getenv("USAGE_ENFORCEMENT", "database")
+
+# MongoDB configuration
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "study_assistant")
+# Explain a representative query per index at startup and log any the planner skips
+MONGO_VERIFY_INDEXES = os.getenv("MONGO_VERIFY_INDEXES", "false").lower() in ("1", "true", "yes")
+
+# Extracted text is stored as ordered sections of roughly this many characters
+CONTENT_SECTION_CHARS = int(os.getenv("CONTENT_SECTION_CHARS", 8000))
+
+# Section-level generation planner configuration
+GENERATION_FANOUT = int(os.getenv("GENERATION_FANOUT", 4))
+GENERATION_DEDUP_SIMILARITY = float(os.getenv("GENERATION_DEDUP_SIMILARITY", 0.9))
+# Bump when prompts or parsing change so cached section results are regenerated
+GENERATOR_VERSION = os.getenv("GENERATOR_VERSION", "1")
+# Cached section results expire this long after they were generated (a TTL index;
+# changing it later needs a collMod on generation_cache's created_ttl index)
+GENERATION_CACHE_TTL_SECONDS = int(os.getenv("GENERATION_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+
+# Paginated read API configuration
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+
+# Hybrid (keyword + vector) tutor retrieval configuration
+KEYWORD_INDEX_CACHE_MAX_BYTES = int(os.getenv("KEYWORD_INDEX_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# How many candidates each retriever contributes before fusion
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", 60))
+# Answer from the keyword index alone when its best chunk matches every query
+# term and outscores the runner-up by this factor; 0 always consults Milvus
+HYBRID_LOCAL_MARGIN = float(os.getenv("HYBRID_LOCAL_MARGIN", 1.5))
+
+# Cross-request batching of tutor retrieval: questions arriving within the
+# wait window are embedded in one forward pass and searched together
+RETRIEVAL_BATCH_MAX_SIZE = int(os.getenv("RETRIEVAL_BATCH_MAX_SIZE", 32))
+RETRIEVAL_BATCH_WAIT_MS = float(os.getenv("RETRIEVAL_BATCH_WAIT_MS", 5))
+
+# Instrumentation: event-loop lag sampling interval (0 disables)
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", 0.5))
+# Opt-in sampling profiler that logs the hottest stacks of slow requests
+PROFILE_SLOW_REQUESTS = os.getenv("PROFILE_SLOW_REQUESTS", "false").lower() in ("1", "true", "yes")
+PROFILE_SLOW_REQUEST_SECONDS = float(os.getenv("PROFILE_SLOW_REQUEST_SECONDS", 1.0))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 10))
+PROFILE_MAX_PROFILES = int(os.getenv("PROFILE_MAX_PROFILES", 20))
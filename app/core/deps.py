@@ -3,16 +3,24 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.core.security import decode_access_token
+from app.crud.files import FileCRUD
 from app.crud.users import UserCRUD
 from app.db.mongodb import get_mongo_db
+from app.models.file import FileInDB
 from app.models.user import UserDB
+from app.services.metrics import timed
+from app.services.user_cache import user_cache
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Annotated
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
+@timed("auth.get_current_user")
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> UserDB:
-    """Dependency to retrieve the current authenticated user."""
+    """
+    Dependency to retrieve the current authenticated user.
+    Users are served from a short-lived cache to avoid a MongoDB lookup per request.
+    """
     payload = decode_access_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(
@@ -27,7 +35,7 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     db = get_mongo_db()
     users_crud = UserCRUD(db.users)
     
-    user = await users_crud.get_user_by_id(user_id)
+    user = await user_cache.get_or_load(user_id, users_crud.get_user_by_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,4 +43,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_owned_file(db: AsyncIOMotorDatabase, file_id: str, user: UserDB) -> FileInDB:
+    """Loads a file record, answering 404 if it is missing or belongs to another user."""
+    file_doc = await FileCRUD(db.files).get_file_by_id(file_id)
+    if not file_doc or file_doc.user_id != str(user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found."
+        )
+    return file_doc
@@ -0,0 +1,66 @@
+# study-assistant-backend/app/core/middleware.py
+
+import time
+from app.services.metrics import begin_request_stages, end_request_stages, metrics
+from app.services.profiler import get_slow_request_profiler
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. "/api/v1/files/{file_id}".
+    FastAPI versions that keep included routers nested leave the route's
+    template relative to its router, so the literal prefix the router
+    matched is taken back from the front of the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    path_regex = getattr(route, "path_regex", None)
+    if template is None or path_regex is None:
+        return "unmatched"
+    path = scope["path"]
+    for start, char in enumerate(path):
+        if char == "/" and path_regex.match(path[start:]):
+            return path[:start] + template
+    return template
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, status and in-flight count for every HTTP request.
+
+    Requests are labelled by route template ("/api/v1/files/{file_id}"),
+    not by raw path, so the number of series stays bounded. Timing runs
+    until the last body chunk is sent, so streamed responses count in full.
+    A plain ASGI middleware, so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = get_slow_request_profiler()
+        samples = profiler.begin() if profiler is not None else None
+        stages_token = begin_request_stages()
+        metrics.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            route = route_template(scope)
+            metrics.request_finished(scope["method"], route, status, seconds)
+            stages = end_request_stages(stages_token)
+            if samples is not None:
+                profiler.end(samples, scope["method"], route, status, seconds, stages)
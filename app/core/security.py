@@ -2,18 +2,48 @@
 
 import jwt
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
 import os
+import time
+from app.core.config import (
+    TOKEN_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+)
+from app.utils.ttl_cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Pinning min/max rounds to the configured cost makes
+# needs_update() flag any hash made with a different cost, so changing
+# BCRYPT_ROUNDS migrates users as they log in.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread pool gives real parallelism
+_hash_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending_hashes = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing operations are already queued."""
 
 # JWT configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRY_MINUTES", 60))
 
+# Verified token payloads, so repeated requests with the same token skip signature checks
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain-text password against a hashed one."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -22,6 +52,31 @@ def get_password_hash(password: str) -> str:
     """Hashes a plain-text password."""
     return pwd_context.hash(password)
 
+async def _run_hash(fn, *args):
+    """Runs a bcrypt operation on the hashing pool, refusing work beyond the queue limit."""
+    global _pending_hashes
+    if _pending_hashes >= PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy("Password hashing is saturated, try again shortly.")
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, fn, *args)
+    finally:
+        _pending_hashes -= 1
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes a password without blocking the event loop."""
+    return await _run_hash(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash uses outdated settings,
+    returns a fresh hash to store in its place.
+    """
+    return await _run_hash(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def hashing_stats() -> dict:
+    return {"workers": PASSWORD_HASH_WORKERS, "pending": _pending_hashes, "max_pending": PASSWORD_HASH_MAX_PENDING}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a JWT access token."""
     to_encode = data.copy()
@@ -35,8 +90,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Decodes and validates a JWT access token."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
     except jwt.PyJWTError:
-        return None
\ No newline at end of file
+        return None
+    # Never serve a cached payload past the token's own expiry
+    expires_in = payload.get("exp", 0) - time.time() if "exp" in payload else None
+    if expires_in is None or expires_in > 0:
+        token_cache.set(token, payload, expires_in)
+    return payload
\ No newline at end of file
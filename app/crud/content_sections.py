@@ -0,0 +1,48 @@
+# study-assistant-backend/app/crud/content_sections.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import AsyncIterator, Dict, List
+from app.services.metrics import instrumented
+
+@instrumented("mongo.content_sections")
+class ContentSectionCRUD:
+    """Extracted document text, stored as ordered sections per content hash."""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def insert_sections(self, content_hash: str, first_seq: int, texts: List[str]) -> bool:
+        """Appends consecutive sections starting at sequence number first_seq."""
+        if not texts:
+            return False
+        section_docs = [
+            {"content_hash": content_hash, "seq": first_seq + offset, "text": text}
+            for offset, text in enumerate(texts)
+        ]
+        result = await self.collection.insert_many(section_docs, ordered=False)
+        return len(result.inserted_ids) == len(section_docs)
+
+    async def iter_sections(self, content_hash: str, batch_size: int = 8) -> AsyncIterator[str]:
+        """Lazily yields a document's sections in order, a few at a time."""
+        cursor = self.collection.find(
+            {"content_hash": content_hash}, {"_id": 0, "text": 1}
+        ).sort("seq", 1).batch_size(batch_size)
+        async for section_doc in cursor:
+            yield section_doc["text"]
+
+    async def get_sections(self, content_hash: str, seqs: List[int]) -> Dict[int, str]:
+        """Fetches some of a document's sections by sequence number, in one query."""
+        if not seqs:
+            return {}
+        cursor = self.collection.find(
+            {"content_hash": content_hash, "seq": {"$in": seqs}}, {"_id": 0, "seq": 1, "text": 1}
+        )
+        return {section_doc["seq"]: section_doc["text"] async for section_doc in cursor}
+
+    async def has_sections(self, content_hash: str) -> bool:
+        return await self.collection.find_one({"content_hash": content_hash}, {"_id": 1}) is not None
+
+    async def delete_sections(self, content_hash: str) -> int:
+        """Removes all sections of a document."""
+        result = await self.collection.delete_many({"content_hash": content_hash})
+        return result.deleted_count
@@ -0,0 +1,102 @@
+# study-assistant-backend/app/crud/file_contents.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from app.models.file import FileContentInDB
+from datetime import datetime
+from typing import Optional
+from app.services.metrics import instrumented
+
+# Text now lives in content_sections; keep legacy inline text out of every read
+WITHOUT_TEXT = {"text_content": 0}
+
+@instrumented("mongo.file_contents")
+class FileContentCRUD:
+    """Reference-counted, content-addressed storage for extracted documents."""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def acquire(self, content_hash: str) -> FileContentInDB:
+        """Adds a reference to the content, creating the entry if it is new."""
+        content_doc = await self.collection.find_one_and_update(
+            {"_id": content_hash},
+            {
+                "$inc": {"ref_count": 1},
+                "$setOnInsert": {
+                    "status": "new",
+                    "chunk_count": 0,
+                    "created_at": datetime.utcnow(),
+                },
+            },
+            upsert=True,
+            projection=WITHOUT_TEXT,
+            return_document=ReturnDocument.AFTER,
+        )
+        return FileContentInDB(**content_doc)
+
+    async def claim_ingestion(self, content_hash: str) -> bool:
+        """
+        Atomically moves new or previously failed content to "pending".
+        Only the caller that gets True should ingest it.
+        """
+        result = await self.collection.update_one(
+            {"_id": content_hash, "status": {"$in": ["new", "failed"]}},
+            {"$set": {"status": "pending"}},
+        )
+        return result.modified_count > 0
+
+    async def get_content(self, content_hash: str) -> Optional[FileContentInDB]:
+        """Retrieves the shared content metadata for a hash."""
+        content_doc = await self.collection.find_one({"_id": content_hash}, WITHOUT_TEXT)
+        if content_doc:
+            return FileContentInDB(**content_doc)
+        return None
+
+    async def mark_ready(
+        self, content_hash: str, chunk_count: int, section_count: int, text_length: int, page_count: Optional[int]
+    ) -> bool:
+        """
+        Records the document's metadata once its sections and chunks are
+        stored. Returns False if the entry is gone, i.e. every file using the
+        content was deleted while it was being ingested.
+        """
+        result = await self.collection.update_one(
+            {"_id": content_hash},
+            {
+                "$set": {
+                    "status": "ready",
+                    "chunk_count": chunk_count,
+                    "section_count": section_count,
+                    "text_length": text_length,
+                    "page_count": page_count,
+                },
+                "$unset": {"text_content": ""},
+            },
+        )
+        return result.matched_count > 0
+
+    async def mark_failed(self, content_hash: str) -> bool:
+        """Flags content whose ingestion gave up, so the next upload retries it."""
+        result = await self.collection.update_one(
+            {"_id": content_hash, "status": "pending"},
+            {"$set": {"status": "failed"}},
+        )
+        return result.modified_count > 0
+
+    async def release(self, content_hash: str) -> bool:
+        """
+        Drops a reference. Returns True if it was the last one and the entry was
+        removed, in which case the caller owns cleaning up the embeddings.
+        """
+        content_doc = await self.collection.find_one_and_update(
+            {"_id": content_hash},
+            {"$inc": {"ref_count": -1}},
+            projection={"ref_count": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not content_doc or content_doc["ref_count"] > 0:
+            return False
+        # Conditional so a concurrent acquire between the two calls keeps the entry alive
+        result = await self.collection.delete_one({"_id": content_hash, "ref_count": {"$lte": 0}})
+        return result.deleted_count > 0
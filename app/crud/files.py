@@ -3,29 +3,39 @@
 from motor.motor_asyncio import AsyncIOMotorCollection
 from app.models.file import FileInDB
 from bson import ObjectId
-from typing import Optional, List
+from typing import AsyncIterator, List, Optional, Tuple
+from app.utils.pagination import encode_cursor, keyset_query, keyset_sort
+from app.services.metrics import instrumented
 
+# Listings only need metadata; never pull document bodies (including legacy text_content fields)
+METADATA_PROJECTION = {"text_content": 0}
+
+@instrumented("mongo.files")
 class FileCRUD:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
 
-    async def create_file(self, user_id: str, filename: str) -> FileInDB:
-        """Creates a new file entry in the database."""
+    async def create_file(self, user_id: str, filename: str, content_hash: str) -> FileInDB:
+        """
+        Creates a new file entry in the database. The extracted text and
+        embeddings live in the shared content entry keyed by content_hash.
+        """
         file_doc = {
             "user_id": user_id,
             "filename": filename,
-            "text_content": None,
+            "content_hash": content_hash,
             "created_at": ObjectId().generation_time
         }
         result = await self.collection.insert_one(file_doc)
-        file_doc["_id"] = result.inserted_id
+        file_doc["_id"] = str(result.inserted_id)
         return FileInDB(**file_doc)
 
     async def get_file_by_id(self, file_id: str) -> Optional[FileInDB]:
         """Retrieves a single file document by its ID."""
         try:
-            file_doc = await self.collection.find_one({"_id": ObjectId(file_id)})
+            file_doc = await self.collection.find_one({"_id": ObjectId(file_id)}, METADATA_PROJECTION)
             if file_doc:
+                file_doc["_id"] = str(file_doc["_id"])
                 return FileInDB(**file_doc)
         except Exception:
             return None
@@ -34,11 +44,45 @@ class FileCRUD:
     async def get_all_files_by_user(self, user_id: str) -> List[FileInDB]:
         """Retrieves all files uploaded by a specific user."""
         files = []
-        async for file_doc in self.collection.find({"user_id": user_id}).sort("created_at", -1):
+        async for file_doc in self.collection.find({"user_id": user_id}, METADATA_PROJECTION).sort("created_at", -1):
+            file_doc["_id"] = str(file_doc["_id"])
             files.append(FileInDB(**file_doc))
         return files
 
-    async def delete_file(self, file_id: str) -> bool:
-        """Deletes a file document from the database."""
-        result = await self.collection.delete_one({"_id": ObjectId(file_id)})
-        return result.deleted_count > 0
\ No newline at end of file
+    async def delete_file(self, file_id: str) -> Optional[FileInDB]:
+        """
+        Deletes a file document from the database and returns it, so the caller
+        can release its shared content.
+        """
+        file_doc = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(file_id)}, projection=METADATA_PROJECTION
+        )
+        if file_doc:
+            file_doc["_id"] = str(file_doc["_id"])
+            return FileInDB(**file_doc)
+        return None
+
+    async def get_files_page(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[FileInDB], Optional[str]]:
+        """
+        Returns up to `limit` files for a user, newest first, starting after
+        `cursor`, plus the cursor for the next page (None on the last page).
+        Raises ValueError for a malformed cursor.
+        """
+        query = keyset_query({"user_id": user_id}, cursor, descending=True)
+        page = []
+        async for doc in self.collection.find(query, METADATA_PROJECTION).sort(keyset_sort(True)).limit(limit + 1):
+            doc["_id"] = str(doc["_id"])
+            page.append(FileInDB(**doc))
+        if len(page) <= limit:
+            return page, None
+        last = page[limit - 1]
+        return page[:limit], encode_cursor(last.created_at, last.id)
+
+    async def iter_files(self, user_id: str, batch_size: int) -> AsyncIterator[FileInDB]:
+        """Streams every file for a user with a bounded cursor batch size."""
+        cursor = self.collection.find({"user_id": user_id}, METADATA_PROJECTION).sort(keyset_sort(True)).batch_size(batch_size)
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            yield FileInDB(**doc)
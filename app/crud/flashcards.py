@@ -3,8 +3,11 @@
 from motor.motor_asyncio import AsyncIOMotorCollection
 from app.models.flashcard import FlashcardBase, FlashcardInDB
 from bson import ObjectId
-from typing import Optional, List
+from typing import AsyncIterator, List, Optional, Tuple
+from app.utils.pagination import encode_cursor, keyset_query, keyset_sort
+from app.services.metrics import instrumented
 
+@instrumented("mongo.flashcards")
 class FlashcardCRUD:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
@@ -30,5 +33,31 @@ class FlashcardCRUD:
         """Retrieves all flashcards for a specific file."""
         flashcards = []
         async for fc_doc in self.collection.find({"file_id": file_id}).sort("created_at", 1):
+            fc_doc["_id"] = str(fc_doc["_id"])
             flashcards.append(FlashcardInDB(**fc_doc))
-        return flashcards
\ No newline at end of file
+        return flashcards
+
+    async def get_flashcards_page(
+        self, file_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[FlashcardInDB], Optional[str]]:
+        """
+        Returns up to `limit` flashcards for a file, in creation order, starting after
+        `cursor`, plus the cursor for the next page (None on the last page).
+        Raises ValueError for a malformed cursor.
+        """
+        query = keyset_query({"file_id": file_id}, cursor, descending=False)
+        page = []
+        async for doc in self.collection.find(query).sort(keyset_sort(False)).limit(limit + 1):
+            doc["_id"] = str(doc["_id"])
+            page.append(FlashcardInDB(**doc))
+        if len(page) <= limit:
+            return page, None
+        last = page[limit - 1]
+        return page[:limit], encode_cursor(last.created_at, last.id)
+
+    async def iter_flashcards(self, file_id: str, batch_size: int) -> AsyncIterator[FlashcardInDB]:
+        """Streams every flashcard for a file with a bounded cursor batch size."""
+        cursor = self.collection.find({"file_id": file_id}).sort(keyset_sort(False)).batch_size(batch_size)
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            yield FlashcardInDB(**doc)
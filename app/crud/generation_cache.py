@@ -0,0 +1,29 @@
+# study-assistant-backend/app/crud/generation_cache.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from datetime import datetime
+from typing import List, Optional
+from app.services.metrics import instrumented
+
+@instrumented("mongo.generation_cache")
+class GenerationCacheCRUD:
+    """
+    Generated flashcards or quiz items per section, keyed by kind, generator
+    version and section hash. Sections are shared by every document that
+    contains them, so entries are not deleted with a document; the TTL index
+    on created_at (app.db.indexes) expires them instead.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def get_items(self, key: str) -> Optional[List[dict]]:
+        """Returns the cached items for a key, or None on a miss."""
+        cache_doc = await self.collection.find_one({"_id": key}, {"items": 1})
+        return cache_doc["items"] if cache_doc else None
+
+    async def put_items(self, key: str, items: List[dict]) -> bool:
+        result = await self.collection.replace_one(
+            {"_id": key}, {"_id": key, "items": items, "created_at": datetime.utcnow()}, upsert=True
+        )
+        return result.acknowledged
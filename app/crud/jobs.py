@@ -0,0 +1,169 @@
+# study-assistant-backend/app/crud/jobs.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from app.models.job import JobInDB
+from bson import ObjectId
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.services.metrics import instrumented
+
+@instrumented("mongo.jobs")
+class JobCRUD:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def create_job(self, kind: str, payload: dict, max_attempts: int = 3) -> JobInDB:
+        """Enqueues a new job."""
+        now = datetime.utcnow()
+        job_doc = {
+            "kind": kind,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "available_at": now,
+            "lease_expires_at": None,
+            "worker_id": None,
+        }
+        result = await self.collection.insert_one(job_doc)
+        job_doc["_id"] = str(result.inserted_id)
+        return JobInDB(**job_doc)
+
+    async def get_job_by_id(self, job_id: str) -> Optional[JobInDB]:
+        """Retrieves a single job by its ID."""
+        try:
+            job_doc = await self.collection.find_one({"_id": ObjectId(job_id)})
+            if job_doc:
+                job_doc["_id"] = str(job_doc["_id"])
+                return JobInDB(**job_doc)
+        except Exception:
+            return None
+        return None
+
+    async def claim_next(self, kind: str, worker_id: str, lease_seconds: int) -> Optional[JobInDB]:
+        """
+        Atomically claims the oldest runnable job. A job is runnable when it is
+        queued and due, or when it is running under a lease that has expired
+        and has attempts left, which is how jobs held by a crashed worker get
+        picked up again. A job that keeps killing its worker stops being
+        reclaimed once its attempts run out; see fail_exhausted_leases().
+        """
+        now = datetime.utcnow()
+        job_doc = await self.collection.find_one_and_update(
+            {
+                "kind": kind,
+                "$or": [
+                    {"status": "queued", "available_at": {"$lte": now}},
+                    {
+                        "status": "running",
+                        "lease_expires_at": {"$lt": now},
+                        "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                    },
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not job_doc:
+            return None
+        job_doc["_id"] = str(job_doc["_id"])
+        return JobInDB(**job_doc)
+
+    async def fail_exhausted_leases(self, kind: str) -> List[JobInDB]:
+        """
+        Marks running jobs whose lease expired on their last attempt as failed
+        and returns them. Each job is flipped by a single conditional update,
+        so only one caller gets it back even when several workers sweep at once.
+        """
+        now = datetime.utcnow()
+        expired = {
+            "kind": kind,
+            "status": "running",
+            "lease_expires_at": {"$lt": now},
+            "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+        }
+        failed = []
+        async for job_doc in self.collection.find(expired, {"_id": 1}):
+            job_doc = await self.collection.find_one_and_update(
+                {**expired, "_id": job_doc["_id"]},
+                {
+                    "$set": {
+                        "status": "failed",
+                        "error": "lease expired on the last attempt",
+                        "lease_expires_at": None,
+                        "worker_id": None,
+                        "updated_at": now,
+                    }
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if job_doc:
+                job_doc["_id"] = str(job_doc["_id"])
+                failed.append(JobInDB(**job_doc))
+        return failed
+
+    async def cancel_queued(self, kind: str, payload_match: dict, reason: str) -> List[JobInDB]:
+        """
+        Marks queued jobs whose payload matches as failed, so no worker claims
+        them, and returns them. Jobs already running are left to finish.
+        """
+        query = {"kind": kind, "status": "queued", **{f"payload.{key}": value for key, value in payload_match.items()}}
+        cancelled = []
+        async for job_doc in self.collection.find(query, {"_id": 1}):
+            job_doc = await self.collection.find_one_and_update(
+                {**query, "_id": job_doc["_id"]},
+                {"$set": {"status": "failed", "error": reason, "updated_at": datetime.utcnow()}},
+                return_document=ReturnDocument.AFTER,
+            )
+            if job_doc:
+                job_doc["_id"] = str(job_doc["_id"])
+                cancelled.append(JobInDB(**job_doc))
+        return cancelled
+
+    async def extend_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Pushes back the lease of a job this worker still owns."""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": "running", "worker_id": worker_id},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=lease_seconds), "updated_at": now}},
+        )
+        return result.modified_count > 0
+
+    async def mark_done(self, job_id: str, worker_id: str) -> bool:
+        """Marks a job this worker still owns as successfully completed."""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": "running", "worker_id": worker_id},
+            {"$set": {"status": "done", "error": None, "lease_expires_at": None, "updated_at": datetime.utcnow()}},
+        )
+        return result.modified_count > 0
+
+    async def mark_failed(self, job: JobInDB, error: str, retry_delay_seconds: int) -> bool:
+        """
+        Records a failed attempt of a job this worker still owns. The job is
+        requeued after a delay until it runs out of attempts, then marked as
+        failed for good.
+        """
+        now = datetime.utcnow()
+        update = {"error": error, "lease_expires_at": None, "worker_id": None, "updated_at": now}
+        if job.attempts < job.max_attempts:
+            update["status"] = "queued"
+            update["available_at"] = now + timedelta(seconds=retry_delay_seconds)
+        else:
+            update["status"] = "failed"
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job.id), "status": "running", "worker_id": job.worker_id}, {"$set": update}
+        )
+        return result.modified_count > 0
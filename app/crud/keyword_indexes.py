@@ -0,0 +1,25 @@
+# study-assistant-backend/app/crud/keyword_indexes.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Optional
+from app.services.metrics import instrumented
+
+@instrumented("mongo.keyword_indexes")
+class KeywordIndexCRUD:
+    """Serialized per-document BM25 indexes, keyed by content hash."""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def put_index(self, content_hash: str, index_doc: dict) -> bool:
+        result = await self.collection.replace_one(
+            {"_id": content_hash}, {**index_doc, "_id": content_hash}, upsert=True
+        )
+        return result.acknowledged
+
+    async def get_index(self, content_hash: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": content_hash})
+
+    async def delete_index(self, content_hash: str) -> bool:
+        result = await self.collection.delete_one({"_id": content_hash})
+        return result.deleted_count > 0
@@ -3,8 +3,11 @@
 from motor.motor_asyncio import AsyncIOMotorCollection
 from app.models.quiz import QuizBase, QuizInDB
 from bson import ObjectId
-from typing import Optional, List
+from typing import AsyncIterator, List, Optional, Tuple
+from app.utils.pagination import encode_cursor, keyset_query, keyset_sort
+from app.services.metrics import instrumented
 
+@instrumented("mongo.quizzes")
 class QuizCRUD:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
@@ -33,5 +36,31 @@ class QuizCRUD:
         """Retrieves all quiz questions for a specific file."""
         quizzes = []
         async for qz_doc in self.collection.find({"file_id": file_id}).sort("created_at", 1):
+            qz_doc["_id"] = str(qz_doc["_id"])
             quizzes.append(QuizInDB(**qz_doc))
-        return quizzes
\ No newline at end of file
+        return quizzes
+
+    async def get_quizzes_page(
+        self, file_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[QuizInDB], Optional[str]]:
+        """
+        Returns up to `limit` quizzes for a file, in creation order, starting after
+        `cursor`, plus the cursor for the next page (None on the last page).
+        Raises ValueError for a malformed cursor.
+        """
+        query = keyset_query({"file_id": file_id}, cursor, descending=False)
+        page = []
+        async for doc in self.collection.find(query).sort(keyset_sort(False)).limit(limit + 1):
+            doc["_id"] = str(doc["_id"])
+            page.append(QuizInDB(**doc))
+        if len(page) <= limit:
+            return page, None
+        last = page[limit - 1]
+        return page[:limit], encode_cursor(last.created_at, last.id)
+
+    async def iter_quizzes(self, file_id: str, batch_size: int) -> AsyncIterator[QuizInDB]:
+        """Streams every quiz question for a file with a bounded cursor batch size."""
+        cursor = self.collection.find({"file_id": file_id}).sort(keyset_sort(False)).batch_size(batch_size)
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            yield QuizInDB(**doc)
@@ -1,55 +1,88 @@
 # study-assistant-backend/app/crud/usage_logs.py
 
 from motor.motor_asyncio import AsyncIOMotorCollection
-from app.models.usage_logs import UsageLogBase, UsageLogInDB
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from app.services.metrics import instrumented
 
+COUNTER_FIELDS = ("qna_count", "flashcard_count")
+
+@instrumented("mongo.usage_logs")
 class UsageLogCRUD:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
 
-    async def get_or_create_daily_log(self, user_id: str) -> UsageLogInDB:
+    async def try_consume(self, user_id: str, kind: str, limit: Optional[int]) -> Optional[str]:
         """
-        Retrieves the daily usage log for a user, or creates a new one if it doesn't exist.
+        Atomically increments today's `kind` counter ("qna" or "flashcard") if
+        it is below `limit`, in a single round trip, and returns the date it
+        charged (pass it to refund) or None if the user is at the limit. When the user is at the
+        limit, the filter misses and the upsert collides with the unique
+        (user_id, date) index from app.db.indexes; the increment is then
+        retried once without upsert, and None means that retry missed too.
         """
+        if limit is not None and limit <= 0:
+            # The upsert below would create the day's log and count one use
+            return None
+        field = f"{kind}_count"
         today_str = date.today().isoformat()
-        
-        log_doc = await self.collection.find_one({
-            "user_id": user_id,
-            "date": today_str
-        })
-        
-        if log_doc:
-            return UsageLogInDB(**log_doc)
-        
-        # If no log exists for today, create a new one
-        new_log = {
-            "user_id": user_id,
-            "date": today_str,
-            "qna_count": 0,
-            "flashcard_count": 0
-        }
-        result = await self.collection.insert_one(new_log)
-        new_log["_id"] = result.inserted_id
-        return UsageLogInDB(**new_log)
+        query = {"user_id": user_id, "date": today_str}
+        if limit is not None:
+            query[field] = {"$lt": limit}
+        try:
+            await self.collection.find_one_and_update(
+                query,
+                {
+                    "$inc": {field: 1},
+                    "$setOnInsert": {other: 0 for other in COUNTER_FIELDS if other != field}
+                },
+                upsert=True,
+                projection={"_id": 1}
+            )
+        except DuplicateKeyError:
+            # Also raised when a concurrent first request of the day inserted the
+            # log first; MongoDB only retries upserts whose filter is pure equality
+            # on the unique key, so retry the conditional increment once ourselves
+            result = await self.collection.update_one(query, {"$inc": {field: 1}})
+            return today_str if result.matched_count > 0 else None
+        return today_str
 
-    async def increment_qna_count(self, user_id: str) -> bool:
-        """Increments the Q&A usage count for the current day."""
-        today_str = date.today().isoformat()
+    async def refund(self, user_id: str, kind: str, day: str) -> bool:
+        """
+        Gives back one unit consumed by try_consume, e.g. when generation
+        failed. `day` is the date try_consume charged, which is no longer
+        today if the request ran past midnight.
+        """
+        field = f"{kind}_count"
         result = await self.collection.update_one(
-            {"user_id": user_id, "date": today_str},
-            {"$inc": {"qna_count": 1}},
-            upsert=True
+            {"user_id": user_id, "date": day, field: {"$gt": 0}},
+            {"$inc": {field: -1}}
         )
-        return result.modified_count > 0 or result.upserted_id is not None
+        return result.modified_count > 0
 
-    async def increment_flashcard_count(self, user_id: str) -> bool:
-        """Increments the flashcard usage count for the current day."""
-        today_str = date.today().isoformat()
-        result = await self.collection.update_one(
-            {"user_id": user_id, "date": today_str},
-            {"$inc": {"flashcard_count": 1}},
-            upsert=True
+    async def get_daily_counts(self, user_ids: List[str], day: str) -> Dict[str, dict]:
+        """Returns the stored counters for several users on one day, keyed by user id."""
+        counts = {}
+        cursor = self.collection.find(
+            {"user_id": {"$in": user_ids}, "date": day},
+            {"_id": 0, "user_id": 1, "qna_count": 1, "flashcard_count": 1}
         )
-        return result.modified_count > 0 or result.upserted_id is not None
\ No newline at end of file
+        async for log_doc in cursor:
+            counts[log_doc["user_id"]] = log_doc
+        return counts
+
+    async def apply_deltas(self, deltas: Dict[Tuple[str, str], Dict[str, int]]) -> bool:
+        """
+        Adds aggregated counter deltas, keyed by (user_id, date), in a single
+        unordered bulk write.
+        """
+        if not deltas:
+            return True
+        operations = [
+            UpdateOne({"user_id": user_id, "date": day}, {"$inc": fields}, upsert=True)
+            for (user_id, day), fields in deltas.items()
+        ]
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.acknowledged
\ No newline at end of file
@@ -0,0 +1,60 @@
+# study-assistant-backend/app/crud/users.py
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.models.user import UserCreate, UserDB
+from app.services.user_cache import user_cache
+from bson import ObjectId
+from typing import Optional
+from app.services.metrics import instrumented
+
+@instrumented("mongo.users")
+class UserCRUD:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def create_user(self, user: UserCreate, hashed_password: str) -> Optional[UserDB]:
+        """Creates a new user with an already hashed password."""
+        user_doc = {
+            "email": user.email,
+            "password_hash": hashed_password,
+            "plan": "free",
+            "created_at": ObjectId().generation_time
+        }
+        result = await self.collection.insert_one(user_doc)
+        if not result.inserted_id:
+            return None
+        user_doc["_id"] = str(result.inserted_id)
+        return UserDB(**user_doc)
+
+    async def get_user_by_email(self, email: str) -> Optional[UserDB]:
+        """Retrieves a user by email address."""
+        user_doc = await self.collection.find_one({"email": email})
+        if user_doc:
+            user_doc["_id"] = str(user_doc["_id"])
+            return UserDB(**user_doc)
+        return None
+
+    async def get_user_by_id(self, user_id: str) -> Optional[UserDB]:
+        """Retrieves a user by ID."""
+        try:
+            user_doc = await self.collection.find_one({"_id": ObjectId(user_id)})
+        except Exception:
+            return None
+        if user_doc:
+            user_doc["_id"] = str(user_doc["_id"])
+            return UserDB(**user_doc)
+        return None
+
+    async def update_plan(self, user_id: str, plan: str) -> bool:
+        """Changes a user's subscription plan."""
+        result = await self.collection.update_one({"_id": ObjectId(user_id)}, {"$set": {"plan": plan}})
+        user_cache.invalidate(user_id)
+        return result.modified_count > 0
+
+    async def update_password_hash(self, user_id: str, hashed_password: str) -> bool:
+        """Replaces a user's password hash."""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(user_id)}, {"$set": {"password_hash": hashed_password}}
+        )
+        user_cache.invalidate(user_id)
+        return result.modified_count > 0
@@ -0,0 +1,117 @@
+# study-assistant-backend/app/db/indexes.py
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, List
+from app.core.config import GENERATION_CACHE_TTL_SECONDS
+
+# Every index the CRUD layer relies on, by collection. Names are fixed so
+# that creating them again at each startup is a no-op.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "files": [
+        # Includes _id so keyset pagination on (created_at, _id) is a pure index walk
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created_id"),
+        IndexModel([("content_hash", ASCENDING)], name="content_hash"),
+    ],
+    "content_sections": [
+        IndexModel([("content_hash", ASCENDING), ("seq", ASCENDING)], unique=True, name="content_seq"),
+    ],
+    "flashcards": [
+        IndexModel([("file_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="file_created_id"),
+    ],
+    "quizzes": [
+        IndexModel([("file_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="file_created_id"),
+    ],
+    "usage_logs": [
+        # Also backs UsageLogCRUD.try_consume, which relies on duplicate-key errors
+        IndexModel([("user_id", ASCENDING), ("date", ASCENDING)], unique=True, name="user_date_unique"),
+    ],
+    "jobs": [
+        IndexModel([("kind", ASCENDING), ("status", ASCENDING), ("available_at", ASCENDING)], name="kind_status_due"),
+    ],
+    "generation_cache": [
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=GENERATION_CACHE_TTL_SECONDS, name="created_ttl"),
+    ],
+}
+
+# A representative query per index, used to check the planner actually picks it
+EXPLAIN_QUERIES = {
+    ("files", "user_created_id"): ({"user_id": "probe"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("flashcards", "file_created_id"): ({"file_id": "probe"}, [("created_at", ASCENDING), ("_id", ASCENDING)]),
+    ("quizzes", "file_created_id"): ({"file_id": "probe"}, [("created_at", ASCENDING), ("_id", ASCENDING)]),
+    ("usage_logs", "user_date_unique"): ({"user_id": "probe", "date": "1970-01-01"}, None),
+    ("files", "content_hash"): ({"content_hash": "probe"}, None),
+    ("content_sections", "content_seq"): ({"content_hash": "probe"}, [("seq", ASCENDING)]),
+    ("jobs", "kind_status_due"): ({"kind": "probe", "status": "queued"}, [("available_at", ASCENDING)]),
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[dict]]:
+    """
+    Creates all indexes. Safe to run on every startup.
+
+    A unique index that documents written before it existed already violate
+    cannot be built. It is skipped rather than failing startup, and the
+    duplicated keys are returned by "collection.index" so they can be
+    reported; benchmarks/dedupe_unique_keys.py merges them.
+    """
+    conflicts = {}
+    for collection_name, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection_name].create_indexes([index])
+            except DuplicateKeyError:
+                groups = await find_duplicate_keys(db, collection_name, index)
+                conflicts[f"{collection_name}.{index.document['name']}"] = [group["_id"] for group in groups]
+    return conflicts
+
+
+async def find_duplicate_keys(db: AsyncIOMotorDatabase, collection_name: str, index: IndexModel) -> List[dict]:
+    """
+    Groups of documents sharing a value of the index's key, as
+    {"_id": {field: value, ...}, "ids": [oldest first], "count": n}.
+    """
+    fields = list(index.document["key"])
+    pipeline = [
+        {"$sort": {"_id": ASCENDING}},
+        {"$group": {"_id": {field: f"${field}" for field in fields}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    return await db[collection_name].aggregate(pipeline, allowDiskUse=True).to_list(None)
+
+
+def get_index(collection_name: str, index_name: str) -> IndexModel:
+    """Returns the definition of one of the indexes above."""
+    return next(index for index in INDEXES[collection_name] if index.document["name"] == index_name)
+
+
+def _index_names(plan: dict) -> List[str]:
+    names = []
+    if plan.get("indexName"):
+        names.append(plan["indexName"])
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            names.extend(_index_names(plan[key]))
+    for child in plan.get("inputStages", []):
+        names.extend(_index_names(child))
+    return names
+
+
+async def verify_indexes(db: AsyncIOMotorDatabase) -> Dict[str, bool]:
+    """
+    Runs explain() for each representative query and reports whether the
+    winning plan uses the expected index, keyed by "collection.index".
+    """
+    results = {}
+    for (collection_name, index_name), (query, sort) in EXPLAIN_QUERIES.items():
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        winning_plan = explanation["queryPlanner"]["winningPlan"]
+        results[f"{collection_name}.{index_name}"] = index_name in _index_names(winning_plan)
+    return results
@@ -0,0 +1,170 @@
+# study-assistant-backend/app/db/milvus.py
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from app.core.config import (
+    MILVUS_HOST, MILVUS_PORT, MILVUS_COLLECTION_NAME, EMBEDDING_DIM,
+    MILVUS_POOL_SIZE, MILVUS_PARTITIONS, MILVUS_REPLICAS,
+    MILVUS_INDEX_TYPE, MILVUS_NLIST, MILVUS_HNSW_M, MILVUS_HNSW_EF_CONSTRUCTION,
+    MILVUS_SEARCH_NPROBE, MILVUS_SEARCH_EF,
+)
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+# pymilvus pulls in pandas and the gRPC stubs; it is imported when the
+# connection opens, not when the routers are imported
+if TYPE_CHECKING:
+    from pymilvus import Collection
+
+logger = logging.getLogger(__name__)
+
+# Build parameters per supported index type, and the search parameter each one tunes
+INDEX_PARAMS = {
+    "IVF_FLAT": {"nlist": MILVUS_NLIST},
+    "HNSW": {"M": MILVUS_HNSW_M, "efConstruction": MILVUS_HNSW_EF_CONSTRUCTION},
+}
+SEARCH_PARAMS = {
+    "IVF_FLAT": {"nprobe": MILVUS_SEARCH_NPROBE},
+    "HNSW": {"ef": MILVUS_SEARCH_EF},
+}
+
+
+class PooledCollection:
+    """
+    The chunk collection behind a pool of Milvus connections.
+
+    Each call checks out one connection for its duration, so concurrent
+    searches and inserts from the I/O threads run on separate channels
+    instead of queueing on a single one. Exposes the subset of the pymilvus
+    Collection API the services use.
+    """
+
+    def __init__(self, name: str, aliases: List[str]):
+        from pymilvus import Collection
+
+        self.name = name
+        self.aliases = aliases
+        self._idle: "queue.Queue[Collection]" = queue.Queue()
+        for alias in aliases:
+            self._idle.put(Collection(name, using=alias))
+        probe = self._idle.queue[0]
+        self.index_type = probe.indexes[0].params.get("index_type", MILVUS_INDEX_TYPE) if probe.indexes else MILVUS_INDEX_TYPE
+        self.partition_key = any(getattr(field, "is_partition_key", False) for field in probe.schema.fields)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+
+    @contextmanager
+    def connection(self) -> Iterator["Collection"]:
+        """Checks out a connection, waiting for one if all are busy."""
+        try:
+            collection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.waits += 1
+            collection = self._idle.get()
+        with self._lock:
+            self.checkouts += 1
+        try:
+            yield collection
+        finally:
+            self._idle.put(collection)
+
+    def search_params(self, **overrides) -> dict:
+        """
+        Search parameters for the collection's index type. Overrides such as
+        nprobe (IVF_FLAT) or ef (HNSW) apply to a single query.
+        """
+        params = {**SEARCH_PARAMS.get(self.index_type, {}), **overrides}
+        return {"metric_type": "IP", "params": params}
+
+    def search(self, *args, **kwargs):
+        with self.connection() as collection:
+            return collection.search(*args, **kwargs)
+
+    def insert(self, *args, **kwargs):
+        with self.connection() as collection:
+            return collection.insert(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with self.connection() as collection:
+            return collection.delete(*args, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self.aliases),
+            "idle": self._idle.qsize(),
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "index_type": self.index_type,
+            "partition_key": self.partition_key,
+        }
+
+
+_collection: Optional[PooledCollection] = None
+_aliases: List[str] = []
+
+def _create_collection(alias: str) -> "Collection":
+    """
+    Creates the chunk collection. Vectors are keyed by content hash, not by
+    file, and content_hash is the partition key: a search filtered to one
+    document only scans the partition that hash maps to, however many
+    documents other users have stored.
+    """
+    from pymilvus import Collection, CollectionSchema, DataType, FieldSchema
+
+    partitioned = MILVUS_PARTITIONS > 0
+    fields = [
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema(name="content_hash", dtype=DataType.VARCHAR, max_length=64, is_partition_key=partitioned),
+        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
+        FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=EMBEDDING_DIM),
+    ]
+    schema = CollectionSchema(fields, description="Document chunks")
+    if partitioned:
+        collection = Collection(MILVUS_COLLECTION_NAME, schema, using=alias, num_partitions=MILVUS_PARTITIONS)
+    else:
+        collection = Collection(MILVUS_COLLECTION_NAME, schema, using=alias)
+    collection.create_index(
+        "embedding",
+        {"index_type": MILVUS_INDEX_TYPE, "metric_type": "IP", "params": INDEX_PARAMS[MILVUS_INDEX_TYPE]},
+    )
+    return collection
+
+async def connect_to_milvus():
+    """Opens the connection pool and preloads the chunk collection into memory."""
+    global _collection, _aliases
+    from pymilvus import Collection, connections, utility
+
+    _aliases = [f"chunks-{i}" for i in range(max(MILVUS_POOL_SIZE, 1))]
+    for alias in _aliases:
+        connections.connect(alias=alias, host=MILVUS_HOST, port=MILVUS_PORT)
+    if utility.has_collection(MILVUS_COLLECTION_NAME, using=_aliases[0]):
+        collection = Collection(MILVUS_COLLECTION_NAME, using=_aliases[0])
+    else:
+        collection = _create_collection(_aliases[0])
+    # Block until every segment is loaded so the first queries don't pay for it
+    collection.load(replica_number=MILVUS_REPLICAS)
+    utility.wait_for_loading_complete(MILVUS_COLLECTION_NAME, using=_aliases[0])
+    _collection = PooledCollection(MILVUS_COLLECTION_NAME, _aliases)
+    if not _collection.partition_key:
+        logger.warning(
+            "Collection %s has no partition key; searches scan every document. "
+            "Point MILVUS_COLLECTION_NAME at a new collection to enable partitioning.",
+            MILVUS_COLLECTION_NAME,
+        )
+
+async def disconnect_from_milvus():
+    """Closes every pooled Milvus connection."""
+    global _collection, _aliases
+    from pymilvus import connections
+
+    _collection = None
+    for alias in _aliases:
+        connections.disconnect(alias)
+    _aliases = []
+
+def get_milvus_collection() -> PooledCollection:
+    """Returns the pooled chunk collection."""
+    return _collection
@@ -0,0 +1,40 @@
+# study-assistant-backend/app/db/mongodb.py
+
+import logging
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from app.core.config import MONGO_URI, MONGO_DB_NAME, MONGO_VERIFY_INDEXES
+from app.db.indexes import ensure_indexes, verify_indexes
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[AsyncIOMotorClient] = None
+
+async def connect_to_mongo():
+    """Connects to MongoDB and makes sure every index exists, reporting any that duplicates block."""
+    global _client
+    _client = AsyncIOMotorClient(MONGO_URI)
+    conflicts = await ensure_indexes(_client[MONGO_DB_NAME])
+    for name, keys in conflicts.items():
+        logger.error(
+            "Unique index %s was not built: %d keys are already duplicated, e.g. %s. "
+            "Merge them with `python -m benchmarks.dedupe_unique_keys --apply`",
+            name, len(keys), keys[:5]
+        )
+    if MONGO_VERIFY_INDEXES:
+        for name, used in (await verify_indexes(_client[MONGO_DB_NAME])).items():
+            if used:
+                logger.info("Index %s is used by its representative query", name)
+            else:
+                logger.warning("Index %s is not used by its representative query", name)
+
+async def close_mongo_connection():
+    """Closes the MongoDB connection."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def get_mongo_db() -> AsyncIOMotorDatabase:
+    """Dependency returning the application database."""
+    return _client[MONGO_DB_NAME]
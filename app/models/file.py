@@ -0,0 +1,45 @@
+# study-assistant-backend/app/models/file.py
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class FileBase(BaseModel):
+    """Base model for an uploaded file."""
+    user_id: str
+    filename: str
+    content_hash: Optional[str] = None  # SHA-256 of the uploaded bytes
+
+class FileInDB(FileBase):
+    """Model for a file stored in the database."""
+    id: str = Field(alias="_id")
+    created_at: datetime
+
+    class Config:
+        populate_by_field_name = True
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+        arbitrary_types_allowed = True
+
+class FileContentInDB(BaseModel):
+    """
+    Metadata and embedding state shared by every file with the same content
+    hash. `ref_count` is the number of file records pointing at it. The text
+    itself is stored as ordered documents in `content_sections`.
+    """
+    id: str = Field(alias="_id")  # the content hash
+    status: str  # "new", "pending", "ready" or "failed"
+    ref_count: int = 0
+    chunk_count: int = 0
+    section_count: int = 0
+    text_length: int = 0  # characters of extracted text
+    page_count: Optional[int] = None  # PDFs only
+    created_at: datetime
+
+    class Config:
+        populate_by_field_name = True
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+        arbitrary_types_allowed = True
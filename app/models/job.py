@@ -0,0 +1,30 @@
+# study-assistant-backend/app/models/job.py
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class JobBase(BaseModel):
+    """Base model for background job data."""
+    kind: str  # e.g., "ingest"
+    payload: dict
+    status: str = "queued"  # "queued", "running", "done" or "failed"
+    attempts: int = 0
+    max_attempts: int = 3
+    error: Optional[str] = None
+
+class JobInDB(JobBase):
+    """Model for a background job stored in the database."""
+    id: str = Field(alias="_id")
+    created_at: datetime
+    updated_at: datetime
+    available_at: datetime
+    lease_expires_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+
+    class Config:
+        populate_by_field_name = True
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+        arbitrary_types_allowed = True
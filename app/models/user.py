@@ -0,0 +1,30 @@
+# study-assistant-backend/app/models/user.py
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+class UserBase(BaseModel):
+    """Base model for user data."""
+    email: str
+    plan: str = "free"  # e.g., "free", "pro"
+
+class UserCreate(BaseModel):
+    """Model for signup requests."""
+    email: str
+    password: str
+
+class UserPublic(UserBase):
+    """Model for user data returned by the API."""
+    id: str = Field(alias="_id")
+    created_at: datetime
+
+    class Config:
+        populate_by_field_name = True
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+        arbitrary_types_allowed = True
+
+class UserDB(UserPublic):
+    """Model for a user stored in the database. Internal only: it carries the password hash."""
+    password_hash: str
@@ -0,0 +1,248 @@
+# study-assistant-backend/app/services/ai_generator.py
+
+import json
+import threading
+from typing import Iterable, Iterator, List, Optional
+import numpy as np
+from app.core.config import GENERATION_STREAM_TIMEOUT_SECONDS
+from app.models.flashcard import FlashcardBase
+from app.models.quiz import QuizBase
+from app.services.embedding_cache import get_embedding_cache
+from app.services.metrics import instrumented, timed
+from app.services.model_registry import ModelRegistry, get_model_registry
+
+FLASHCARD_PROMPT = (
+    "Create study flashcards from the notes below. Respond with a JSON list of "
+    'objects with "question" and "answer" keys.\n\nNotes:\n{text}'
+)
+
+QUIZ_PROMPT = (
+    "Create quiz questions from the notes below. Respond with a JSON list of objects "
+    'with "question_type", "difficulty", "question", "options" and "correct_answer" keys.'
+    "\n\nNotes:\n{text}"
+)
+
+TUTOR_PROMPT = (
+    "You are a patient tutor. Using only the context below, answer the student's "
+    "question step by step.\n\nContext:\n{context}\n\nQuestion: {question}"
+)
+
+
+@instrumented("ai")
+class AIGenerator:
+    """
+    Embedding, retrieval and generation on top of the shared model registry.
+
+    Instances are cheap: they only hold a reference to the registry, so the
+    models themselves are never loaded per request.
+    """
+
+    def __init__(self, registry: ModelRegistry):
+        self.registry = registry
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of texts into normalized vectors. Cached texts are served
+        from the embedding cache; the rest are encoded in a single model call.
+        """
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Like embed(), but returns a contiguous (len(texts), dim) float32 array."""
+        return get_embedding_cache().embed(self.registry.embedding_model_name, texts, self._encode)
+
+    # Only cache misses reach the model
+    @timed("ai.encode")
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with self.registry.embedder() as model:
+            vectors = model.encode(texts, convert_to_numpy=True)
+        return normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+    def retrieve_context_from_milvus(
+        self, collection, question: str, content_hash: str, top_k: int = 5, search_params: Optional[dict] = None
+    ) -> str:
+        """Finds the chunks of a document closest to the question."""
+        return "\n\n".join(self.search_milvus(collection, question, content_hash, top_k, search_params))
+
+    def search_milvus(
+        self, collection, question: str, content_hash: str, top_k: int = 5, search_params: Optional[dict] = None
+    ) -> List[str]:
+        """
+        Returns the texts of the top_k nearest chunks of a document, nearest
+        first. search_params overrides the index's search effort for this
+        query, e.g. {"nprobe": 32} for IVF_FLAT or {"ef": 128} for HNSW.
+        """
+        return self.search_milvus_vectors(
+            collection, self.embed_array([question]), content_hash, top_k, search_params
+        )[0]
+
+    def search_milvus_vectors(
+        self, collection, vectors: np.ndarray, content_hash: str, top_k: int = 5, search_params: Optional[dict] = None
+    ) -> List[List[str]]:
+        """Searches one document with several query vectors at once; returns one ranked text list per vector."""
+        results = collection.search(
+            data=vectors.tolist(),
+            anns_field="embedding",
+            param=collection.search_params(**(search_params or {})),
+            limit=top_k,
+            expr=f'content_hash == "{content_hash}"',
+            output_fields=["text"],
+        )
+        return [[hit.entity.get("text") for hit in hits] for hits in results]
+
+    def generate_tutor_response(self, context: str, question: str) -> str:
+        """Generates a step-by-step answer grounded in the retrieved context."""
+        return self._generate(TUTOR_PROMPT.format(context=context, question=question))
+
+    def generate_flashcards(self, text: str) -> List[FlashcardBase]:
+        """Generates flashcards from document text."""
+        items = _parse_json_list(self._generate(FLASHCARD_PROMPT.format(text=text)))
+        return [FlashcardBase(**item) for item in items if _has_keys(item, FlashcardBase)]
+
+    def generate_quizzes(self, text: str) -> List[QuizBase]:
+        """Generates quiz questions from document text."""
+        items = _parse_json_list(self._generate(QUIZ_PROMPT.format(text=text)))
+        return [QuizBase(**item) for item in items if _has_keys(item, QuizBase)]
+
+    def stream_tutor_response(self, context: str, question: str) -> Iterator[str]:
+        """Yields the tutor answer as text fragments while it is generated."""
+        yield from self._stream(TUTOR_PROMPT.format(context=context, question=question))
+
+    def stream_flashcards(self, text: str) -> Iterator[FlashcardBase]:
+        """Yields each flashcard as soon as its JSON object is complete."""
+        for item in iter_json_objects(self._stream(FLASHCARD_PROMPT.format(text=text))):
+            if _has_keys(item, FlashcardBase):
+                yield FlashcardBase(**item)
+
+    def stream_quizzes(self, text: str) -> Iterator[QuizBase]:
+        """Yields each quiz question as soon as its JSON object is complete."""
+        for item in iter_json_objects(self._stream(QUIZ_PROMPT.format(text=text))):
+            if _has_keys(item, QuizBase):
+                yield QuizBase(**item)
+
+    def _stream(self, prompt: str, max_new_tokens: int = 512) -> Iterator[str]:
+        """
+        Runs generate() on a helper thread and yields its text as it arrives.
+
+        The generator slot is held until the helper thread has exited: when
+        the consumer stops early (the client disconnected and the executor
+        closed this generator), a stopping criterion ends generation at the
+        next token and the thread is joined before the slot is released.
+        Errors in generate() are re-raised here instead of leaving the
+        streamer waiting, and a stalled generation times out.
+        """
+        from transformers import StoppingCriteriaList, TextIteratorStreamer
+
+        with self.registry.generator() as model:
+            streamer = TextIteratorStreamer(
+                model.tokenizer, skip_special_tokens=True, timeout=GENERATION_STREAM_TIMEOUT_SECONDS
+            )
+            inputs = model.tokenizer(prompt, return_tensors="pt", truncation=True)
+            stop = threading.Event()
+            errors: List[BaseException] = []
+
+            def generate():
+                try:
+                    model.model.generate(
+                        **inputs,
+                        streamer=streamer,
+                        max_new_tokens=max_new_tokens,
+                        stopping_criteria=StoppingCriteriaList([_StopEvent(stop)]),
+                    )
+                except BaseException as e:
+                    errors.append(e)
+                    # Wakes the consumer; generate() never sent its end signal
+                    streamer.end()
+
+            worker = threading.Thread(target=generate, name="generate-stream")
+            worker.start()
+            try:
+                yield from streamer
+                if errors:
+                    raise errors[0]
+            finally:
+                stop.set()
+                worker.join()
+
+    def _generate(self, prompt: str, max_new_tokens: int = 512) -> str:
+        with self.registry.generator() as model:
+            output = model(prompt, max_new_tokens=max_new_tokens)
+        return output[0]["generated_text"]
+
+
+class _StopEvent:
+    """Stopping criterion that ends generation once the event is set."""
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.event.is_set()
+
+
+def run_ai_task(method_name: str, *args):
+    """
+    Calls an AIGenerator method against this process's registry.
+    Module-level so it can be shipped to a process pool worker.
+    """
+    return getattr(AIGenerator(get_model_registry()), method_name)(*args)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalizes every row in one vectorized pass, in place."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def iter_json_objects(fragments: Iterable[str]) -> Iterator[dict]:
+    """
+    Incrementally yields top-level JSON objects from streamed model output,
+    e.g. each element of a list as soon as its closing brace arrives.
+    """
+    buffer = []
+    depth = 0
+    in_string = escaped = False
+    for fragment in fragments:
+        for char in fragment:
+            if depth == 0 and char != "{":
+                continue
+            buffer.append(char)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        item = json.loads("".join(buffer))
+                    except json.JSONDecodeError:
+                        item = None
+                    buffer = []
+                    if isinstance(item, dict):
+                        yield item
+
+
+def _parse_json_list(raw: str) -> List[dict]:
+    """Extracts the first JSON list from model output, ignoring surrounding prose."""
+    start, end = raw.find("["), raw.rfind("]")
+    if start == -1 or end <= start:
+        return []
+    try:
+        items = json.loads(raw[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+def _has_keys(item: dict, model) -> bool:
+    required = [name for name, field in model.model_fields.items() if field.is_required()]
+    return all(key in item for key in required)
@@ -0,0 +1,139 @@
+# study-assistant-backend/app/services/answer_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+from app.core.config import (
+    TUTOR_CACHE_TTL_SECONDS,
+    TUTOR_CACHE_SIMILARITY,
+    TUTOR_CACHE_MAX_PER_FILE,
+    TUTOR_CACHE_MAX_FILES,
+)
+from app.services.embedding_cache import normalize_text
+
+
+def normalize_question(question: str) -> str:
+    """Case- and punctuation-insensitive form of a question for exact matching."""
+    return normalize_text(question).lower().rstrip("?!. ")
+
+
+class _CachedAnswer:
+    def __init__(self, answer: str, vector: np.ndarray, cost_seconds: float, expires_at: float):
+        self.answer = answer
+        self.vector = vector
+        self.cost_seconds = cost_seconds
+        self.expires_at = expires_at
+
+
+class TutorAnswerCache:
+    """
+    Per-document cache of tutor answers.
+
+    Questions match exactly on their normalized text, or approximately when
+    the cosine similarity of their embeddings clears a threshold. Entries are
+    keyed by content hash, so every file with the same content shares them.
+    Documents are kept in LRU order and the least recently used are dropped
+    beyond `max_files`, so documents nobody asks about again do not linger.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = TUTOR_CACHE_TTL_SECONDS,
+        similarity_threshold: float = TUTOR_CACHE_SIMILARITY,
+        max_per_file: int = TUTOR_CACHE_MAX_PER_FILE,
+        max_files: int = TUTOR_CACHE_MAX_FILES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_per_file = max_per_file
+        self.max_files = max_files
+        self._files: "OrderedDict[str, OrderedDict[str, _CachedAnswer]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def get_exact(self, content_hash: str, question: str) -> Optional[str]:
+        """Returns a cached answer for the same normalized question, if any."""
+        with self._lock:
+            entries = self._live_entries(content_hash)
+            entry = entries.get(normalize_question(question)) if entries else None
+            if entry is None:
+                return None
+            self.exact_hits += 1
+            self.seconds_saved += entry.cost_seconds
+            return entry.answer
+
+    def get_similar(self, content_hash: str, vector: np.ndarray) -> Optional[str]:
+        """
+        Returns the answer to the most similar cached question, if it clears
+        the threshold. Counts a miss otherwise. `vector` must be normalized.
+        """
+        with self._lock:
+            entries = self._live_entries(content_hash)
+            if entries:
+                cached = list(entries.values())
+                scores = np.stack([entry.vector for entry in cached]) @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    self.semantic_hits += 1
+                    self.seconds_saved += cached[best].cost_seconds
+                    return cached[best].answer
+            self.misses += 1
+            return None
+
+    def put(self, content_hash: str, question: str, vector: np.ndarray, answer: str, cost_seconds: float):
+        """Caches an answer along with how long it took to produce."""
+        with self._lock:
+            entries = self._files.setdefault(content_hash, OrderedDict())
+            self._files.move_to_end(content_hash)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+            entries[normalize_question(question)] = _CachedAnswer(
+                answer, vector, cost_seconds, time.monotonic() + self.ttl_seconds
+            )
+            while len(entries) > self.max_per_file:
+                entries.popitem(last=False)
+
+    def invalidate(self, content_hash: str):
+        """Drops every answer for a document, e.g. when it is re-ingested."""
+        with self._lock:
+            self._files.pop(content_hash, None)
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+            "files": len(self._files),
+        }
+
+    def _live_entries(self, content_hash: str) -> Optional["OrderedDict[str, _CachedAnswer]"]:
+        entries = self._files.get(content_hash)
+        if entries is None:
+            return None
+        self._files.move_to_end(content_hash)
+        now = time.monotonic()
+        for key in [key for key, entry in entries.items() if entry.expires_at <= now]:
+            del entries[key]
+        if not entries:
+            del self._files[content_hash]
+            return None
+        return entries
+
+
+_cache: Optional[TutorAnswerCache] = None
+
+
+def get_answer_cache() -> TutorAnswerCache:
+    """Returns the process-wide tutor answer cache."""
+    global _cache
+    if _cache is None:
+        _cache = TutorAnswerCache()
+    return _cache
@@ -0,0 +1,302 @@
+# study-assistant-backend/app/services/embedding_cache.py
+
+import fcntl
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from app.core.config import (
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DISK_MAX_BYTES,
+    EMBEDDING_DIM,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes unicode and whitespace so trivially different inputs share a key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    """LRU of vectors, evicted by total bytes rather than entry count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = vector
+        self.bytes += vector.nbytes
+        while self.bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _DiskTier:
+    """
+    Append-only file of float32 rows read through a memory map, plus a
+    sidecar file of "key row" lines, shared by every worker process.
+
+    Writers append under an exclusive lock on a separate lock file. Readers
+    pick up rows other processes appended by reading the keys file on from
+    where they last stopped, under a shared lock, whenever a key is missing.
+    Once the vector file grows past `max_bytes`, the writer that crossed the
+    limit rewrites both files with the newest half of the rows and swaps
+    them in with os.replace(). Other processes notice the new keys file
+    (a different inode) and reload; until then their existing memory map
+    still points at the old, now unlinked, file, so reads stay consistent.
+    A thread lock keeps this process's view (rows and memory map) coherent
+    between the threads sharing the tier.
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)}-{dim}")
+        self.vectors_path = f"{stem}.f32"
+        self.keys_path = f"{stem}.keys"
+        self.lock_path = f"{stem}.lock"
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.max_rows = max(max_bytes // self.row_bytes, 2)
+        self.compactions = 0
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._keys_inode: Optional[int] = None
+        self._keys_offset = 0
+        self._view_lock = threading.Lock()
+        with self._locked(fcntl.LOCK_SH):
+            self._refresh()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Returns copies of the stored vectors for the keys that are present."""
+        with self._view_lock:
+            if any(key not in self._rows for key in keys):
+                # Another worker may have stored them since we last looked
+                with self._locked(fcntl.LOCK_SH):
+                    self._refresh()
+            return {key: np.array(self._mmap[self._rows[key]]) for key in keys if key in self._rows}
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._view_lock, self._locked(fcntl.LOCK_EX):
+            self._refresh()
+            items = {key: vector for key, vector in items.items() if key not in self._rows}
+            if not items:
+                return
+            with open(self.vectors_path, "ab") as vectors, open(self.keys_path, "a") as keys:
+                row = vectors.seek(0, os.SEEK_END) // self.row_bytes
+                lines = []
+                for key, vector in items.items():
+                    vectors.write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+                    lines.append(f"{key} {row}\n")
+                    row += 1
+                vectors.flush()
+                keys.write("".join(lines))
+            if row > self.max_rows:
+                self._compact()
+            self._refresh()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _locked(self, operation: int):
+        return _FileLock(self.lock_path, operation)
+
+    def _refresh(self):
+        """Reads key lines appended since the last refresh; reloads if the files were compacted. Caller holds the lock."""
+        try:
+            with open(self.keys_path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if inode != self._keys_inode:
+                    self._rows, self._keys_inode, self._keys_offset = {}, inode, 0
+                f.seek(self._keys_offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        # Only whole lines; a concurrent writer always finishes its lines before unlocking
+        tail = tail[:tail.rfind(b"\n") + 1]
+        if not tail and self._mmap is not None:
+            return
+        self._keys_offset += len(tail)
+        for line in tail.decode("utf-8").splitlines():
+            key, _, row = line.partition(" ")
+            if row.strip():
+                self._rows[key] = int(row)
+        rows = os.path.getsize(self.vectors_path) // self.row_bytes
+        self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+
+    def _compact(self):
+        """Rewrites both files with the newest half of the rows. Caller holds the exclusive lock."""
+        self._refresh()
+        keep = sorted(self._rows.items(), key=lambda item: item[1])[-(self.max_rows // 2):]
+        vectors_tmp, keys_tmp = f"{self.vectors_path}.tmp", f"{self.keys_path}.tmp"
+        with open(vectors_tmp, "wb") as vectors, open(keys_tmp, "w") as keys:
+            for new_row, (key, old_row) in enumerate(keep):
+                vectors.write(self._mmap[old_row].tobytes())
+                keys.write(f"{key} {new_row}\n")
+        # Vectors first: a reader that sees the new keys file must also see the new vectors
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(keys_tmp, self.keys_path)
+        self.compactions += 1
+
+
+class _FileLock:
+    """flock() on a dedicated file, so the lock survives the data files being replaced."""
+
+    def __init__(self, path: str, operation: int):
+        self.path = path
+        self.operation = operation
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        fcntl.flock(self._file, self.operation)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of embeddings keyed by (model, normalized text).
+
+    Lookups check the in-memory LRU first, then the memory-mapped disk store.
+    Misses from one batch are embedded together in a single model call.
+    The thread lock only covers the memory tier; disk reads, appends and
+    compactions are serialized by the disk tier's own locks, so threads
+    hitting memory never wait on file I/O.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+        directory: str = EMBEDDING_CACHE_DIR,
+        dim: int = EMBEDDING_DIM,
+        disk_max_bytes: int = EMBEDDING_CACHE_DISK_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.dim = dim
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = _MemoryTier(max_bytes)
+        self._disk: Dict[str, _DiskTier] = {}
+        self._lock = threading.Lock()
+        self._disk_open_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def embed(self, model_name: str, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Returns a (len(texts), dim) float32 array, calling encode() once with
+        the distinct texts that were not cached.
+        """
+        keys = [cache_key(model_name, text) for text in texts]
+        found = self.get_many(model_name, keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            # Own copies: a row view would keep the whole batch alive in the memory tier
+            computed = {key: vector.copy() for key, vector in zip(missing.keys(), vectors)}
+            self.put_many(model_name, computed)
+            found.update(computed)
+
+        if not keys:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.vstack([found[key] for key in keys])
+
+    def get_many(self, model_name: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        found, not_in_memory = {}, []
+        with self._lock:
+            for key in set(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    found[key] = vector
+                else:
+                    not_in_memory.append(key)
+            self.memory_hits += len(found)
+        if not not_in_memory:
+            return found
+
+        disk = self._disk_tier(model_name)
+        from_disk = disk.get_many(not_in_memory) if disk is not None else {}
+        with self._lock:
+            for key, vector in from_disk.items():
+                self._memory.put(key, vector)
+            self.disk_hits += len(from_disk)
+            self.misses += len(not_in_memory) - len(from_disk)
+        found.update(from_disk)
+        return found
+
+    def put_many(self, model_name: str, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory.put(key, vector)
+        disk = self._disk_tier(model_name)
+        if disk is not None:
+            disk.put_many(vectors)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.bytes,
+            "disk_entries": sum(len(disk) for disk in self._disk.values()),
+            "disk_compactions": sum(disk.compactions for disk in self._disk.values()),
+        }
+
+    def _disk_tier(self, model_name: str) -> Optional[_DiskTier]:
+        if not self.directory:
+            return None
+        disk = self._disk.get(model_name)
+        if disk is None:
+            with self._disk_open_lock:
+                if model_name not in self._disk:
+                    self._disk[model_name] = _DiskTier(self.directory, model_name, self.dim, self.disk_max_bytes)
+                disk = self._disk[model_name]
+        return disk
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Returns the process-wide embedding cache."""
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
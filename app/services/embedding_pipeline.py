@@ -0,0 +1,133 @@
+# study-assistant-backend/app/services/embedding_pipeline.py
+
+import asyncio
+import logging
+import time
+from typing import List, Optional
+import numpy as np
+from app.core.config import EMBED_BATCH_SIZE, MILVUS_INSERT_BATCH_SIZE
+from app.services.ai_generator import run_ai_task
+from app.services.executor import AIExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStats:
+    """Throughput counters for the ingestion embedding pipeline."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.embed_seconds = 0.0
+        self.inserts = 0
+        self.insert_seconds = 0.0
+
+    def add(self, other: "PipelineStats"):
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        return {
+            **vars(self),
+            "chunks_per_second": self.chunks / self.embed_seconds if self.embed_seconds else 0.0,
+            "mean_insert_seconds": self.insert_seconds / self.inserts if self.inserts else 0.0,
+        }
+
+
+pipeline_stats = PipelineStats()
+
+
+class EmbeddingPipeline:
+    """
+    Embeds a document's chunks in fixed-size batches and bulk-inserts them
+    into Milvus column by column. Vectors stay in contiguous float32 arrays
+    from the model to the insert, and each Milvus insert runs while the next
+    batches are being embedded.
+
+    Use it as an async context manager (or call abort() on failure) so an
+    insert still in flight is waited for before the caller retries;
+    otherwise it could land after the retry has cleared the old rows.
+    """
+
+    def __init__(
+        self,
+        executor: AIExecutor,
+        collection,
+        embed_batch_size: int = EMBED_BATCH_SIZE,
+        insert_batch_size: int = MILVUS_INSERT_BATCH_SIZE,
+    ):
+        self.executor = executor
+        self.collection = collection
+        self.embed_batch_size = embed_batch_size
+        self.insert_batch_size = insert_batch_size
+        self.stats = PipelineStats()
+        self._texts: List[str] = []
+        self._vectors: List[np.ndarray] = []
+        self._pending_insert: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "EmbeddingPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            await self.abort()
+
+    async def run(self, content_hash: str, chunks: List[str]) -> PipelineStats:
+        """Embeds and stores all chunks for content_hash."""
+        async with self:
+            for start in range(0, len(chunks), self.embed_batch_size):
+                await self.add(content_hash, chunks[start:start + self.embed_batch_size])
+            return await self.finish(content_hash)
+
+    async def add(self, content_hash: str, batch: List[str]):
+        """Embeds one batch of chunks and flushes when enough rows are buffered."""
+        started = time.perf_counter()
+        vectors = await self.executor.run("cpu", run_ai_task, "embed_array", batch)
+        self.stats.embed_seconds += time.perf_counter() - started
+        self.stats.chunks += len(batch)
+        self._texts.extend(batch)
+        self._vectors.append(vectors)
+        # The first batch is inserted right away so a document becomes searchable early
+        if len(self._texts) >= self.insert_batch_size or (self.stats.inserts == 0 and self._pending_insert is None):
+            await self._flush(content_hash)
+
+    async def finish(self, content_hash: str) -> PipelineStats:
+        """Flushes the remaining rows and waits for every insert to land."""
+        await self._flush(content_hash)
+        if self._pending_insert is not None:
+            await self._pending_insert
+            self._pending_insert = None
+        pipeline_stats.add(self.stats)
+        return self.stats
+
+    async def abort(self):
+        """
+        Drops buffered rows and waits for the insert in flight, if any. The
+        insert runs on an executor thread that cancelling cannot stop, so it
+        is awaited rather than cancelled; its error, if any, is only logged
+        because the caller is already handling a failure.
+        """
+        self._texts, self._vectors = [], []
+        pending, self._pending_insert = self._pending_insert, None
+        if pending is not None:
+            try:
+                await asyncio.shield(pending)
+            except Exception:
+                logger.warning("Milvus insert failed while aborting ingestion", exc_info=True)
+
+    async def _flush(self, content_hash: str):
+        if not self._texts:
+            return
+        texts, vectors = self._texts, np.vstack(self._vectors)
+        self._texts, self._vectors = [], []
+        # Keep at most one insert in flight so memory stays bounded
+        if self._pending_insert is not None:
+            await self._pending_insert
+        self._pending_insert = asyncio.create_task(self._insert(content_hash, texts, vectors))
+
+    async def _insert(self, content_hash: str, texts: List[str], vectors: np.ndarray):
+        started = time.perf_counter()
+        # Column order follows the collection schema (the primary key is auto-generated)
+        columns = [[content_hash] * len(texts), texts, vectors]
+        await self.executor.run("io", self.collection.insert, columns)
+        self.stats.insert_seconds += time.perf_counter() - started
+        self.stats.inserts += 1
@@ -0,0 +1,168 @@
+# study-assistant-backend/app/services/executor.py
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+from app.core.config import (
+    AI_CPU_EXECUTOR_MODE,
+    AI_IO_WORKERS,
+    AI_CPU_WORKERS,
+    AI_IO_CONCURRENCY,
+    AI_CPU_CONCURRENCY,
+)
+from app.services.model_registry import load_model_registry
+
+
+class _KindStats:
+    """Queue and throughput counters for one kind of work."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return dict(vars(self))
+
+
+class AIExecutor:
+    """
+    Runs blocking AI work off the event loop.
+
+    "io" work (Milvus, HTTP clients) goes to a thread pool. "cpu" work
+    (embedding, inference) goes to a process pool, or to the thread pool
+    when AI_CPU_EXECUTOR_MODE is "thread". Each kind has its own concurrency
+    limit; callers beyond the limit wait in an async queue, not in a thread.
+    """
+
+    def __init__(
+        self,
+        cpu_mode: str = AI_CPU_EXECUTOR_MODE,
+        io_workers: int = AI_IO_WORKERS,
+        cpu_workers: int = AI_CPU_WORKERS,
+        limits: Optional[Dict[str, int]] = None,
+    ):
+        limits = limits or {"io": AI_IO_CONCURRENCY, "cpu": AI_CPU_CONCURRENCY}
+        io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="ai-io")
+        if cpu_mode == "process":
+            cpu_pool = ProcessPoolExecutor(max_workers=cpu_workers, initializer=load_model_registry)
+        else:
+            cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="ai-cpu")
+        self.cpu_mode = cpu_mode
+        self._pools: Dict[str, Executor] = {"io": io_pool, "cpu": cpu_pool}
+        self._semaphores = {kind: asyncio.Semaphore(limit) for kind, limit in limits.items()}
+        self._stats = {kind: _KindStats(limit) for kind, limit in limits.items()}
+
+    async def run(self, kind: str, fn: Callable, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the pool for `kind` and awaits the result.
+        In process mode, fn and its arguments must be picklable.
+        """
+        async with self._slot(kind):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pools[kind], partial(fn, *args, **kwargs))
+
+    async def stream(self, kind: str, fn: Callable[..., Iterator], *args) -> AsyncIterator:
+        """
+        Runs a blocking generator function on a thread and yields its items
+        as they are produced. Streaming always uses threads, so in process
+        mode "cpu" streams run on the I/O pool while still counting against
+        the "cpu" limit.
+        """
+        pool = self._pools[kind]
+        if not isinstance(pool, ThreadPoolExecutor):
+            pool = self._pools["io"]
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        finished = object()
+
+        def produce():
+            try:
+                for item in fn(*args):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (finished, e))
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, (finished, None))
+
+        async with self._slot(kind):
+            producer = loop.run_in_executor(pool, produce)
+            try:
+                while True:
+                    item, error = await queue.get()
+                    if item is finished:
+                        if error is not None:
+                            raise error
+                        break
+                    yield item
+            finally:
+                # Stops the producer early if the client went away
+                stop.set()
+                await asyncio.shield(producer)
+
+    @asynccontextmanager
+    async def _slot(self, kind: str):
+        stats = self._stats[kind]
+        stats.queued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+        enqueued_at = time.perf_counter()
+        try:
+            await self._semaphores[kind].acquire()
+        finally:
+            stats.queued -= 1
+        started_at = time.perf_counter()
+        stats.queue_seconds += started_at - enqueued_at
+        stats.in_flight += 1
+        try:
+            yield
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.run_seconds += time.perf_counter() - started_at
+            self._semaphores[kind].release()
+        stats.completed += 1
+
+    def stats(self) -> dict:
+        """Returns per-kind queue depth, in-flight and timing counters."""
+        return {"cpu_mode": self.cpu_mode, **{kind: s.snapshot() for kind, s in self._stats.items()}}
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[AIExecutor] = None
+
+
+def start_ai_executor() -> AIExecutor:
+    """Creates the process-wide executor. Called once at startup."""
+    global _executor
+    if _executor is None:
+        _executor = AIExecutor()
+    return _executor
+
+
+def shutdown_ai_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def get_ai_executor() -> AIExecutor:
+    """Dependency for the AI executor."""
+    return _executor or start_ai_executor()
@@ -0,0 +1,260 @@
+# study-assistant-backend/app/services/file_processor.py
+
+import asyncio
+import logging
+import os
+import re
+import zlib
+from array import array
+from typing import Iterator, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import EMBED_BATCH_SIZE, CONTENT_SECTION_CHARS
+from app.crud.content_sections import ContentSectionCRUD
+from app.crud.file_contents import FileContentCRUD
+from app.crud.keyword_indexes import KeywordIndexCRUD
+from app.db.milvus import get_milvus_collection
+from app.services.answer_cache import get_answer_cache
+from app.services.embedding_pipeline import EmbeddingPipeline
+from app.services.executor import get_ai_executor
+from app.services.hybrid_retrieval import get_keyword_index_store
+from app.services.keyword_index import KeywordIndexBuilder
+from app.services.metrics import timed
+from app.utils.text_splitter import iter_chunk_spans
+from pymongo.errors import DocumentTooLarge
+
+TEXT_BLOCK_CHARS = 64 * 1024
+# Text hashed to decide whether a section may end at a position
+SECTION_ANCHOR_CHARS = 48
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+
+
+def iter_document_text(file_path: str) -> Iterator[str]:
+    """
+    Yields a document's text piece by piece (pages for PDFs, paragraphs for
+    DOCX, blocks for TXT) without holding the parsed document in memory.
+    Pieces carry their own separators, so they can be concatenated as-is.
+    PDFs yield exactly one piece per page, an empty one for pages without
+    text (blank or scanned), so counting pieces counts pages.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".txt":
+        with open(file_path, encoding="utf-8", errors="replace") as f:
+            while block := f.read(TEXT_BLOCK_CHARS):
+                yield block
+    elif extension == ".pdf":
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        for page in extract_pages(file_path):
+            text = "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+            yield text + "\n\n" if text.strip() else ""
+    elif extension == ".docx":
+        from docx import Document
+
+        for paragraph in Document(file_path).paragraphs:
+            if paragraph.text.strip():
+                yield paragraph.text + "\n\n"
+    else:
+        from unstructured.partition.auto import partition
+
+        for element in partition(filename=file_path):
+            yield str(element) + "\n\n"
+
+
+def extract_text(file_path: str) -> str:
+    """Extracts plain text from a PDF, DOCX or TXT file."""
+    return "".join(iter_document_text(file_path)).strip()
+
+
+class _SectionWriter:
+    """
+    Groups extracted text into sections of roughly CONTENT_SECTION_CHARS and
+    stores them as they are completed.
+
+    Boundaries are content-defined: a section ends after a run of whitespace
+    when a hash of the SECTION_ANCHOR_CHARS before it hits one value in
+    `divisor`, subject to a minimum and maximum section length. Whether a
+    position is a boundary depends only on the text around it, not on where
+    the previous section started, so after a small edit the boundaries fall
+    back into step right after the changed text and every other section
+    (and its cached generation results) stays byte-for-byte the same.
+    """
+
+    def __init__(self, sections_crud: ContentSectionCRUD, content_hash: str, section_chars: int = CONTENT_SECTION_CHARS):
+        self.sections_crud = sections_crud
+        self.content_hash = content_hash
+        self.min_chars = max(section_chars // 4, SECTION_ANCHOR_CHARS)
+        self.max_chars = section_chars * 3
+        # Whitespace runs come every ~6 characters in prose, so this puts the
+        # average section near section_chars
+        self.divisor = max((section_chars - self.min_chars) // 6, 1)
+        self.section_count = 0
+        self.text_length = 0
+        # Where each stored section starts in the document text
+        self.offsets = array("Q")
+        self._stored_length = 0
+        self._buffer = ""
+        # Buffer offset up to which boundaries were already checked
+        self._scanned = 0
+
+    async def write(self, pieces: List[str]):
+        for piece in pieces:
+            self._buffer += piece
+            self.text_length += len(piece)
+        await self._store(self._cut())
+
+    async def close(self):
+        if self._buffer.strip():
+            await self._store([self._buffer])
+        self._buffer = ""
+        self._scanned = 0
+
+    def _cut(self) -> List[str]:
+        sections = []
+        while True:
+            cut = self._next_boundary()
+            if cut is None:
+                if len(self._buffer) < self.max_chars:
+                    break
+                # No boundary within max_chars; end on the last space before the limit
+                cut = self._buffer.rfind(" ", self.min_chars, self.max_chars)
+                cut = cut + 1 if cut != -1 else self.max_chars
+            sections.append(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+            self._scanned = 0
+        return sections
+
+    def _next_boundary(self) -> Optional[int]:
+        limit = min(len(self._buffer), self.max_chars)
+        position = max(self._scanned, self.min_chars)
+        for match in _WHITESPACE_RUN.finditer(self._buffer, position, limit):
+            if match.end() == limit:
+                # The run may continue in text that has not arrived yet
+                position = match.start()
+                break
+            position = match.end()
+            anchor = self._buffer[position - SECTION_ANCHOR_CHARS:position]
+            if zlib.crc32(anchor.encode("utf-8")) % self.divisor == 0:
+                return position
+        else:
+            position = limit
+        self._scanned = position
+        return None
+
+    async def _store(self, sections: List[str]):
+        if sections:
+            await self.sections_crud.insert_sections(self.content_hash, self.section_count, sections)
+            self.section_count += len(sections)
+            for section in sections:
+                self.offsets.append(self._stored_length)
+                self._stored_length += len(section)
+
+
+@timed("ingest.process_and_embed_file")
+async def process_and_embed_file(file_path: str, content_hash: str, db: AsyncIOMotorDatabase):
+    """
+    Extracts, chunks and embeds a document, storing the vectors in Milvus and
+    the text as ordered sections in content_sections and a BM25 keyword
+    index over the same chunks in keyword_indexes. The keyword index points
+    into the sections rather than holding a second copy of the text.
+
+    Extraction, chunking and embedding are one streaming pipeline: chunks are
+    embedded and inserted while later pages are still being read, so the
+    first chunks become searchable before the whole document is processed.
+    Text is written out section by section, so memory stays bounded.
+    """
+    executor = get_ai_executor()
+    collection = get_milvus_collection()
+    sections_crud = ContentSectionCRUD(db.content_sections)
+    keyword_crud = KeywordIndexCRUD(db.keyword_indexes)
+    # Clear output left by an interrupted attempt so retries stay idempotent
+    await executor.run("io", collection.delete, f'content_hash == "{content_hash}"')
+    await sections_crud.delete_sections(content_hash)
+    await keyword_crud.delete_index(content_hash)
+    get_keyword_index_store().invalidate(content_hash)
+
+    # Pieces read by the extraction thread since the last batch; drained on the event loop
+    new_pieces: List[str] = []
+    piece_count = 0
+
+    def read_pieces():
+        nonlocal piece_count
+        for piece in iter_document_text(file_path):
+            piece_count += 1
+            new_pieces.append(piece)
+            yield piece
+
+    chunks = iter_chunk_spans(read_pieces())
+    sections = _SectionWriter(sections_crud, content_hash)
+    keywords = KeywordIndexBuilder()
+    chunk_count = 0
+    async with EmbeddingPipeline(executor, collection) as pipeline:
+        while True:
+            # Pull the next batch in a thread: extraction is blocking parser work
+            batch = await asyncio.to_thread(_take, chunks, EMBED_BATCH_SIZE)
+            pieces = new_pieces[:]
+            new_pieces.clear()
+            await sections.write(pieces)
+            if not batch:
+                break
+            chunk_count += len(batch)
+            await pipeline.add(content_hash, [chunk for _, chunk in batch])
+            # The keyword index keeps each chunk's span into the sections, not its text
+            await asyncio.to_thread(keywords.add, batch)
+        await pipeline.finish(content_hash)
+    await sections.close()
+
+    keyword_doc = await asyncio.to_thread(lambda: keywords.build(sections.offsets).to_document())
+    try:
+        await keyword_crud.put_index(content_hash, keyword_doc)
+    except DocumentTooLarge:
+        # Tutor retrieval falls back to vector search alone for this document
+        get_keyword_index_store().too_large += 1
+        logger.warning("Keyword index for %s exceeds the document size limit; skipping it", content_hash)
+
+    # PDF pieces are pages, including empty ones for pages without text
+    page_count = piece_count if os.path.splitext(file_path)[1].lower() == ".pdf" else None
+    if not await FileContentCRUD(db.file_contents).mark_ready(
+        content_hash, chunk_count, sections.section_count, sections.text_length, page_count
+    ):
+        logger.info("Content %s was deleted during ingestion; removing what was written", content_hash)
+        await _delete_content_artifacts(db, content_hash)
+        return
+    # Answers generated from the previous chunks are stale now
+    get_answer_cache().invalidate(content_hash)
+
+
+def _take(iterator: Iterator[str], count: int) -> list:
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) == count:
+            break
+    return batch
+
+
+async def release_file_content(db: AsyncIOMotorDatabase, content_hash: str) -> bool:
+    """
+    Drops a file's reference to its content. When the last reference goes,
+    the shared text, keyword index and Milvus vectors are garbage-collected
+    and True is returned.
+    """
+    if not content_hash:
+        return False
+    if not await FileContentCRUD(db.file_contents).release(content_hash):
+        return False
+    await _delete_content_artifacts(db, content_hash)
+    return True
+
+
+async def _delete_content_artifacts(db: AsyncIOMotorDatabase, content_hash: str):
+    await get_ai_executor().run(
+        "io", get_milvus_collection().delete, f'content_hash == "{content_hash}"'
+    )
+    await ContentSectionCRUD(db.content_sections).delete_sections(content_hash)
+    await KeywordIndexCRUD(db.keyword_indexes).delete_index(content_hash)
+    get_keyword_index_store().invalidate(content_hash)
+    get_answer_cache().invalidate(content_hash)
@@ -0,0 +1,100 @@
+# study-assistant-backend/app/services/generation_planner.py
+
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, List
+import numpy as np
+from pydantic import BaseModel
+from app.core.config import GENERATION_FANOUT, GENERATION_DEDUP_SIMILARITY, GENERATOR_VERSION, GENERATION_MODEL_NAME
+from app.crud.generation_cache import GenerationCacheCRUD
+from app.models.flashcard import FlashcardBase
+from app.models.quiz import QuizBase
+from app.services.ai_generator import run_ai_task
+from app.services.executor import AIExecutor
+
+# What each kind of generation produces and which AIGenerator method makes it
+GENERATION_KINDS = {
+    "flashcards": (FlashcardBase, "generate_flashcards"),
+    "quizzes": (QuizBase, "generate_quizzes"),
+}
+
+
+class GenerationPlanner:
+    """
+    Map-reduce generation over a document's sections.
+
+    Sections are generated concurrently, up to `fanout` at a time. Each
+    section's output is cached by (kind, generator version, section hash),
+    so after a small edit only the sections that changed are regenerated.
+    The merged output is de-duplicated by question embedding similarity.
+    """
+
+    def __init__(
+        self,
+        executor: AIExecutor,
+        cache_crud: GenerationCacheCRUD,
+        fanout: int = GENERATION_FANOUT,
+        dedup_similarity: float = GENERATION_DEDUP_SIMILARITY,
+    ):
+        self.executor = executor
+        self.cache_crud = cache_crud
+        self.fanout = fanout
+        self.dedup_similarity = dedup_similarity
+        self.stats = {"sections": 0, "cached_sections": 0, "items": 0, "duplicates": 0, "seconds": 0.0}
+
+    async def run(self, kind: str, sections: AsyncIterator[str]) -> List[BaseModel]:
+        """Generates, merges and de-duplicates items for every section, in section order."""
+        started = time.perf_counter()
+        model, method = GENERATION_KINDS[kind]
+        slots = asyncio.Semaphore(self.fanout)
+        tasks = []
+        try:
+            async for section in sections:
+                # Waiting for a slot before reading on keeps at most `fanout` sections in memory
+                await slots.acquire()
+                tasks.append(asyncio.create_task(self._generate_section(kind, method, section, slots)))
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        items = [model(**item) for section_items in results for item in section_items]
+        unique = await self._deduplicate(items)
+        self.stats["items"] += len(unique)
+        self.stats["duplicates"] += len(items) - len(unique)
+        self.stats["seconds"] += time.perf_counter() - started
+        return unique
+
+    async def _generate_section(self, kind: str, method: str, section: str, slots: asyncio.Semaphore) -> List[dict]:
+        try:
+            self.stats["sections"] += 1
+            key = section_cache_key(kind, section)
+            cached = await self.cache_crud.get_items(key)
+            if cached is not None:
+                self.stats["cached_sections"] += 1
+                return cached
+            generated = await self.executor.run("cpu", run_ai_task, method, section)
+            items = [item.model_dump() for item in generated]
+            await self.cache_crud.put_items(key, items)
+            return items
+        finally:
+            slots.release()
+
+    async def _deduplicate(self, items: List[BaseModel]) -> List[BaseModel]:
+        """Greedily keeps items whose question is not too similar to one already kept."""
+        if len(items) < 2:
+            return items
+        vectors = await self.executor.run("cpu", run_ai_task, "embed_array", [item.question for item in items])
+        similarity = vectors @ vectors.T
+        kept: List[int] = []
+        for index in range(len(items)):
+            if not kept or np.max(similarity[index, kept]) < self.dedup_similarity:
+                kept.append(index)
+        return [items[index] for index in kept]
+
+
+def section_cache_key(kind: str, section: str) -> str:
+    section_hash = hashlib.sha256(section.encode("utf-8")).hexdigest()
+    return f"{kind}:{GENERATION_MODEL_NAME}:{GENERATOR_VERSION}:{section_hash}"
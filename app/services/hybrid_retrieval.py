@@ -0,0 +1,236 @@
+# study-assistant-backend/app/services/hybrid_retrieval.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.core.config import (
+    HYBRID_CANDIDATES,
+    HYBRID_LOCAL_MARGIN,
+    HYBRID_RRF_K,
+    KEYWORD_INDEX_CACHE_MAX_BYTES,
+)
+from app.services.executor import AIExecutor
+from app.services.keyword_index import KeywordIndex, tokenize
+from app.services.metrics import timed
+from app.services.retrieval_batcher import RetrievalBatcher
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = HYBRID_RRF_K) -> List[str]:
+    """Merges ranked lists of chunk texts by summing 1 / (k + rank) across lists."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, text in enumerate(ranking, start=1):
+            scores[text] = scores.get(text, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def answers_locally(hits: List[Tuple[int, float, int]], query_term_count: int, margin: float = HYBRID_LOCAL_MARGIN) -> bool:
+    """
+    Whether keyword hits are decisive enough to skip the vector search: the
+    best chunk contains every query term and clearly beats the runner-up.
+    This is what exact lookups (formulas, names, defined terms) look like.
+    """
+    if margin <= 0 or not hits or query_term_count == 0:
+        return False
+    _, best_score, matched_terms = hits[0]
+    if matched_terms < query_term_count:
+        return False
+    runner_up = hits[1][1] if len(hits) > 1 else 0.0
+    return best_score >= margin * runner_up
+
+
+class KeywordIndexStore:
+    """
+    Byte-bounded LRU of deserialized keyword indexes, keyed by content hash.
+    Concurrent misses for the same document share a single load.
+    """
+
+    def __init__(self, max_bytes: int = KEYWORD_INDEX_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._indexes: "OrderedDict[str, KeywordIndex]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        # Lookups of documents with no usable index, which fall back to vector search
+        self.missing = 0
+        # Indexes not stored at ingestion because they exceeded MongoDB's document size limit
+        self.too_large = 0
+
+    async def get_or_load(
+        self, content_hash: str, load: Callable[[str], Awaitable[Optional[dict]]]
+    ) -> Optional[KeywordIndex]:
+        """Returns the index for a document, or None if it has none (e.g. ingested before indexing existed)."""
+        index = self._indexes.get(content_hash)
+        if index is not None:
+            self._indexes.move_to_end(content_hash)
+            self.hits += 1
+            return index
+
+        pending = self._in_flight.get(content_hash)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            # The leading request was cancelled before it finished; load the index ourselves
+            return await self.get_or_load(content_hash, load)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._in_flight[content_hash] = pending
+        try:
+            index_doc = await load(content_hash)
+            # Decompression is CPU work; keep it off the event loop
+            index = await asyncio.to_thread(KeywordIndex.from_document, index_doc) if index_doc else None
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()
+            raise
+        else:
+            pending.set_result(index)
+            self.loads += 1
+            if index is None:
+                self.missing += 1
+            if index is not None and self._in_flight.get(content_hash) is pending:
+                self._put(content_hash, index)
+            return index
+        finally:
+            # Cancellation skips both branches above; wake the waiters so none hangs
+            if not pending.done():
+                pending.cancel()
+            if self._in_flight.get(content_hash) is pending:
+                del self._in_flight[content_hash]
+
+    def invalidate(self, content_hash: str):
+        """Drops a document's index, e.g. when it is re-ingested or deleted."""
+        index = self._indexes.pop(content_hash, None)
+        if index is not None:
+            self._bytes -= index.nbytes
+        self._in_flight.pop(content_hash, None)
+
+    def stats(self) -> dict:
+        return {
+            "indexes": len(self._indexes),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "missing": self.missing,
+            "too_large": self.too_large,
+        }
+
+    def _put(self, content_hash: str, index: KeywordIndex):
+        self.invalidate(content_hash)
+        if index.nbytes > self.max_bytes:
+            return
+        self._indexes[content_hash] = index
+        self._bytes += index.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._indexes.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+
+class RetrievalStats:
+    """How tutor queries were answered and how long retrieval took."""
+
+    def __init__(self):
+        self.local = 0
+        self.hybrid = 0
+        self.vector_only = 0
+        self.local_seconds = 0.0
+        self.remote_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        remote = self.hybrid + self.vector_only
+        return {
+            **vars(self),
+            "mean_local_seconds": self.local_seconds / self.local if self.local else 0.0,
+            "mean_remote_seconds": self.remote_seconds / remote if remote else 0.0,
+        }
+
+
+retrieval_stats = RetrievalStats()
+_index_store: Optional[KeywordIndexStore] = None
+
+
+def get_keyword_index_store() -> KeywordIndexStore:
+    """Returns the process-wide keyword index cache."""
+    global _index_store
+    if _index_store is None:
+        _index_store = KeywordIndexStore()
+    return _index_store
+
+
+class HybridRetriever:
+    """
+    Tutor retrieval combining Milvus ANN search with the document's BM25
+    keyword index.
+
+    Keyword-decisive questions are answered from the local index without a
+    Milvus round trip. Otherwise both retrievers contribute `candidates`
+    chunks and the lists are merged with reciprocal rank fusion. Documents
+    without a keyword index fall back to vector search alone. Keyword hits
+    are resolved to text by reading only the sections they fall in. Vector
+    searches go through the retrieval batcher, so concurrent questions share
+    embedding passes and Milvus calls.
+    """
+
+    def __init__(
+        self,
+        executor: AIExecutor,
+        batcher: RetrievalBatcher,
+        index_store: KeywordIndexStore,
+        load_index: Callable[[str], Awaitable[Optional[dict]]],
+        load_sections: Callable[[str, List[int]], Awaitable[Dict[int, str]]],
+        candidates: int = HYBRID_CANDIDATES,
+    ):
+        self.executor = executor
+        self.batcher = batcher
+        self.index_store = index_store
+        self.load_index = load_index
+        self.load_sections = load_sections
+        self.candidates = candidates
+
+    @timed("retrieval.retrieve_context")
+    async def retrieve_context(
+        self, collection, question: str, content_hash: str, top_k: int = 5, search_params: Optional[dict] = None,
+        question_vector: Optional[np.ndarray] = None
+    ) -> str:
+        """
+        Returns the top_k most relevant chunks of a document, joined for the
+        prompt. search_params tunes the Milvus search for this query, and
+        question_vector skips embedding a question the caller already embedded.
+        """
+        started = time.perf_counter()
+        keyword_ranking: List[str] = []
+        index = await self.index_store.get_or_load(content_hash, self.load_index)
+        if index is not None:
+            query_terms = set(tokenize(question))
+            hits = await self.executor.run("io", index.search, query_terms, self.candidates)
+            if answers_locally(hits, len(query_terms)):
+                local_ranking = await self._chunk_texts(index, content_hash, [doc_id for doc_id, _, _ in hits[:top_k]])
+                retrieval_stats.local += 1
+                retrieval_stats.local_seconds += time.perf_counter() - started
+                return "\n\n".join(local_ranking)
+            keyword_ranking = await self._chunk_texts(index, content_hash, [doc_id for doc_id, _, _ in hits])
+
+        vector_ranking = await self.batcher.search(
+            collection, question, content_hash, self.candidates, search_params, question_vector
+        )
+        if keyword_ranking:
+            retrieval_stats.hybrid += 1
+            chunks = reciprocal_rank_fusion([vector_ranking, keyword_ranking])
+        else:
+            retrieval_stats.vector_only += 1
+            chunks = vector_ranking
+        retrieval_stats.remote_seconds += time.perf_counter() - started
+        return "\n\n".join(chunks[:top_k])
+
+    async def _chunk_texts(self, index: KeywordIndex, content_hash: str, doc_ids: List[int]) -> List[str]:
+        sections = await self.load_sections(content_hash, index.sections_for(doc_ids))
+        return index.chunk_texts(doc_ids, sections)
@@ -0,0 +1,193 @@
+# study-assistant-backend/app/services/ingestion_queue.py
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import (
+    INGESTION_WORKERS,
+    INGESTION_MAX_ATTEMPTS,
+    INGESTION_LEASE_SECONDS,
+    INGESTION_POLL_SECONDS,
+    INGESTION_RETRY_DELAY_SECONDS,
+)
+from app.crud.file_contents import FileContentCRUD
+from app.crud.jobs import JobCRUD
+from app.models.job import JobInDB
+from app.services.file_processor import process_and_embed_file
+
+logger = logging.getLogger(__name__)
+
+INGEST_JOB = "ingest"
+
+
+async def enqueue_ingestion(
+    db: AsyncIOMotorDatabase, file_path: str, user_id: str, file_id: str, content_hash: str
+) -> JobInDB:
+    """Queues an uploaded file for extraction and embedding."""
+    jobs_crud = JobCRUD(db.jobs)
+    return await jobs_crud.create_job(
+        INGEST_JOB,
+        {"file_path": file_path, "user_id": user_id, "file_id": file_id, "content_hash": content_hash},
+        max_attempts=INGESTION_MAX_ATTEMPTS,
+    )
+
+
+async def cancel_ingestion(db: AsyncIOMotorDatabase, content_hash: str):
+    """
+    Cancels queued ingestion of content whose last reference is gone and
+    removes the spooled uploads. A job already running finds the content
+    entry missing when it finishes and deletes what it wrote.
+    """
+    jobs = await JobCRUD(db.jobs).cancel_queued(INGEST_JOB, {"content_hash": content_hash}, "content deleted")
+    for job in jobs:
+        _remove_quietly(job.payload["file_path"])
+
+
+class IngestionWorkerPool:
+    """
+    Runs ingestion jobs from the `jobs` collection inside this process.
+
+    Each slot claims one job at a time, so the number of slots caps how many
+    documents this worker ingests concurrently. Jobs are claimed under a lease
+    that is renewed while they run; if the process dies, the lease lapses and
+    another worker (or this one after a restart) picks the job up again.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        concurrency: int = INGESTION_WORKERS,
+        lease_seconds: int = INGESTION_LEASE_SECONDS,
+        poll_seconds: float = INGESTION_POLL_SECONDS,
+    ):
+        self.db = db
+        self.jobs_crud = JobCRUD(db.jobs)
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def start(self):
+        for slot in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._run_slot(), name=f"ingest-{slot}"))
+
+    async def stop(self):
+        """Stops claiming new jobs and cancels the ones in progress; their leases will lapse."""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run_slot(self):
+        while not self._stopping.is_set():
+            try:
+                job = await self.jobs_crud.claim_next(INGEST_JOB, self.worker_id, self.lease_seconds)
+            except Exception:
+                logger.exception("Failed to claim ingestion job")
+                job = None
+            if job is None:
+                await self._fail_exhausted()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run_job(job)
+            except Exception:
+                # Bookkeeping failed; the lease lapses and the job is retried or swept
+                logger.exception("Failed to record the outcome of ingestion job %s", job.id)
+
+    async def _fail_exhausted(self):
+        """Gives up on jobs that were still running when their last lease expired."""
+        try:
+            jobs = await self.jobs_crud.fail_exhausted_leases(INGEST_JOB)
+            for job in jobs:
+                logger.error("Ingestion job %s lost its lease on attempt %d; giving up", job.id, job.attempts)
+                await FileContentCRUD(self.db.file_contents).mark_failed(job.payload["content_hash"])
+                _remove_quietly(job.payload["file_path"])
+        except Exception:
+            logger.exception("Failed to sweep expired ingestion jobs")
+
+    async def _run_job(self, job: JobInDB):
+        payload = job.payload
+        work = asyncio.create_task(process_and_embed_file(payload["file_path"], payload["content_hash"], self.db))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, work, lease_lost))
+        try:
+            await work
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            # Another worker may own the job now; leave its bookkeeping and spool file to it
+            logger.error("Ingestion job %s lost its lease on attempt %d; stopped processing", job.id, job.attempts)
+        except Exception as e:
+            logger.exception("Ingestion job %s failed on attempt %d", job.id, job.attempts)
+            if not await self.jobs_crud.mark_failed(job, str(e), INGESTION_RETRY_DELAY_SECONDS):
+                logger.warning("Ingestion job %s was taken over before its failure was recorded", job.id)
+            elif job.attempts >= job.max_attempts:
+                await FileContentCRUD(self.db.file_contents).mark_failed(payload["content_hash"])
+                _remove_quietly(payload["file_path"])
+        else:
+            if await self.jobs_crud.mark_done(job.id, self.worker_id):
+                _remove_quietly(payload["file_path"])
+            else:
+                logger.warning("Ingestion job %s was taken over before it was marked done", job.id)
+        finally:
+            heartbeat.cancel()
+            work.cancel()
+
+    async def _heartbeat(self, job_id: str, work: asyncio.Task, lease_lost: asyncio.Event):
+        """
+        Renews the job's lease while it runs. Transient errors are retried,
+        but once the lease is gone, or would lapse before the next renewal,
+        the work is cancelled so the job never runs on two workers at once.
+        """
+        loop = asyncio.get_running_loop()
+        interval = self.lease_seconds / 3
+        expires_at = loop.time() + self.lease_seconds
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.jobs_crud.extend_lease(job_id, self.worker_id, self.lease_seconds):
+                    break
+                expires_at = loop.time() + self.lease_seconds
+            except Exception:
+                logger.warning("Failed to renew the lease of ingestion job %s", job_id, exc_info=True)
+                if expires_at - loop.time() <= interval:
+                    break
+        lease_lost.set()
+        work.cancel()
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_pool: Optional[IngestionWorkerPool] = None
+
+
+def start_ingestion_workers(db: AsyncIOMotorDatabase) -> IngestionWorkerPool:
+    """Starts the in-process ingestion workers. Called once at startup."""
+    global _pool
+    if _pool is None:
+        _pool = IngestionWorkerPool(db)
+        _pool.start()
+    return _pool
+
+
+async def stop_ingestion_workers():
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
@@ -0,0 +1,221 @@
+# study-assistant-backend/app/services/keyword_index.py
+
+import heapq
+import math
+import re
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from bson import Binary
+
+# 2 stores chunk spans into content_sections instead of the chunk texts
+FORMAT_VERSION = 2
+
+# Words plus compounds such as "e=mc^2", "h2o" or "x-ray"; compounds are
+# indexed whole and as their parts so both forms of a query match
+_TOKEN_RE = re.compile(r"\w+(?:[=^+\-*/.']\w+)*")
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from how in is it its of on or that the "
+    "this to was were what when where which who why will with".split()
+)
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased index terms of a text, without stopwords."""
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token not in _STOPWORDS:
+            terms.append(token)
+        if not token.isalnum():
+            terms.extend(part for part in _WORD_RE.findall(token) if part not in _STOPWORDS)
+    return terms
+
+
+class KeywordIndex:
+    """
+    Read-only BM25 index over a document's chunks.
+
+    Postings are stored column-wise in flat arrays: the postings of term i
+    are doc_ids[offsets[i]:offsets[i + 1]] with matching term frequencies in
+    tfs. Chunk texts are not kept: each chunk is a span (chunk_starts,
+    chunk_lengths) of the document text, which is stored once as
+    content_sections starting at section_offsets, so hits are resolved by
+    reading just the sections they fall in (see sections_for/chunk_texts).
+    """
+
+    def __init__(
+        self,
+        terms: List[str],
+        offsets: array,
+        doc_ids: array,
+        tfs: array,
+        doc_lengths: array,
+        chunk_starts: array,
+        chunk_lengths: array,
+        section_offsets: array,
+    ):
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.chunk_starts = chunk_starts
+        self.chunk_lengths = chunk_lengths
+        self.section_offsets = section_offsets
+        self.doc_count = len(doc_lengths)
+        # Floor at 1 so chunks made only of stopwords cannot divide by zero
+        self.avg_doc_length = max(sum(doc_lengths) / self.doc_count, 1.0) if self.doc_count else 1.0
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate in-memory size, used to bound the index cache."""
+        arrays = (
+            self.offsets, self.doc_ids, self.tfs, self.doc_lengths,
+            self.chunk_starts, self.chunk_lengths, self.section_offsets,
+        )
+        # Rough per-entry cost of the term dictionary
+        return sum(a.itemsize * len(a) for a in arrays) + 80 * len(self.term_ids)
+
+    def sections_for(self, doc_ids: Iterable[int]) -> List[int]:
+        """Sequence numbers of the sections that hold the given chunks."""
+        seqs = set()
+        for doc_id in doc_ids:
+            start = self.chunk_starts[doc_id]
+            first = bisect_right(self.section_offsets, start) - 1
+            last = bisect_right(self.section_offsets, start + self.chunk_lengths[doc_id] - 1) - 1
+            seqs.update(range(first, last + 1))
+        return sorted(seqs)
+
+    def chunk_texts(self, doc_ids: List[int], sections: Dict[int, str]) -> List[str]:
+        """Cuts the given chunks out of their sections, fetched by sequence number."""
+        texts = []
+        for doc_id in doc_ids:
+            start = self.chunk_starts[doc_id]
+            end = start + self.chunk_lengths[doc_id]
+            seqs = self.sections_for([doc_id])
+            text = "".join(sections[seq] for seq in seqs)
+            base = self.section_offsets[seqs[0]]
+            texts.append(text[start - base:end - base])
+        return texts
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        return 0 if term_id is None else self.offsets[term_id + 1] - self.offsets[term_id]
+
+    def search(self, query_terms: Iterable[str], top_k: int) -> List[Tuple[int, float, int]]:
+        """
+        Scores chunks against the query terms with BM25. Returns up to top_k
+        (doc_id, score, matched_terms) tuples, best first.
+        """
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in set(query_terms):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            df = end - start
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            for i in range(start, end):
+                doc_id = self.doc_ids[i]
+                tf = self.tfs[i]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / self.avg_doc_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score, matched[doc_id]) for doc_id, score in best]
+
+    def to_document(self) -> dict:
+        """Serializes the index into compressed binary fields for MongoDB."""
+        terms = sorted(self.term_ids, key=self.term_ids.get)
+        return {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "doc_count": self.doc_count,
+            "terms": Binary(zlib.compress("\n".join(terms).encode("utf-8"))),
+            "offsets": Binary(zlib.compress(self.offsets.tobytes())),
+            "doc_ids": Binary(zlib.compress(self.doc_ids.tobytes())),
+            "tfs": Binary(zlib.compress(self.tfs.tobytes())),
+            "doc_lengths": Binary(zlib.compress(self.doc_lengths.tobytes())),
+            "chunk_starts": Binary(zlib.compress(self.chunk_starts.tobytes())),
+            "chunk_lengths": Binary(zlib.compress(self.chunk_lengths.tobytes())),
+            "section_offsets": Binary(zlib.compress(self.section_offsets.tobytes())),
+        }
+
+    @classmethod
+    def from_document(cls, index_doc: dict) -> Optional["KeywordIndex"]:
+        """Deserializes an index; returns None for an older format, which needs re-ingestion."""
+        if index_doc.get("version") != FORMAT_VERSION:
+            return None
+        swap = index_doc["byteorder"] != sys.byteorder
+
+        def load_array(typecode: str, field: str) -> array:
+            values = array(typecode)
+            values.frombytes(zlib.decompress(index_doc[field]))
+            if swap:
+                values.byteswap()
+            return values
+
+        terms_blob = zlib.decompress(index_doc["terms"]).decode("utf-8")
+        return cls(
+            terms_blob.split("\n") if terms_blob else [],
+            load_array("I", "offsets"),
+            load_array("I", "doc_ids"),
+            load_array("H", "tfs"),
+            load_array("I", "doc_lengths"),
+            load_array("Q", "chunk_starts"),
+            load_array("I", "chunk_lengths"),
+            load_array("Q", "section_offsets"),
+        )
+
+
+class KeywordIndexBuilder:
+    """
+    Accumulates chunk postings during ingestion and freezes them into a
+    KeywordIndex. Only postings and chunk spans are held, not chunk text.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_lengths = array("I")
+        self._chunk_starts = array("Q")
+        self._chunk_lengths = array("I")
+
+    def add(self, spans: List[Tuple[int, str]]):
+        """Indexes chunks given as (offset in the document text, chunk text)."""
+        for start, chunk in spans:
+            doc_id = len(self._doc_lengths)
+            terms = tokenize(chunk)
+            for term, tf in Counter(terms).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(doc_id)
+                postings[1].append(min(tf, 0xFFFF))
+            self._doc_lengths.append(len(terms))
+            self._chunk_starts.append(start)
+            self._chunk_lengths.append(len(chunk))
+
+    def build(self, section_offsets: array) -> KeywordIndex:
+        """Freezes the index; section_offsets are where each stored section starts in the text."""
+        terms = sorted(self._postings)
+        offsets = array("I", [0])
+        doc_ids = array("I")
+        tfs = array("H")
+        for term in terms:
+            term_doc_ids, term_tfs = self._postings[term]
+            doc_ids.extend(term_doc_ids)
+            tfs.extend(term_tfs)
+            offsets.append(len(doc_ids))
+        return KeywordIndex(
+            terms, offsets, doc_ids, tfs, self._doc_lengths,
+            self._chunk_starts, self._chunk_lengths, array("Q", section_offsets),
+        )
@@ -0,0 +1,259 @@
+# study-assistant-backend/app/services/metrics.py
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+from app.core.config import LOOP_LAG_INTERVAL_SECONDS
+
+# Upper bounds in seconds, wide enough for a JWT check and a whole ingestion
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+# Stage durations of the current request, for the slow-request log. Work
+# handed to the executor runs in a fresh context and is only counted globally.
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+    def cumulative(self) -> list:
+        """Returns (upper bound, observations <= bound) pairs, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class _StageMetrics:
+    def __init__(self):
+        self.latency = Histogram()
+        self.in_flight = 0
+        self.errors = 0
+
+    def copy(self) -> "_StageMetrics":
+        stage = _StageMetrics()
+        stage.latency = self.latency.copy()
+        stage.in_flight = self.in_flight
+        stage.errors = self.errors
+        return stage
+
+
+class Metrics:
+    """
+    Process-wide request and stage metrics.
+
+    Spans are recorded from the event loop and from executor threads, so
+    every update takes a lock; it is held for a few dictionary operations.
+    In process mode, spans inside the CPU workers stay in those processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, _StageMetrics] = {}
+        self.requests: Dict[Tuple[str, str, str], Histogram] = {}
+        self.requests_in_flight = 0
+        self.loop_lag = Histogram()
+        self.max_loop_lag = 0.0
+
+    def stage_started(self, stage: str):
+        with self._lock:
+            stage_metrics = self.stages.get(stage)
+            if stage_metrics is None:
+                stage_metrics = self.stages[stage] = _StageMetrics()
+            stage_metrics.in_flight += 1
+
+    def stage_finished(self, stage: str, seconds: float, failed: bool):
+        with self._lock:
+            stage_metrics = self.stages[stage]
+            stage_metrics.in_flight -= 1
+            stage_metrics.latency.observe(seconds)
+            if failed:
+                stage_metrics.errors += 1
+        request_stages = _request_stages.get()
+        if request_stages is not None:
+            request_stages[stage] = request_stages.get(stage, 0.0) + seconds
+
+    def request_started(self):
+        with self._lock:
+            self.requests_in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, str(status))
+        with self._lock:
+            self.requests_in_flight -= 1
+            histogram = self.requests.get(key)
+            if histogram is None:
+                histogram = self.requests[key] = Histogram()
+            histogram.observe(seconds)
+
+    def record_loop_lag(self, seconds: float):
+        with self._lock:
+            self.loop_lag.observe(seconds)
+            self.max_loop_lag = max(self.max_loop_lag, seconds)
+
+    def snapshot(self) -> dict:
+        """Returns a consistent copy of everything recorded so far."""
+        with self._lock:
+            return {
+                "stages": {stage: stage_metrics.copy() for stage, stage_metrics in self.stages.items()},
+                "requests": {key: histogram.copy() for key, histogram in self.requests.items()},
+                "requests_in_flight": self.requests_in_flight,
+                "loop_lag": self.loop_lag.copy(),
+                "max_loop_lag": self.max_loop_lag,
+            }
+
+
+metrics = Metrics()
+
+
+class span:
+    """
+    Times a block as one stage, e.g. `with span("milvus.search"):`, and
+    counts it as in flight while it runs. Works with `async with` too.
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = 0.0
+
+    def __enter__(self):
+        metrics.stage_started(self.stage)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.stage_finished(self.stage, time.perf_counter() - self._started, exc_type is not None)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording every call of a function as a span. Generators are
+    timed from the first item to exhaustion. Async generators are left as
+    they are, since their time mostly belongs to whoever consumes them.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        if inspect.isasyncgenfunction(fn):
+            return fn
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+        elif inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with span(stage):
+                    yield from fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with span(stage):
+                    return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def instrumented(prefix: str) -> Callable[[type], type]:
+    """Class decorator applying timed(f"{prefix}.{method}") to every public method the class defines."""
+
+    def decorate(cls: type) -> type:
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(attr):
+                setattr(cls, name, timed(f"{prefix}.{name}")(attr))
+        return cls
+
+    return decorate
+
+
+def begin_request_stages() -> object:
+    """Starts collecting stage durations for the current request; returns a token for end_request_stages."""
+    return _request_stages.set({})
+
+
+def end_request_stages(token) -> Dict[str, float]:
+    stages = _request_stages.get() or {}
+    _request_stages.reset(token)
+    return stages
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a timer fires compared with when it
+    was due. Sustained lag means something is blocking the loop.
+    """
+
+    def __init__(self, interval_seconds: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            metrics.record_loop_lag(max(loop.time() - due, 0.0))
+
+
+_lag_monitor: Optional[LoopLagMonitor] = None
+
+
+def start_loop_lag_monitor() -> LoopLagMonitor:
+    """Starts sampling event-loop lag. Called once at startup."""
+    global _lag_monitor
+    if _lag_monitor is None:
+        _lag_monitor = LoopLagMonitor()
+        _lag_monitor.start()
+    return _lag_monitor
+
+
+async def stop_loop_lag_monitor():
+    global _lag_monitor
+    if _lag_monitor is not None:
+        await _lag_monitor.stop()
+        _lag_monitor = None
@@ -0,0 +1,117 @@
+# study-assistant-backend/app/services/model_registry.py
+
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from app.core.config import EMBEDDING_MODEL_NAME, GENERATION_MODEL_NAME, MODEL_MAX_CONCURRENCY
+
+
+class ModelRegistry:
+    """
+    Holds the embedding and generation models for the whole process.
+
+    Models are loaded once and shared by every request. Access goes through
+    bounded slots so a burst of requests cannot run more concurrent forward
+    passes than the host can handle.
+    """
+
+    def __init__(
+        self,
+        embedding_model_name: str = EMBEDDING_MODEL_NAME,
+        generation_model_name: str = GENERATION_MODEL_NAME,
+        max_concurrency: int = MODEL_MAX_CONCURRENCY,
+    ):
+        self.embedding_model_name = embedding_model_name
+        self.generation_model_name = generation_model_name
+        self.max_concurrency = max_concurrency
+        self.embedding_model = None
+        self.generation_model = None
+        self.load_seconds = {}
+        self.loaded_pid: Optional[int] = None
+        self._embedding_slots = threading.BoundedSemaphore(max_concurrency)
+        self._generation_slots = threading.BoundedSemaphore(max_concurrency)
+
+    def load(self) -> "ModelRegistry":
+        """Loads both models, recording how long each one took."""
+        from sentence_transformers import SentenceTransformer
+        from transformers import pipeline
+
+        start = time.perf_counter()
+        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        self.load_seconds["embedding"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.generation_model = pipeline("text2text-generation", model=self.generation_model_name)
+        self.load_seconds["generation"] = time.perf_counter() - start
+        self.loaded_pid = os.getpid()
+        return self
+
+    @contextmanager
+    def embedder(self):
+        """Borrows the shared embedding model for the duration of the block."""
+        with self._embedding_slots:
+            yield self.embedding_model
+
+    @contextmanager
+    def generator(self):
+        """Borrows the shared generation model for the duration of the block."""
+        with self._generation_slots:
+            yield self.generation_model
+
+    def stats(self) -> dict:
+        """Returns load times and the memory of the process."""
+        # ru_maxrss is reported in kilobytes on Linux
+        max_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {
+            "embedding_model": self.embedding_model_name,
+            "generation_model": self.generation_model_name,
+            "max_concurrency": self.max_concurrency,
+            "load_seconds": dict(self.load_seconds),
+            # Loaded by a parent before it forked this worker (see app.services.preload)
+            "preloaded": self.loaded_pid is not None and self.loaded_pid != os.getpid(),
+            "max_rss_bytes": max_rss_bytes,
+            **process_memory(),
+        }
+
+
+def process_memory() -> dict:
+    """
+    Proportional (PSS) and private memory of this process, in bytes. RSS
+    counts shared weight pages in full in every worker; PSS splits them
+    between the processes sharing them, and private memory is what the
+    worker costs on its own. Linux only; empty elsewhere.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return {}
+    kilobytes = {name: int(fields[name].split()[0]) for name in ("Pss", "Private_Clean", "Private_Dirty") if name in fields}
+    return {
+        "pss_bytes": kilobytes.get("Pss", 0) * 1024,
+        "private_bytes": (kilobytes.get("Private_Clean", 0) + kilobytes.get("Private_Dirty", 0)) * 1024,
+    }
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def load_model_registry() -> ModelRegistry:
+    """Creates and warms the process-wide registry. Called once at startup."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry().load()
+    return _registry
+
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the process-wide registry, loading it on first use."""
+    return _registry or load_model_registry()
+
+
+def model_registry_stats() -> dict:
+    """Returns the registry's stats without loading the models."""
+    return _registry.stats() if _registry is not None else {}
@@ -0,0 +1,47 @@
+# study-assistant-backend/app/services/preload.py
+
+import gc
+import importlib
+import logging
+import time
+from app.core.config import PRELOAD_MODELS
+from app.services.model_registry import load_model_registry
+
+# Imported lazily by the app, but every worker ends up needing them
+PRELOAD_MODULES = ("pymilvus", "pdfminer.high_level", "docx")
+
+logger = logging.getLogger(__name__)
+
+
+def preload_for_workers():
+    """
+    Prepares a pre-fork server's master process (see gunicorn.conf.py) so
+    forked workers start warm and share memory instead of duplicating it.
+
+    The heavy modules and, with PRELOAD_MODELS, the model weights are loaded
+    once here. Forked workers inherit them copy-on-write: weight tensors are
+    only read during inference, so their pages stay shared, and each
+    worker's startup skips the load entirely (load_model_registry() finds
+    the registry already set). gc.freeze() moves everything allocated so far
+    out of the collector's reach; otherwise the first collection in each
+    worker would write to every preloaded object and un-share its page.
+
+    Nothing here may start threads or open connections. Those do not
+    survive a fork; MongoDB, Milvus, the executors and background tasks are
+    still started per worker by the startup event. For the same reason the
+    models are not warmed up here: a forward pass would start the
+    inference library's thread pool in the master.
+    """
+    started = time.perf_counter()
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.info("Skipping preload of %s; it is not installed", name)
+    if PRELOAD_MODELS:
+        load_model_registry()
+    gc.freeze()
+    logger.info(
+        "Preloaded %s in %.2fs; %d objects frozen for sharing with workers",
+        "modules and models" if PRELOAD_MODELS else "modules", time.perf_counter() - started, gc.get_freeze_count(),
+    )
@@ -0,0 +1,174 @@
+# study-assistant-backend/app/services/profiler.py
+
+import logging
+import os
+import sys
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Optional
+from app.core.config import (
+    PROFILE_SLOW_REQUESTS,
+    PROFILE_SLOW_REQUEST_SECONDS,
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_PROFILES,
+)
+
+# Innermost frames kept per sample; deeper stacks are truncated at the root
+MAX_STACK_DEPTH = 48
+# Leaf frames from these files are threads parked on a lock, queue or selector
+IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+# Pool workers waiting for work sit in a C-level queue get, so their leaf is the worker loop
+IDLE_FUNCTIONS = ("_worker",)
+TOP_STACKS = 15
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestSamples:
+    """Stacks seen while one request was in flight, and how many sampling ticks it lasted."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.stacks: Counter = Counter()
+
+
+def _folded_stack(frame) -> Optional[str]:
+    """Formats a stack root-first as "fn (file:line);..." or returns None if the thread is idle."""
+    if os.path.basename(frame.f_code.co_filename) in IDLE_FILES or frame.f_code.co_name in IDLE_FUNCTIONS:
+        return None
+    parts = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SlowRequestProfiler:
+    """
+    Opt-in sampling profiler for slow requests.
+
+    While any request is in flight, a background thread samples the stacks
+    of every busy thread (the event loop, executor and hashing pools) every
+    `interval_ms` and adds them to each in-flight request. Requests that
+    take longer than `threshold_seconds` log their hottest stacks, and the
+    last `max_profiles` are kept for inspection. Concurrent requests share
+    the loop, so a profile shows what the process was doing while the
+    request waited, not only the request's own code.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float = PROFILE_SLOW_REQUEST_SECONDS,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+        max_profiles: int = PROFILE_MAX_PROFILES,
+    ):
+        self.threshold = threshold_seconds
+        self.interval = max(interval_ms, 1) / 1000
+        self._lock = threading.Lock()
+        self._active: Dict[int, _RequestSamples] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self.samples = 0
+        self.slow_requests = 0
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="slow-request-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def begin(self) -> _RequestSamples:
+        """Starts collecting samples for a request; pass the result to end()."""
+        samples = _RequestSamples()
+        with self._lock:
+            self._active[id(samples)] = samples
+        return samples
+
+    def end(self, samples: _RequestSamples, method: str, route: str, status: int, seconds: float, stages: Dict[str, float]):
+        with self._lock:
+            self._active.pop(id(samples), None)
+        if seconds < self.threshold:
+            return
+        self.slow_requests += 1
+        profile = {
+            "method": method,
+            "route": route,
+            "status": status,
+            "seconds": seconds,
+            "stages": stages,
+            "samples": samples.ticks,
+            "stacks": samples.stacks.most_common(TOP_STACKS),
+        }
+        self._profiles.append(profile)
+        # Each line is the share of samples in which that thread was running that stack
+        lines = [f"{count / samples.ticks:6.1%}  {stack}" for stack, count in profile["stacks"]] if samples.ticks else []
+        logger.warning(
+            "Slow request %s %s -> %s took %.3fs; stages %s; %d samples\n%s",
+            method, route, status, seconds,
+            {stage: round(value, 4) for stage, value in stages.items()}, samples.ticks, "\n".join(lines),
+        )
+
+    def profiles(self) -> List[dict]:
+        """Returns the most recent slow-request profiles, oldest first."""
+        return list(self._profiles)
+
+    def stats(self) -> dict:
+        return {
+            "threshold_seconds": self.threshold,
+            "samples": self.samples,
+            "slow_requests": self.slow_requests,
+            "active_requests": len(self._active),
+        }
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                active = list(self._active.values())
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _folded_stack(frame)
+                if stack is not None:
+                    stacks.append(f"{names.get(thread_id, thread_id)};{stack}")
+            self.samples += 1
+            with self._lock:
+                for samples in active:
+                    samples.ticks += 1
+                    samples.stacks.update(stacks)
+
+
+_profiler: Optional[SlowRequestProfiler] = None
+
+
+def start_slow_request_profiler() -> Optional[SlowRequestProfiler]:
+    """Starts the profiler if PROFILE_SLOW_REQUESTS is set. Called once at startup."""
+    global _profiler
+    if _profiler is None and PROFILE_SLOW_REQUESTS:
+        _profiler = SlowRequestProfiler()
+        _profiler.start()
+    return _profiler
+
+
+def stop_slow_request_profiler():
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+
+def get_slow_request_profiler() -> Optional[SlowRequestProfiler]:
+    """Returns the running profiler, or None when profiling is off."""
+    return _profiler
@@ -0,0 +1,194 @@
+# study-assistant-backend/app/services/retrieval_batcher.py
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from app.core.config import RETRIEVAL_BATCH_MAX_SIZE, RETRIEVAL_BATCH_WAIT_MS
+from app.services.ai_generator import AIGenerator, run_ai_task
+from app.services.executor import AIExecutor, get_ai_executor
+from app.services.model_registry import get_model_registry
+
+
+class _Query:
+    def __init__(
+        self, collection, question: str, content_hash: Optional[str], top_k: int,
+        search_params: Optional[dict], vector: Optional[np.ndarray] = None
+    ):
+        # A query without a collection only wants the question's embedding
+        self.collection = collection
+        self.question = question
+        self.content_hash = content_hash
+        self.top_k = top_k
+        self.search_params = search_params
+        self.vector = vector
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.perf_counter()
+
+    @property
+    def search_key(self) -> Tuple:
+        # Milvus applies one filter and one set of parameters per search call
+        params = tuple(sorted((self.search_params or {}).items()))
+        return (id(self.collection), self.content_hash, self.top_k, params)
+
+
+class BatcherStats:
+    """Batch size and queueing delay of the retrieval micro-batcher."""
+
+    def __init__(self):
+        self.batches = 0
+        self.queries = 0
+        self.searches = 0
+        self.max_batch_size = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        # Failed embedding passes or searches; only the affected callers see the error
+        self.failures = 0
+        # Batch count by size bucket (upper bound, inclusive)
+        self.batch_sizes: Dict[int, int] = defaultdict(int)
+
+    def record(self, batch: List[_Query], dispatched_at: float):
+        self.batches += 1
+        self.queries += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        bucket = 1
+        while bucket < len(batch):
+            bucket *= 2
+        self.batch_sizes[bucket] += 1
+        for query in batch:
+            waited = dispatched_at - query.enqueued_at
+            self.queue_seconds += waited
+            self.max_queue_seconds = max(self.max_queue_seconds, waited)
+
+    def snapshot(self) -> dict:
+        return {
+            **vars(self),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+            "mean_queue_seconds": self.queue_seconds / self.queries if self.queries else 0.0,
+        }
+
+
+class RetrievalBatcher:
+    """
+    Micro-batches vector retrieval across concurrent tutor requests.
+
+    Questions arriving within `max_wait_ms` of the first one, up to
+    `max_batch_size`, are embedded in a single forward pass. Questions about
+    the same document then share one multi-vector Milvus search; different
+    documents need different filters, so they are searched concurrently.
+    Each caller gets back its own ranked list of chunk texts. Callers that
+    need the question vector itself (the answer cache) get it from embed(),
+    which joins the same forward pass, and hand it back to search() so the
+    question is not encoded twice.
+    """
+
+    def __init__(
+        self,
+        executor: AIExecutor,
+        ai_gen: AIGenerator,
+        max_batch_size: int = RETRIEVAL_BATCH_MAX_SIZE,
+        max_wait_ms: float = RETRIEVAL_BATCH_WAIT_MS,
+    ):
+        self.executor = executor
+        self.ai_gen = ai_gen
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0) / 1000
+        self.stats = BatcherStats()
+        self._pending: List[_Query] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def embed(self, question: str) -> np.ndarray:
+        """Returns the question's embedding, computed in the next batched forward pass."""
+        return await self._submit(_Query(None, question, None, 0, None))
+
+    async def search(
+        self, collection, question: str, content_hash: str, top_k: int = 5, search_params: Optional[dict] = None,
+        vector: Optional[np.ndarray] = None
+    ) -> List[str]:
+        """
+        Returns the texts of the top_k nearest chunks of a document, nearest
+        first. Pass the vector from embed() if the question was already embedded.
+        """
+        return await self._submit(_Query(collection, question, content_hash, top_k, search_params, vector))
+
+    async def _submit(self, query: _Query):
+        self._pending.append(query)
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._dispatch)
+        return await query.future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Callers that gave up while waiting don't need a search
+        batch = [query for query in batch if not query.future.done()]
+        if not batch:
+            return
+        self.stats.record(batch, time.perf_counter())
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[_Query]):
+        try:
+            missing = [query for query in batch if query.vector is None]
+            if missing:
+                embedded = await self.executor.run("cpu", run_ai_task, "embed_array", [query.question for query in missing])
+                for query, vector in zip(missing, embedded):
+                    query.vector = vector
+            vectors = np.vstack([query.vector for query in batch])
+            groups: Dict[Tuple, List[int]] = defaultdict(list)
+            for position, query in enumerate(batch):
+                if query.collection is None:
+                    if not query.future.done():
+                        query.future.set_result(query.vector)
+                else:
+                    groups[query.search_key].append(position)
+            await asyncio.gather(*(self._search_group(batch, vectors, positions) for positions in groups.values()))
+        except Exception as e:
+            self._fail(batch, range(len(batch)), e)
+
+    async def _search_group(self, batch: List[_Query], vectors, positions: List[int]):
+        first = batch[positions[0]]
+        self.stats.searches += 1
+        try:
+            # The collection handle is not picklable, so the search stays on the I/O thread pool
+            rankings = await self.executor.run(
+                "io", self.ai_gen.search_milvus_vectors,
+                first.collection, vectors[positions], first.content_hash, first.top_k, first.search_params
+            )
+        except Exception as e:
+            self._fail(batch, positions, e)
+            return
+        for position, ranking in zip(positions, rankings):
+            if not batch[position].future.done():
+                batch[position].future.set_result(ranking)
+
+    def _fail(self, batch: List[_Query], positions, error: Exception):
+        self.stats.failures += 1
+        for position in positions:
+            if not batch[position].future.done():
+                batch[position].future.set_exception(error)
+
+
+_batcher: Optional[RetrievalBatcher] = None
+
+
+def get_retrieval_batcher() -> RetrievalBatcher:
+    """Returns the process-wide retrieval batcher."""
+    global _batcher
+    if _batcher is None:
+        _batcher = RetrievalBatcher(get_ai_executor(), AIGenerator(get_model_registry()))
+    return _batcher
+
+
+def retrieval_batcher_stats() -> dict:
+    """Returns the batcher's counters, or nothing if no tutor query has created it yet."""
+    return _batcher.stats.snapshot() if _batcher is not None else {}
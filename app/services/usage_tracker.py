@@ -0,0 +1,201 @@
+# study-assistant-backend/app/services/usage_tracker.py
+
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import FREE_DAILY_QNA_LIMIT, FREE_DAILY_FLASHCARD_LIMIT, USAGE_FLUSH_SECONDS, USAGE_ENFORCEMENT
+from app.crud.usage_logs import UsageLogCRUD
+from app.services.metrics import timed
+from app.models.user import UserDB
+
+logger = logging.getLogger(__name__)
+
+QNA = "qna"
+FLASHCARD = "flashcard"
+
+# Daily limits per plan; plans not listed are unlimited
+DAILY_LIMITS = {
+    "free": {QNA: FREE_DAILY_QNA_LIMIT, FLASHCARD: FREE_DAILY_FLASHCARD_LIMIT},
+}
+
+
+class _DailyCounter:
+    """A user's usage for one day: the stored value plus local deltas not yet flushed."""
+
+    def __init__(self, stored: dict):
+        self.stored = {QNA: stored.get("qna_count", 0), FLASHCARD: stored.get("flashcard_count", 0)}
+        self.unflushed = {QNA: 0, FLASHCARD: 0}
+
+    def total(self, kind: str) -> int:
+        return self.stored[kind] + self.unflushed[kind]
+
+
+class UsageTracker:
+    """
+    Per-user daily usage accounting.
+
+    With enforcement="database" (the default), limited plans are checked
+    and consumed with UsageLogCRUD.try_consume: one atomic round trip that
+    is exact across worker processes. Unlimited plans are only counted.
+
+    Counting, and enforcement="memory", use in-memory counters, so checking
+    and consuming quota is a single synchronous step on the event loop.
+    Deltas are written to usage_logs with one bulk_write per flush interval
+    and at shutdown; each flush also reloads the stored totals, which picks
+    up usage counted by other worker processes. Between flushes every
+    process admits up to the limit on its own, so "memory" is only exact
+    with a single worker.
+    """
+
+    def __init__(
+        self,
+        usage_crud: UsageLogCRUD,
+        flush_seconds: float = USAGE_FLUSH_SECONDS,
+        enforcement: str = USAGE_ENFORCEMENT,
+    ):
+        self.usage_crud = usage_crud
+        self.flush_seconds = flush_seconds
+        self.enforcement = enforcement
+        self._counters: Dict[Tuple[str, str], _DailyCounter] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.checks = 0
+        self.check_seconds = 0.0
+        self.rejected = 0
+        self.flushes = 0
+
+    @timed("usage.try_consume")
+    async def try_consume(self, user: UserDB, kind: str) -> Optional[str]:
+        """
+        Consumes one unit of quota if the user is under their daily limit.
+        Returns the day that was charged, for refund, or None if refused.
+        """
+        user_id = str(user.id)
+        limit = DAILY_LIMITS.get(user.plan, {}).get(kind)
+        if self.enforcement == "database" and limit is not None:
+            started = time.perf_counter()
+            day = await self.usage_crud.try_consume(user_id, kind, limit)
+            self._record_check(day is not None, started)
+            return day
+
+        day = date.today().isoformat()
+        counter = await self._counter(user_id, day)
+        started = time.perf_counter()
+        allowed = limit is None or counter.total(kind) < limit
+        if allowed:
+            counter.unflushed[kind] += 1
+        self._record_check(allowed, started)
+        return day if allowed else None
+
+    @timed("usage.refund")
+    async def refund(self, user: UserDB, kind: str, day: str):
+        """Gives back one unit of quota charged on `day`, e.g. when generation failed."""
+        limit = DAILY_LIMITS.get(user.plan, {}).get(kind)
+        if self.enforcement == "database" and limit is not None:
+            await self.usage_crud.refund(str(user.id), kind, day)
+            return
+        counter = await self._counter(str(user.id), day)
+        counter.unflushed[kind] -= 1
+
+    def _record_check(self, allowed: bool, started: float):
+        if not allowed:
+            self.rejected += 1
+        self.checks += 1
+        self.check_seconds += time.perf_counter() - started
+
+    @timed("usage.flush")
+    async def flush(self):
+        """Writes pending deltas in one bulk write and refreshes stored totals."""
+        async with self._flush_lock:
+            today = date.today().isoformat()
+            deltas = {}
+            for key, counter in self._counters.items():
+                fields = {f"{kind}_count": value for kind, value in counter.unflushed.items() if value}
+                if fields:
+                    deltas[key] = fields
+            if deltas:
+                await self.usage_crud.apply_deltas(deltas)
+                for key, fields in deltas.items():
+                    counter = self._counters[key]
+                    for field, value in fields.items():
+                        kind = field[:-len("_count")]
+                        counter.unflushed[kind] -= value
+                        counter.stored[kind] += value
+                self.flushes += 1
+
+            # Forget past days once flushed, then resync today's totals
+            for key in [key for key, counter in self._counters.items()
+                        if key[1] != today and not any(counter.unflushed.values())]:
+                del self._counters[key]
+            user_ids = [user_id for user_id, day in self._counters if day == today]
+            if user_ids:
+                stored = await self.usage_crud.get_daily_counts(user_ids, today)
+                for user_id in user_ids:
+                    counter = self._counters.get((user_id, today))
+                    if counter and user_id in stored:
+                        counter.stored = _DailyCounter(stored[user_id]).stored
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stops the periodic flush and writes whatever is still pending."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self._counters),
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "mean_check_seconds": self.check_seconds / self.checks if self.checks else 0.0,
+            "flushes": self.flushes,
+        }
+
+    async def _counter(self, user_id: str, day: str) -> _DailyCounter:
+        key = (user_id, day)
+        counter = self._counters.get(key)
+        if counter is None:
+            stored = await self.usage_crud.get_daily_counts([user_id], key[1])
+            # Another request may have loaded it while we were waiting
+            counter = self._counters.setdefault(key, _DailyCounter(stored.get(user_id, {})))
+        return counter
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush usage counters")
+
+
+_tracker: Optional[UsageTracker] = None
+
+
+def start_usage_tracker(db: AsyncIOMotorDatabase) -> UsageTracker:
+    """Creates the process-wide usage tracker and starts its flush loop."""
+    global _tracker
+    if _tracker is None:
+        _tracker = UsageTracker(UsageLogCRUD(db.usage_logs))
+        _tracker.start()
+    return _tracker
+
+
+async def stop_usage_tracker():
+    global _tracker
+    if _tracker is not None:
+        await _tracker.stop()
+        _tracker = None
+
+
+def usage_tracker_stats() -> dict:
+    """Returns the tracker's counters, or nothing before it has started."""
+    return _tracker.stats() if _tracker is not None else {}
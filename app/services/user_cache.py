@@ -0,0 +1,70 @@
+# study-assistant-backend/app/services/user_cache.py
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+from app.core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES
+from app.models.user import UserDB
+from app.utils.ttl_cache import TTLCache
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users keyed by user id.
+
+    Concurrent misses for the same user share a single database lookup.
+    Entries must be invalidated whenever a user's plan or password changes.
+    """
+
+    def __init__(self, max_entries: int = USER_CACHE_MAX_ENTRIES, ttl_seconds: float = USER_CACHE_TTL_SECONDS):
+        self._cache = TTLCache(max_entries, ttl_seconds)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def get_or_load(self, user_id: str, load: Callable[[str], Awaitable[Optional[UserDB]]]) -> Optional[UserDB]:
+        """Returns the cached user, loading it once if several requests miss together."""
+        user = self._cache.get(user_id)
+        if user is not None:
+            return user
+
+        pending = self._in_flight.get(user_id)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            # The leading request was cancelled before it finished; look the user up ourselves
+            return await self.get_or_load(user_id, load)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._in_flight[user_id] = pending
+        try:
+            user = await load(user_id)
+        except Exception as e:
+            pending.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            pending.exception()
+            raise
+        else:
+            pending.set_result(user)
+            if user is not None and self._in_flight.get(user_id) is pending:
+                self._cache.set(user_id, user)
+            return user
+        finally:
+            # Cancellation skips both branches above; wake the waiters so none hangs
+            if not pending.done():
+                pending.cancel()
+            if self._in_flight.get(user_id) is pending:
+                del self._in_flight[user_id]
+
+    def invalidate(self, user_id: str):
+        """Drops a user, including any lookup that started before the change."""
+        self._cache.pop(user_id)
+        self._in_flight.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "coalesced": self.coalesced}
+
+
+user_cache = UserCache()
@@ -0,0 +1,39 @@
+# study-assistant-backend/app/utils/pagination.py
+
+import base64
+from bson import ObjectId
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Keyset order used by every paginated listing; (created_at, _id) is unique and indexed
+def keyset_sort(descending: bool) -> List[Tuple[str, int]]:
+    direction = -1 if descending else 1
+    return [("created_at", direction), ("_id", direction)]
+
+def encode_cursor(created_at: datetime, doc_id) -> str:
+    """Builds an opaque cursor pointing just after the given document."""
+    raw = f"{created_at.isoformat()}|{doc_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Parses a cursor from encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, doc_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ObjectId(doc_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def keyset_query(query: dict, cursor: Optional[str], descending: bool) -> dict:
+    """Adds the condition selecting documents strictly after the cursor."""
+    if not cursor:
+        return query
+    created_at, doc_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        **query,
+        "$or": [
+            {"created_at": {op: created_at}},
+            {"created_at": created_at, "_id": {op: doc_id}},
+        ],
+    }
@@ -0,0 +1,76 @@
+# study-assistant-backend/app/utils/text_splitter.py
+
+from typing import Iterable, Iterator, List, Tuple
+from app.core.config import CHUNK_SIZE, CHUNK_OVERLAP
+
+def _next_chunk_end(text: str, start: int, chunk_size: int, overlap: int) -> int:
+    """Finds where the chunk starting at `start` ends, preferring a whitespace break."""
+    end = min(start + chunk_size, len(text))
+    if end < len(text):
+        boundary = text.rfind(" ", start + overlap + 1, end)
+        if boundary != -1:
+            end = boundary
+    return end
+
+def iter_chunks(
+    pieces: Iterable[str],
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> Iterator[str]:
+    """
+    Incrementally splits a stream of text pieces (pages, paragraphs) into
+    overlapping chunks. Only the current unfinished chunk is buffered, so
+    chunks are emitted while the document is still being read.
+    Produces the same chunks as split_text on the concatenated pieces.
+    """
+    for _, chunk in iter_chunk_spans(pieces, chunk_size, overlap):
+        yield chunk
+
+def iter_chunk_spans(
+    pieces: Iterable[str],
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Tuple[int, str]]:
+    """Like iter_chunks, but yields (offset, chunk) with the chunk's start in the concatenated text."""
+    buffer = ""
+    # Offset of buffer[0] in the whole text
+    base = 0
+    for piece in pieces:
+        buffer += piece
+        start = 0
+        # A chunk is final once there is text beyond its furthest possible end
+        while len(buffer) - start > chunk_size:
+            end = _next_chunk_end(buffer, start, chunk_size, overlap)
+            span = _stripped_span(buffer, start, end, base)
+            if span is not None:
+                yield span
+            start = end - overlap
+        buffer = buffer[start:]
+        base += start
+    yield from _split_spans(buffer, chunk_size, overlap, base)
+
+def split_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Splits text into overlapping chunks of at most chunk_size characters,
+    preferring to break on whitespace.
+    """
+    return [chunk for _, chunk in _split_spans(text, chunk_size, overlap)]
+
+def _split_spans(text: str, chunk_size: int, overlap: int, base: int = 0) -> Iterator[Tuple[int, str]]:
+    start = 0
+    length = len(text)
+    while start < length:
+        end = _next_chunk_end(text, start, chunk_size, overlap)
+        span = _stripped_span(text, start, end, base)
+        if span is not None:
+            yield span
+        if end >= length:
+            break
+        start = end - overlap
+
+def _stripped_span(text: str, start: int, end: int, base: int):
+    raw = text[start:end]
+    chunk = raw.strip()
+    if not chunk:
+        return None
+    return base + start + len(raw) - len(raw.lstrip()), chunk
@@ -0,0 +1,84 @@
+# study-assistant-backend/app/utils/uploads.py
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from fastapi import UploadFile
+from app.core.config import UPLOAD_SPOOL_DIR, UPLOAD_MAX_BYTES, UPLOAD_CHUNK_BYTES
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class SpooledUpload:
+    """A fully written upload on local disk."""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+
+class UploadStats:
+    """Process-wide upload counters."""
+
+    def __init__(self):
+        self.uploads = 0
+        self.rejected = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def snapshot(self) -> dict:
+        throughput = self.bytes / self.seconds if self.seconds else 0.0
+        return {**vars(self), "bytes_per_second": throughput}
+
+
+upload_stats = UploadStats()
+
+
+async def spool_upload(
+    upload: UploadFile,
+    spool_dir: str = UPLOAD_SPOOL_DIR,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> SpooledUpload:
+    """
+    Streams an upload to a unique file under spool_dir in fixed-size chunks,
+    hashing it on the way. Disk writes run in a thread so the event loop is
+    never blocked, and only one chunk is held in memory at a time.
+
+    Raises UploadTooLarge as soon as the size limit is crossed.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        upload_stats.rejected += 1
+        raise UploadTooLarge(f"File exceeds the {max_bytes} byte limit.")
+
+    extension = os.path.splitext(upload.filename or "")[1].lower()
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{uuid.uuid4().hex}{extension}")
+
+    digest = hashlib.sha256()
+    size = 0
+    start = time.perf_counter()
+    buffer = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                upload_stats.rejected += 1
+                raise UploadTooLarge(f"File exceeds the {max_bytes} byte limit.")
+            digest.update(chunk)
+            await asyncio.to_thread(buffer.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(buffer.close)
+        os.remove(path)
+        raise
+    await asyncio.to_thread(buffer.close)
+
+    upload_stats.uploads += 1
+    upload_stats.bytes += size
+    upload_stats.seconds += time.perf_counter() - start
+    return SpooledUpload(path, size, digest.hexdigest())
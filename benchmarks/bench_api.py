@@ -0,0 +1,367 @@
+# study-assistant-backend/benchmarks/bench_api.py
+"""
+End-to-end load test of the main.py app against in-process stand-ins for
+MongoDB, Milvus and the models (see benchmarks/standins.py).
+
+    python -m benchmarks.bench_api --users 20 --requests 600 --concurrency 32
+    python -m benchmarks.bench_api --baseline benchmarks/results/api-20260101-120000.json
+
+Each user signs up, logs in and uploads a document (a quarter of them
+re-upload someone else's, to exercise deduplication), then a seeded mix of
+tutor, flashcard, upload, login and listing requests is replayed with the
+given concurrency. Requests go straight to the ASGI app, so the numbers
+cover routing, auth, CRUD, ingestion and the AI services, but not HTTP
+parsing or the network.
+
+Reports throughput and p50/p95/p99 latency per endpoint and saves JSON
+results; --baseline compares against an earlier run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from benchmarks.results import compare, latency_summary, save_results
+
+WORDS = (
+    "energy force mass photosynthesis chlorophyll glucose mitochondria enzyme protein "
+    "velocity acceleration momentum revolution monarchy parliament treaty economy "
+    "inflation demand supply equation derivative integral matrix vector theorem "
+    "molecule atom electron orbital reaction catalyst equilibrium pressure volume"
+).split()
+
+DEFAULT_MIX = "tutor=60,flashcards=10,upload=10,login=10,list_files=10"
+
+
+def make_document(rng: random.Random, sentences: int) -> str:
+    lines = []
+    for _ in range(sentences):
+        words = rng.choices(WORDS, k=rng.randint(8, 16))
+        lines.append(" ".join(words).capitalize() + ".")
+    # Paragraphs of five sentences
+    return "\n\n".join(" ".join(lines[i:i + 5]) for i in range(0, len(lines), 5))
+
+
+class ASGIClient:
+    """Minimal in-process HTTP client for an ASGI app, including its lifespan."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_queue: asyncio.Queue = asyncio.Queue()
+        self._lifespan_events: asyncio.Queue = asyncio.Queue()
+        self._lifespan_task: Optional[asyncio.Task] = None
+
+    async def startup(self):
+        async def receive():
+            return await self._lifespan_queue.get()
+
+        async def send(message):
+            await self._lifespan_events.put(message)
+
+        self._lifespan_task = asyncio.create_task(
+            self.app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send)
+        )
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        message = await self._lifespan_events.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"App failed to start: {message}")
+
+    async def shutdown(self):
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._lifespan_events.get()
+        await self._lifespan_task
+
+    async def request(
+        self, method: str, path: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes]:
+        path, _, query = path.partition("?")
+        raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "", "headers": raw_headers,
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80), "state": {},
+        }
+        sent = False
+        status = 500
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                await asyncio.Event().wait()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    async def json(self, method: str, path: str, payload=None, token: Optional[str] = None):
+        headers = {"content-type": "application/json"}
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+        body = json.dumps(payload).encode() if payload is not None else b""
+        status, raw = await self.request(method, path, body, headers)
+        return status, json.loads(raw) if raw else None
+
+    async def form(self, path: str, fields: Dict[str, str]):
+        status, raw = await self.request(
+            "POST", path, urlencode(fields).encode(), {"content-type": "application/x-www-form-urlencoded"}
+        )
+        return status, json.loads(raw) if raw else None
+
+    async def upload(self, path: str, filename: str, content: bytes, token: str):
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: text/plain\r\n\r\n"
+        ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+        status, raw = await self.request("POST", path, body, {
+            "content-type": f"multipart/form-data; boundary={boundary}",
+            "authorization": f"Bearer {token}",
+        })
+        return status, json.loads(raw) if raw else None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def timed(self, name: str, call):
+        started = time.perf_counter()
+        status, payload = await call
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][status] += 1
+        if status >= 400:
+            self.errors[name] += 1
+        return status, payload
+
+    def summaries(self, elapsed: float) -> Dict[str, dict]:
+        return {
+            name: {**latency_summary(values, elapsed, self.errors[name]), "statuses": dict(self.statuses[name])}
+            for name, values in sorted(self.latencies.items())
+        }
+
+
+def configure_environment(args, workdir: str):
+    """Points the app at throwaway directories; must run before any app module is imported."""
+    os.environ["AI_CPU_EXECUTOR_MODE"] = "thread"
+    os.environ["UPLOAD_SPOOL_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["EMBEDDING_CACHE_DIR"] = os.path.join(workdir, "embedding_cache")
+    os.environ["INGESTION_POLL_SECONDS"] = "0.05"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+    if args.bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+
+def install_standins(args):
+    """Swaps MongoDB, Milvus and the models for the in-process stand-ins."""
+    import app.db.milvus as milvus
+    import app.db.mongodb as mongodb
+    import app.services.model_registry as model_registry
+    import main
+    from app.core.config import EMBEDDING_DIM
+    from benchmarks.standins import FakeModelRegistry, MemoryClient, MemoryMilvusCollection
+
+    MemoryClient.latency_seconds = args.mongo_latency_ms / 1000
+    MemoryClient.databases = {}
+    mongodb.AsyncIOMotorClient = MemoryClient
+    standin_milvus = MemoryMilvusCollection(args.milvus_latency_ms / 1000, args.milvus_latency_ms / 1000)
+
+    async def connect_to_milvus():
+        milvus._collection = standin_milvus
+
+    async def disconnect_from_milvus():
+        milvus._collection = None
+
+    main.connect_to_milvus = connect_to_milvus
+    main.disconnect_from_milvus = disconnect_from_milvus
+    model_registry._registry = FakeModelRegistry(
+        EMBEDDING_DIM, args.embed_call_ms, args.embed_text_ms, args.generate_ms
+    ).load()
+    return main.app, standin_milvus
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+async def wait_for_job(client: ASGIClient, job_id: Optional[str], token: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while job_id and time.monotonic() < deadline:
+        _, job = await client.json("GET", f"/api/v1/files/jobs/{job_id}", token=token)
+        if job["status"] in ("done", "failed"):
+            return job["status"]
+        await asyncio.sleep(0.05)
+    return "ready" if not job_id else "timeout"
+
+
+async def run(args) -> dict:
+    app, standin_milvus = install_standins(args)
+    from app.crud.users import UserCRUD
+    from app.db.mongodb import get_mongo_db
+
+    rng = random.Random(args.seed)
+    client = ASGIClient(app)
+    recorder = Recorder()
+    await client.startup()
+
+    # Setup: every user signs up, logs in and uploads one document
+    users = []
+    documents: List[str] = []
+
+    async def setup_user(i: int):
+        email = f"user{i}@bench.local"
+        password = f"password-{i}"
+        status, user = await recorder.timed("signup", client.json("POST", "/api/v1/auth/signup", {"email": email, "password": password}))
+        if status != 200:
+            raise RuntimeError(f"Signup failed: {status} {user}")
+        # Premium users, so the daily free limits don't turn the mix into 402s
+        await UserCRUD(get_mongo_db().users).update_plan(user["_id"], "premium")
+        _, login = await recorder.timed("login", client.form("/api/v1/auth/login", {"username": email, "password": password}))
+        token = login["access_token"]
+        if documents and rng.random() < 0.25:
+            text = rng.choice(documents)
+        else:
+            text = make_document(rng, args.sentences)
+            documents.append(text)
+        status, uploaded = await recorder.timed(
+            "upload", client.upload("/api/v1/files/upload", f"notes-{i}.txt", text.encode(), token)
+        )
+        users.append({"email": email, "password": password, "token": token, "text": text, "file_id": uploaded["file_id"]})
+        await wait_for_job(client, uploaded["job_id"], token)
+
+    setup_started = time.perf_counter()
+    for start in range(0, args.users, args.concurrency):
+        await asyncio.gather(*(setup_user(i) for i in range(start, min(start + args.concurrency, args.users))))
+    setup_seconds = time.perf_counter() - setup_started
+
+    # Mixed traffic
+    mix = parse_mix(args.mix)
+    plan = rng.choices(list(mix), weights=list(mix.values()), k=args.requests)
+    next_request = iter(enumerate(plan))
+
+    async def request(kind: str, user: dict):
+        token = user["token"]
+        if kind == "tutor":
+            words = rng.sample(user["text"].split(), 4)
+            question = f"What is the relation between {' and '.join(words)}?"
+            await recorder.timed("tutor", client.json("POST", "/api/v1/ai/tutor", {"file_id": user["file_id"], "question": question}, token))
+        elif kind == "flashcards":
+            await recorder.timed("flashcards", client.json("POST", "/api/v1/ai/flashcards", {"file_id": user["file_id"]}, token))
+        elif kind == "upload":
+            text = make_document(rng, args.sentences)
+            _, uploaded = await recorder.timed("upload", client.upload("/api/v1/files/upload", "extra.txt", text.encode(), token))
+            if uploaded and uploaded.get("job_id"):
+                await wait_for_job(client, uploaded["job_id"], token)
+        elif kind == "login":
+            await recorder.timed("login", client.form("/api/v1/auth/login", {"username": user["email"], "password": user["password"]}))
+        elif kind == "list_files":
+            await recorder.timed("list_files", client.json("GET", "/api/v1/files/?limit=20", token=token))
+        else:
+            raise ValueError(f"Unknown request kind {kind}")
+
+    async def worker():
+        for _, kind in next_request:
+            await request(kind, rng.choice(users))
+
+    # Only the mixed phase counts towards per-endpoint throughput
+    recorder = Recorder()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = {
+        "config": vars(args),
+        "setup_seconds": round(setup_seconds, 3),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(args.requests / elapsed, 2),
+        "operations": recorder.summaries(elapsed),
+        "service_stats": collect_stats(standin_milvus),
+    }
+    await client.shutdown()
+    return results
+
+
+def collect_stats(standin_milvus) -> dict:
+    from app.db.mongodb import get_mongo_db
+    from app.services.answer_cache import get_answer_cache
+    from app.services.embedding_pipeline import pipeline_stats
+    from app.services.executor import get_ai_executor
+    from app.services.hybrid_retrieval import get_keyword_index_store, retrieval_stats
+    from app.services.model_registry import get_model_registry
+    from app.services.retrieval_batcher import get_retrieval_batcher
+
+    registry = get_model_registry()
+    return {
+        "executor": get_ai_executor().stats(),
+        "retrieval": retrieval_stats.snapshot(),
+        "retrieval_batcher": get_retrieval_batcher().stats.snapshot(),
+        "keyword_indexes": get_keyword_index_store().stats(),
+        "answer_cache": get_answer_cache().stats(),
+        "embedding_pipeline": pipeline_stats.snapshot(),
+        "embedder": {"calls": registry.embedding_model.calls, "texts": registry.embedding_model.texts},
+        "generator": {"calls": registry.generation_model.calls},
+        "milvus": standin_milvus.stats(),
+        "mongo_operations": get_mongo_db().operation_counts(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="request weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--sentences", type=int, default=200, help="sentences per generated document")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="defaults to the app's BCRYPT_ROUNDS")
+    parser.add_argument("--mongo-latency-ms", type=float, default=0.2, help="simulated round trip per MongoDB operation")
+    parser.add_argument("--milvus-latency-ms", type=float, default=1.0, help="simulated round trip per Milvus call")
+    parser.add_argument("--embed-call-ms", type=float, default=5.0, help="fixed cost per embedding forward pass")
+    parser.add_argument("--embed-text-ms", type=float, default=0.5, help="additional cost per embedded text")
+    parser.add_argument("--generate-ms", type=float, default=20.0, help="cost per generation call")
+    parser.add_argument("--output", default=None, help="JSON results path (default benchmarks/results/api-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-api-") as workdir:
+        configure_environment(args, workdir)
+        results = asyncio.run(run(args))
+
+    print(f"{args.requests} requests in {results['seconds']}s ({results['requests_per_second']} req/s), "
+          f"setup {results['setup_seconds']}s")
+    for name, summary in results["operations"].items():
+        print(f"{name:<12} n={summary['count']:<5} err={summary['errors']:<3} "
+              f"{summary['throughput_per_second']:>8}/s  p50 {summary['p50_ms']:>9}ms  "
+              f"p95 {summary['p95_ms']:>9}ms  p99 {summary['p99_ms']:>9}ms")
+    print(f"saved {save_results('api', results, args.output)}")
+    if args.baseline:
+        for line in compare(results["operations"], args.baseline, args.threshold):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
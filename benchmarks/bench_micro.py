@@ -0,0 +1,213 @@
+# study-assistant-backend/benchmarks/bench_micro.py
+"""
+Micro-benchmarks for the hot paths behind ingestion and generation.
+
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --only crud --mongo-uri mongodb://localhost:27017
+    python -m benchmarks.bench_micro --baseline benchmarks/results/micro-20260101-120000.json
+
+  chunking   iter_chunks over streamed pieces vs split_text on the whole text
+  embedding  AIGenerator.embed_array at several batch sizes, and the tutor
+             retrieval batcher vs one search per question (fake embedder
+             with a fixed per-call plus per-text cost)
+  crud       bulk inserts (flashcards, sections, usage deltas) vs one
+             round trip per document, against the in-memory stand-in with
+             simulated latency or a real MongoDB via --mongo-uri
+
+Every operation reports throughput and p50/p95/p99 per iteration; results
+are saved as JSON and can be compared with --baseline.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List
+from benchmarks.results import compare, latency_summary, save_results
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_started)
+    return latency_summary(latencies, time.perf_counter() - started)
+
+
+async def measure_async(fn, iterations: int) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - call_started)
+    return latency_summary(latencies, time.perf_counter() - started)
+
+
+def bench_chunking(args, rng: random.Random) -> Dict[str, dict]:
+    from app.utils.text_splitter import iter_chunks, split_text
+
+    words = [f"word{i}" for i in range(2000)]
+    paragraphs = [" ".join(rng.choices(words, k=rng.randint(40, 160))) + "\n\n" for _ in range(args.paragraphs)]
+    text = "".join(paragraphs)
+    megabytes = len(text.encode("utf-8")) / 1e6
+    results = {
+        "chunking.iter_chunks": measure(lambda: sum(1 for _ in iter_chunks(iter(paragraphs))), args.iterations),
+        "chunking.split_text": measure(lambda: split_text(text), args.iterations),
+    }
+    for summary in results.values():
+        summary["megabytes_per_second"] = round(summary["throughput_per_second"] * megabytes, 2)
+    return results
+
+
+async def bench_embedding(args, rng: random.Random) -> Dict[str, dict]:
+    import app.services.model_registry as model_registry
+    from app.core.config import EMBEDDING_DIM
+    from app.services.ai_generator import AIGenerator
+    from app.services.executor import AIExecutor
+    from app.services.retrieval_batcher import RetrievalBatcher
+    from benchmarks.standins import FakeModelRegistry, MemoryMilvusCollection
+
+    registry = FakeModelRegistry(EMBEDDING_DIM, args.embed_call_ms, args.embed_text_ms).load()
+    model_registry._registry = registry
+    ai_gen = AIGenerator(registry)
+    counter = iter(range(10 ** 9))
+
+    def fresh_texts(count: int) -> List[str]:
+        # Unique texts, so the embedding cache never answers for the model
+        return [f"sample sentence {next(counter)} about {rng.random()}" for _ in range(count)]
+
+    results = {}
+    for batch_size in args.batch_sizes:
+        summary = measure(lambda: ai_gen.embed_array(fresh_texts(batch_size)), args.iterations)
+        summary["texts_per_second"] = round(summary["throughput_per_second"] * batch_size, 1)
+        results[f"embedding.batch_{batch_size}"] = summary
+
+    collection = MemoryMilvusCollection()
+    vectors = ai_gen.embed_array(fresh_texts(64))
+    collection.insert([["a" * 64] * 64, [f"chunk {i}" for i in range(64)], vectors])
+    executor = AIExecutor()
+    for max_batch_size in (1, args.retrieval_batch):
+        batcher = RetrievalBatcher(executor, ai_gen, max_batch_size=max_batch_size, max_wait_ms=args.retrieval_wait_ms)
+
+        async def burst():
+            await asyncio.gather(*(
+                batcher.search(collection, question, "a" * 64) for question in fresh_texts(args.concurrency)
+            ))
+
+        summary = await measure_async(burst, args.iterations)
+        summary["questions_per_second"] = round(summary["throughput_per_second"] * args.concurrency, 1)
+        summary["mean_batch_size"] = round(batcher.stats.snapshot()["mean_batch_size"], 2)
+        results[f"embedding.retrieval_batch_{max_batch_size}"] = summary
+    executor.shutdown()
+    return results
+
+
+async def bench_crud(args, rng: random.Random) -> Dict[str, dict]:
+    from bson import ObjectId
+    from app.crud.content_sections import ContentSectionCRUD
+    from app.crud.flashcards import FlashcardCRUD
+    from app.crud.usage_logs import UsageLogCRUD
+    from app.models.flashcard import FlashcardBase
+
+    if args.mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(args.mongo_uri)
+        db = client[f"bench_{ObjectId()}"]
+    else:
+        from benchmarks.standins import MemoryDatabase
+
+        client = None
+        db = MemoryDatabase(args.mongo_latency_ms / 1000)
+
+    flashcards = FlashcardCRUD(db.flashcards)
+    sections = ContentSectionCRUD(db.content_sections)
+    usage = UsageLogCRUD(db.usage_logs)
+    cards = [FlashcardBase(question=f"Question {i}?", answer=f"Answer {i}") for i in range(args.documents)]
+    texts = ["x" * 8000 for _ in range(args.documents)]
+    day = "2026-01-01"
+
+    async def one_by_one_flashcards():
+        for card in cards:
+            await flashcards.create_flashcards(str(ObjectId()), [card])
+
+    async def one_by_one_usage():
+        for i in range(args.documents):
+            await usage.collection.update_one({"user_id": f"u{i}", "date": day}, {"$inc": {"qna_count": 1}}, upsert=True)
+
+    results = {
+        "crud.flashcards_insert_many": await measure_async(
+            lambda: flashcards.create_flashcards(str(ObjectId()), cards), args.iterations
+        ),
+        "crud.flashcards_insert_one_each": await measure_async(one_by_one_flashcards, args.iterations),
+        "crud.sections_insert_many": await measure_async(
+            lambda: sections.insert_sections(str(ObjectId()), 0, texts), args.iterations
+        ),
+        "crud.usage_bulk_write": await measure_async(
+            lambda: usage.apply_deltas({(f"u{i}", day): {"qna_count": 1} for i in range(args.documents)}),
+            args.iterations,
+        ),
+        "crud.usage_update_one_each": await measure_async(one_by_one_usage, args.iterations),
+    }
+    for summary in results.values():
+        summary["documents_per_second"] = round(summary["throughput_per_second"] * args.documents, 1)
+    if client is not None:
+        await client.drop_database(db.name)
+        client.close()
+    return results
+
+
+async def run(args) -> Dict[str, dict]:
+    rng = random.Random(args.seed)
+    operations = {}
+    if "chunking" in args.only:
+        operations.update(bench_chunking(args, rng))
+    if "embedding" in args.only:
+        operations.update(await bench_embedding(args, rng))
+    if "crud" in args.only:
+        operations.update(await bench_crud(args, rng))
+    return operations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", default=["chunking", "embedding", "crud"], choices=["chunking", "embedding", "crud"])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--paragraphs", type=int, default=2000, help="paragraphs in the chunking corpus")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--embed-call-ms", type=float, default=5.0, help="fixed cost per embedding forward pass")
+    parser.add_argument("--embed-text-ms", type=float, default=0.5, help="additional cost per embedded text")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent questions per retrieval burst")
+    parser.add_argument("--retrieval-batch", type=int, default=32)
+    parser.add_argument("--retrieval-wait-ms", type=float, default=5.0)
+    parser.add_argument("--documents", type=int, default=200, help="documents per CRUD operation")
+    parser.add_argument("--mongo-latency-ms", type=float, default=0.2, help="simulated round trip for the stand-in")
+    parser.add_argument("--mongo-uri", default=None, help="benchmark CRUD against a real MongoDB instead")
+    parser.add_argument("--output", default=None, help="JSON results path (default benchmarks/results/micro-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-micro-") as workdir:
+        # Keep the embedding cache's disk tier out of the real cache directory
+        os.environ["EMBEDDING_CACHE_DIR"] = os.path.join(workdir, "embedding_cache")
+        operations = asyncio.run(run(args))
+
+    for name, summary in operations.items():
+        extras = "  ".join(f"{k}={v}" for k, v in summary.items() if k.endswith("_per_second") and k != "throughput_per_second")
+        print(f"{name:<36} {summary['throughput_per_second']:>9}/s  p50 {summary['p50_ms']:>9}ms  "
+              f"p95 {summary['p95_ms']:>9}ms  {extras}")
+    print(f"saved {save_results('micro', {'config': vars(args), 'operations': operations}, args.output)}")
+    if args.baseline:
+        for line in compare(operations, args.baseline, args.threshold):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
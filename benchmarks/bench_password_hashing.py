@@ -0,0 +1,57 @@
+# study-assistant-backend/benchmarks/bench_password_hashing.py
+"""
+Measures login throughput of the async password hashing API.
+
+    python -m benchmarks.bench_password_hashing --logins 200 --concurrency 32
+
+Reports logins/sec overall and per hashing worker (one worker per core by default).
+"""
+
+import argparse
+import asyncio
+import time
+from app.core import security
+
+
+async def run(logins: int, concurrency: int) -> dict:
+    password = "correct horse battery staple"
+    hashed = await security.get_password_hash_async(password)
+    slots = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        async with slots:
+            try:
+                valid, _ = await security.verify_and_update_password(password, hashed)
+            except security.PasswordHasherBusy:
+                rejected += 1
+                return
+            assert valid
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    completed = logins - rejected
+    return {
+        "bcrypt_rounds": security.BCRYPT_ROUNDS,
+        "workers": security.PASSWORD_HASH_WORKERS,
+        "logins": completed,
+        "rejected": rejected,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(completed / elapsed, 1),
+        "logins_per_second_per_core": round(completed / elapsed / security.PASSWORD_HASH_WORKERS, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    for key, value in asyncio.run(run(args.logins, args.concurrency)).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# study-assistant-backend/benchmarks/check_imports.py
+"""
+Import-time budget check for the application module.
+
+    python -m benchmarks.check_imports
+    python -m benchmarks.check_imports --budget-ms 600 --top 20
+
+Imports `main` in fresh interpreters under `python -X importtime` and
+fails (exit status 1) when the fastest run exceeds the budget or when any
+heavy dependency is imported eagerly. Model libraries, Milvus, document
+parsers and the payment SDK belong behind function-level imports, where
+they are loaded at startup or first use (or once in the pre-fork master,
+see gunicorn.conf.py) rather than by everything that imports the app.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Top-level packages that must not be imported by `import main`
+HEAVY_MODULES = (
+    "pymilvus", "pandas", "torch", "transformers", "sentence_transformers",
+    "unstructured", "pdfminer", "docx", "stripe",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> Tuple[float, Dict[str, float]]:
+    """Imports a module in a fresh interpreter; returns its total and every module's cumulative time, in ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    cumulative: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|", 2)
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total) / 1000
+    return cumulative.get(module, 0.0), cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", 800)))
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run is checked")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(max(args.runs, 1))]
+    total, cumulative = min(runs, key=lambda run: run[0])
+    eager: List[str] = sorted({name.split(".")[0] for name in cumulative} & set(HEAVY_MODULES))
+
+    print(f"import {args.module}: {total:.1f}ms (budget {args.budget_ms:.0f}ms, fastest of {len(runs)})")
+    # Top-level packages only, so nested modules are not counted twice
+    children = sorted(
+        ((name, ms) for name, ms in cumulative.items() if name != args.module and "." not in name),
+        key=lambda item: item[1], reverse=True,
+    )
+    for name, ms in children[:args.top]:
+        print(f"  {ms:9.1f}ms  {name}")
+
+    failed = False
+    if total > args.budget_ms:
+        print(f"FAIL: import {args.module} took {total:.1f}ms, over the {args.budget_ms:.0f}ms budget")
+        failed = True
+    if eager:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("ok")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
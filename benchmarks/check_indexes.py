@@ -0,0 +1,55 @@
+# study-assistant-backend/benchmarks/check_indexes.py
+"""
+Index usage check against a live MongoDB.
+
+    python -m benchmarks.check_indexes
+    python -m benchmarks.check_indexes --mongo-uri mongodb://localhost:27017 --db study_assistant_test
+
+Creates the indexes from app.db.indexes (as startup does; a no-op when they
+exist), runs explain() on a representative query for each one and fails
+(exit status 1) when the winning plan does not use the expected index,
+e.g. after a query shape or index definition drifted apart.
+"""
+
+import argparse
+import asyncio
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+from app.core.config import MONGO_URI, MONGO_DB_NAME
+from app.db.indexes import ensure_indexes, verify_indexes
+
+
+async def check(mongo_uri: str, db_name: str) -> bool:
+    client = AsyncIOMotorClient(mongo_uri, serverSelectionTimeoutMS=5000)
+    try:
+        db = client[db_name]
+        conflicts = await ensure_indexes(db)
+        results = await verify_indexes(db)
+    finally:
+        client.close()
+    for name, keys in conflicts.items():
+        print(f"  FAIL  {name} not built, {len(keys)} duplicated keys (see benchmarks/dedupe_unique_keys.py)")
+    for name, used in results.items():
+        print(f"  {'ok  ' if used else 'FAIL'}  {name}")
+    return not conflicts and all(results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=MONGO_URI)
+    parser.add_argument("--db", default=MONGO_DB_NAME)
+    args = parser.parse_args()
+
+    print(f"explaining representative queries on {args.db}")
+    try:
+        ok = asyncio.run(check(args.mongo_uri, args.db))
+    except PyMongoError as e:
+        print(f"FAIL: could not check indexes: {e}")
+        sys.exit(1)
+    print("ok" if ok else "FAIL: some indexes are not used by their queries")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
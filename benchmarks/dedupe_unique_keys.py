@@ -0,0 +1,104 @@
+# study-assistant-backend/benchmarks/dedupe_unique_keys.py
+"""
+One-off merge of documents that keep the unique indexes in app.db.indexes
+from being built. Databases written before those indexes existed can hold
+duplicates from racing signups and daily usage upserts; startup then logs
+the conflicting keys and runs without the index until they are merged.
+
+    python -m benchmarks.dedupe_unique_keys            # report only
+    python -m benchmarks.dedupe_unique_keys --apply    # merge, then build the indexes
+
+users.email_unique: the oldest account for an email is kept. Files and
+usage counters of the newer accounts move to it, then those are deleted.
+usage_logs.user_date_unique: one user's logs for the same day are merged
+into the oldest by summing their counters.
+
+Stop the application (or at least signups) while applying.
+"""
+
+import argparse
+import asyncio
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+from app.core.config import MONGO_URI, MONGO_DB_NAME
+from app.crud.usage_logs import COUNTER_FIELDS
+from app.db.indexes import ensure_indexes, find_duplicate_keys, get_index
+
+
+async def merge_users(db: AsyncIOMotorDatabase, apply: bool) -> int:
+    merged = 0
+    for group in await find_duplicate_keys(db, "users", get_index("users", "email_unique")):
+        kept_id, *duplicate_ids = group["ids"]
+        print(f"  users: {group['_id']['email']}: keeping {kept_id}, merging {len(duplicate_ids)}")
+        merged += len(duplicate_ids)
+        if not apply:
+            continue
+        kept, duplicates = str(kept_id), [str(doc_id) for doc_id in duplicate_ids]
+        await db.files.update_many({"user_id": {"$in": duplicates}}, {"$set": {"user_id": kept}})
+        # Added into the kept account's log for the same day, which may not be unique itself yet
+        async for log_doc in db.usage_logs.find({"user_id": {"$in": duplicates}}):
+            await db.usage_logs.update_one(
+                {"user_id": kept, "date": log_doc["date"]},
+                {"$inc": {field: log_doc.get(field, 0) for field in COUNTER_FIELDS}},
+                upsert=True
+            )
+            await db.usage_logs.delete_one({"_id": log_doc["_id"]})
+        await db.users.delete_many({"_id": {"$in": duplicate_ids}})
+    return merged
+
+
+async def merge_usage_logs(db: AsyncIOMotorDatabase, apply: bool) -> int:
+    merged = 0
+    for group in await find_duplicate_keys(db, "usage_logs", get_index("usage_logs", "user_date_unique")):
+        kept_id, *duplicate_ids = group["ids"]
+        print(f"  usage_logs: {group['_id']['user_id']} on {group['_id']['date']}: merging {len(duplicate_ids)}")
+        merged += len(duplicate_ids)
+        if not apply:
+            continue
+        duplicates = await db.usage_logs.find({"_id": {"$in": duplicate_ids}}).to_list(None)
+        totals = {field: sum(log_doc.get(field, 0) for log_doc in duplicates) for field in COUNTER_FIELDS}
+        await db.usage_logs.update_one({"_id": kept_id}, {"$inc": totals})
+        await db.usage_logs.delete_many({"_id": {"$in": duplicate_ids}})
+    return merged
+
+
+async def dedupe(db: AsyncIOMotorDatabase, apply: bool) -> bool:
+    """Merges (or with apply=False only lists) duplicates; True when every unique index is in place."""
+    # Users first: moving their usage logs can create new (user_id, date) duplicates
+    merged = await merge_users(db, apply) + await merge_usage_logs(db, apply)
+    if not apply:
+        print(f"{merged} documents would be merged; rerun with --apply")
+        return merged == 0
+    conflicts = await ensure_indexes(db)
+    for name, keys in conflicts.items():
+        print(f"  FAIL  {name} still has {len(keys)} duplicated keys")
+    print(f"merged {merged} documents")
+    return not conflicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=MONGO_URI)
+    parser.add_argument("--db", default=MONGO_DB_NAME)
+    parser.add_argument("--apply", action="store_true", help="merge the duplicates instead of only listing them")
+    args = parser.parse_args()
+
+    async def run() -> bool:
+        client = AsyncIOMotorClient(args.mongo_uri, serverSelectionTimeoutMS=5000)
+        try:
+            return await dedupe(client[args.db], args.apply)
+        finally:
+            client.close()
+
+    print(f"looking for duplicate unique keys in {args.db}")
+    try:
+        ok = asyncio.run(run())
+    except PyMongoError as e:
+        print(f"FAIL: could not dedupe: {e}")
+        sys.exit(1)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# study-assistant-backend/benchmarks/eval_retrieval.py
+"""
+Measures tutor retrieval recall and per-query latency on the bundled
+evaluation set (benchmarks/data/retrieval_eval.json).
+
+    python -m benchmarks.eval_retrieval --top-k 5
+    python -m benchmarks.eval_retrieval --dense   # also vector and hybrid modes
+
+Modes:
+  keyword  BM25 over the keyword index only
+  vector   exact cosine search with the embedding model (an upper bound for
+           Milvus ANN recall; requires sentence-transformers)
+  hybrid   reciprocal rank fusion of keyword and vector candidates
+  auto     what /tutor does: keyword-decisive questions are answered locally,
+           the rest are fused
+
+Reports recall@k, p50/p95 latency per query and, for auto, how many queries
+were answered without vector search.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, List
+from app.core.config import EMBEDDING_MODEL_NAME, HYBRID_CANDIDATES
+from app.services.hybrid_retrieval import answers_locally, reciprocal_rank_fusion
+from app.services.keyword_index import KeywordIndexBuilder, KeywordIndex, tokenize
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "data", "retrieval_eval.json")
+
+
+def keyword_search(index: KeywordIndex, question: str, candidates: int) -> List[int]:
+    return [doc_id for doc_id, _, _ in index.search(tokenize(question), candidates)]
+
+
+def make_vector_search(passages: List[str]) -> Callable[[str, int], List[int]]:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    passage_vectors = model.encode(passages, convert_to_numpy=True, normalize_embeddings=True)
+
+    def search(question: str, candidates: int) -> List[int]:
+        query_vector = model.encode([question], convert_to_numpy=True, normalize_embeddings=True)[0]
+        scores = passage_vectors @ query_vector
+        return [int(i) for i in np.argsort(-scores)[:candidates]]
+
+    return search
+
+
+def evaluate(name: str, queries: List[dict], retrieve: Callable[[str], List[int]], top_k: int) -> dict:
+    hits = 0
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        ranked = retrieve(query["question"])[:top_k]
+        latencies.append(time.perf_counter() - started)
+        hits += len(set(ranked) & set(query["relevant"])) / len(query["relevant"])
+    latencies.sort()
+    return {
+        "mode": name,
+        f"recall@{top_k}": round(hits / len(queries), 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+    }
+
+
+def run(top_k: int, candidates: int, dense: bool) -> List[dict]:
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        dataset = json.load(f)
+    passages, queries = dataset["passages"], dataset["queries"]
+
+    builder = KeywordIndexBuilder()
+    spans, offset = [], 0
+    for passage in passages:
+        spans.append((offset, passage))
+        offset += len(passage)
+    builder.add(spans)
+    # Round-trip through the stored format so the measured index is what /tutor loads;
+    # the passages stand in for one section holding the whole text
+    index = KeywordIndex.from_document(builder.build([0]).to_document())
+
+    local_answers = 0
+
+    def auto(question: str, vector_search=None) -> List[int]:
+        nonlocal local_answers
+        query_terms = set(tokenize(question))
+        hits = index.search(query_terms, candidates)
+        if answers_locally(hits, len(query_terms)):
+            local_answers += 1
+            return [doc_id for doc_id, _, _ in hits]
+        keyword_ranking = [doc_id for doc_id, _, _ in hits]
+        if vector_search is None:
+            return keyword_ranking
+        return fuse(vector_search(question, candidates), keyword_ranking)
+
+    def fuse(*rankings: List[int]) -> List[int]:
+        fused = reciprocal_rank_fusion([[str(doc_id) for doc_id in ranking] for ranking in rankings])
+        return [int(doc_id) for doc_id in fused]
+
+    results = [evaluate("keyword", queries, lambda q: keyword_search(index, q, candidates), top_k)]
+    if dense:
+        vector_search = make_vector_search(passages)
+        results.append(evaluate("vector", queries, lambda q: vector_search(q, candidates), top_k))
+        results.append(evaluate(
+            "hybrid", queries,
+            lambda q: fuse(vector_search(q, candidates), keyword_search(index, q, candidates)), top_k
+        ))
+        results.append(evaluate("auto", queries, lambda q: auto(q, vector_search), top_k))
+    else:
+        results.append(evaluate("auto", queries, auto, top_k))
+    results[-1]["answered_locally"] = f"{local_answers}/{len(queries)}"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=HYBRID_CANDIDATES)
+    parser.add_argument("--dense", action="store_true", help="also evaluate vector and hybrid retrieval")
+    args = parser.parse_args()
+    for result in run(args.top_k, args.candidates, args.dense):
+        print("  ".join(f"{key}: {value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# study-assistant-backend/benchmarks/results.py
+"""Saving benchmark results as JSON and comparing runs for regressions."""
+
+import json
+import os
+import platform
+import time
+from typing import Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def latency_summary(latencies: List[float], elapsed: float, errors: int = 0) -> dict:
+    """Throughput and p50/p95/p99 latency (ms) for one endpoint or operation."""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "throughput_per_second": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def save_results(name: str, results: dict, output: Optional[str] = None) -> str:
+    """Writes results with run metadata; defaults to benchmarks/results/<name>-<timestamp>.json."""
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    document = {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        **results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, default=str)
+    return output
+
+
+def compare(current: Dict[str, dict], baseline_path: str, threshold: float) -> List[str]:
+    """
+    Compares per-operation summaries against a saved run. Reports an
+    operation as a regression when its p95 latency grew, or its throughput
+    dropped, by more than `threshold` (a fraction, e.g. 0.1 for 10%).
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["operations"]
+    lines = []
+    for name, summary in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        p95_change = (summary["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        rate_change = (
+            (summary["throughput_per_second"] - before["throughput_per_second"]) / before["throughput_per_second"]
+            if before["throughput_per_second"] else 0.0
+        )
+        regressed = p95_change > threshold or rate_change < -threshold
+        lines.append(
+            f"{'REGRESSION' if regressed else 'ok':<10} {name:<32} p95 {p95_change:+.1%}  throughput {rate_change:+.1%}"
+        )
+    return lines
@@ -0,0 +1,608 @@
+# study-assistant-backend/benchmarks/standins.py
+"""
+In-process stand-ins for MongoDB (Motor), Milvus and the AI models, used by
+the benchmarks to exercise the real application code without external
+services or model weights.
+
+They implement exactly the subset of each API the app uses, with optional
+artificial latency so results stay comparable with a networked deployment.
+"""
+
+import asyncio
+import copy
+import hashlib
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.services.model_registry import ModelRegistry
+
+
+# --- MongoDB -----------------------------------------------------------------
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _compare(value, op: str, operand) -> bool:
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    if op == "$exists":
+        return (value is not None) == bool(operand)
+    if value is None:
+        return False
+    if op == "$lt":
+        return value < operand
+    if op == "$lte":
+        return value <= operand
+    if op == "$gt":
+        return value > operand
+    if op == "$gte":
+        return value >= operand
+    raise NotImplementedError(f"Query operator {op} is not supported by the stand-in")
+
+
+def _expr_operand(doc: dict, operand):
+    return _get(doc, operand[1:]) if isinstance(operand, str) and operand.startswith("$") else operand
+
+
+def _matches_expr(doc: dict, expr: dict) -> bool:
+    """Evaluates the comparison-only subset of $expr, e.g. {"$lt": ["$attempts", "$max_attempts"]}."""
+    return all(
+        _compare(_expr_operand(doc, left), op, _expr_operand(doc, right)) for op, (left, right) in expr.items()
+    )
+
+
+def matches(doc: dict, query: dict) -> bool:
+    """Evaluates a MongoDB filter against a document."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$expr":
+            if not _matches_expr(doc, condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            value = _get(doc, key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif _get(doc, key) != condition:
+            return False
+    return True
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool):
+    for op, fields in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            doc.update(copy.deepcopy(fields))
+        elif op == "$unset":
+            for field in fields:
+                doc.pop(field, None)
+        elif op == "$inc":
+            for field, amount in fields.items():
+                doc[field] = doc.get(field, 0) + amount
+        elif op != "$setOnInsert":
+            raise NotImplementedError(f"Update operator {op} is not supported by the stand-in")
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    include = {field for field, flag in projection.items() if flag and field != "_id"}
+    if include:
+        projected = {field: doc[field] for field in include if field in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            projected["_id"] = doc["_id"]
+        return projected
+    for field, flag in projection.items():
+        if not flag:
+            doc.pop(field, None)
+    return doc
+
+
+def _sort_key(value):
+    # MongoDB orders missing/null values before everything else
+    return (0, 0) if value is None else (1, value)
+
+
+def _sort(docs: List[dict], sort) -> List[dict]:
+    for field, direction in reversed(sort):
+        docs.sort(key=lambda doc: _sort_key(_get(doc, field)), reverse=direction < 0)
+    return docs
+
+
+class MemoryCursor:
+    """Async cursor over a snapshot of matching documents."""
+
+    def __init__(self, collection: "MemoryCollection", query: dict, projection: Optional[dict]):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = None
+        self._limit = 0
+        self._skip = 0
+        self._results: Optional[Iterator[dict]] = None
+
+    def sort(self, key, direction: int = 1) -> "MemoryCursor":
+        self._sort = [(key, direction)] if isinstance(key, str) else list(key)
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def batch_size(self, count: int) -> "MemoryCursor":
+        return self
+
+    def __aiter__(self):
+        return self
+
+    def _documents(self) -> List[dict]:
+        docs = [doc for doc in self._collection.candidates(self._query) if matches(doc, self._query)]
+        if self._sort:
+            docs = _sort(docs, self._sort)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def __anext__(self) -> dict:
+        if self._results is None:
+            await self._collection.round_trip()
+            self._results = iter(self._documents())
+        try:
+            return next(self._results)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        docs = [doc async for doc in self]
+        return docs[:length] if length else docs
+
+
+def _group(docs: List[dict], spec: dict) -> List[dict]:
+    """The $group stage with a document _id of field paths and $sum/$push accumulators."""
+    groups: Dict[tuple, dict] = {}
+    for doc in docs:
+        key = {name: _expr_operand(doc, path) for name, path in spec["_id"].items()}
+        group = groups.setdefault(tuple(key.values()), {"_id": key})
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            (op, operand), = accumulator.items()
+            value = _expr_operand(doc, operand)
+            if op == "$sum":
+                group[name] = group.get(name, 0) + value
+            elif op == "$push":
+                group.setdefault(name, []).append(value)
+            else:
+                raise NotImplementedError(f"Accumulator {op} is not supported by the stand-in")
+    return list(groups.values())
+
+
+class MemoryPipelineCursor(MemoryCursor):
+    """Cursor over the $match/$sort/$group subset of an aggregation pipeline."""
+
+    def __init__(self, collection: "MemoryCollection", pipeline: List[dict]):
+        super().__init__(collection, {}, None)
+        self._pipeline = pipeline
+
+    def _documents(self) -> List[dict]:
+        docs = list(self._collection.docs.values())
+        for stage in self._pipeline:
+            (op, spec), = stage.items()
+            if op == "$match":
+                docs = [doc for doc in docs if matches(doc, spec)]
+            elif op == "$sort":
+                docs = _sort(docs, list(spec.items()))
+            elif op == "$group":
+                docs = _group(docs, spec)
+            else:
+                raise NotImplementedError(f"Pipeline stage {op} is not supported by the stand-in")
+        return copy.deepcopy(docs)
+
+
+class MemoryCollection:
+    """A Motor collection kept in a dict, with unique index enforcement."""
+
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        self.docs: Dict[object, dict] = {}
+        self._unique_keys: List[List[str]] = []
+        self.operations = 0
+
+    async def round_trip(self):
+        self.operations += 1
+        await asyncio.sleep(self.database.latency_seconds)
+
+    def _check_unique(self, doc: dict, ignore_id=None):
+        for fields in self._unique_keys:
+            key = [_get(doc, field) for field in fields]
+            for other_id, other in self.docs.items():
+                if other_id != ignore_id and [_get(other, field) for field in fields] == key:
+                    raise DuplicateKeyError(f"E11000 duplicate key in {self.name}: {dict(zip(fields, key))}")
+
+    def _insert(self, doc: dict) -> object:
+        doc = copy.deepcopy(doc)
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError(f"E11000 duplicate key in {self.name}: _id {doc['_id']}")
+        self._check_unique(doc)
+        self.docs[doc["_id"]] = doc
+        return doc["_id"]
+
+    def candidates(self, query: dict):
+        """Documents a query can match; lookups by _id skip the scan like the _id index would."""
+        doc_id = query.get("_id")
+        if doc_id is not None and not isinstance(doc_id, dict):
+            doc = self.docs.get(doc_id)
+            return [doc] if doc is not None else []
+        return list(self.docs.values())
+
+    def _first(self, query: dict, sort=None) -> Optional[dict]:
+        docs = [doc for doc in self.candidates(query) if matches(doc, query)]
+        if sort:
+            docs = _sort(docs, sort)
+        return docs[0] if docs else None
+
+    def _update(self, query: dict, update: dict, upsert: bool, sort=None):
+        """Returns (before, after, upserted_id) for the first matching document."""
+        doc = self._first(query, sort)
+        if doc is not None:
+            before = copy.deepcopy(doc)
+            updated = copy.deepcopy(doc)
+            _apply_update(updated, update, inserting=False)
+            self._check_unique(updated, ignore_id=doc["_id"])
+            self.docs[doc["_id"]] = updated
+            return before, updated, None
+        if not upsert:
+            return None, None, None
+        seed = {
+            key: value for key, value in query.items()
+            if not key.startswith("$") and not (isinstance(value, dict) and any(k.startswith("$") for k in value))
+        }
+        _apply_update(seed, update, inserting=True)
+        upserted_id = self._insert(seed)
+        return None, self.docs[upserted_id], upserted_id
+
+    async def create_indexes(self, indexes) -> List[str]:
+        await self.round_trip()
+        names = []
+        for index in indexes:
+            spec = index.document
+            if spec.get("unique"):
+                fields = list(spec["key"].keys())
+                if fields not in self._unique_keys:
+                    # Like MongoDB, refuse to build over documents that already collide
+                    keys = [tuple(_get(doc, field) for field in fields) for doc in self.docs.values()]
+                    if len(set(keys)) < len(keys):
+                        raise DuplicateKeyError(f"E11000 duplicate key in {self.name} building {spec['name']}")
+                    self._unique_keys.append(fields)
+            names.append(spec["name"])
+        return names
+
+    async def insert_one(self, doc: dict):
+        await self.round_trip()
+        inserted_id = self._insert(doc)
+        # Motor adds the generated _id to the caller's document
+        doc["_id"] = inserted_id
+        return SimpleNamespace(inserted_id=inserted_id, acknowledged=True)
+
+    async def insert_many(self, docs: List[dict], ordered: bool = True):
+        await self.round_trip()
+        inserted_ids = []
+        for doc in docs:
+            doc["_id"] = self._insert(doc)
+            inserted_ids.append(doc["_id"])
+        return SimpleNamespace(inserted_ids=inserted_ids, acknowledged=True)
+
+    async def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        await self.round_trip()
+        doc = self._first(query or {}, kwargs.get("sort"))
+        return _project(doc, projection or kwargs.get("projection")) if doc is not None else None
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        return MemoryCursor(self, query or {}, projection or kwargs.get("projection"))
+
+    def aggregate(self, pipeline: List[dict], **kwargs) -> MemoryPipelineCursor:
+        return MemoryPipelineCursor(self, pipeline)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        await self.round_trip()
+        before, after, upserted_id = self._update(query, update, upsert)
+        matched = before is not None
+        return SimpleNamespace(
+            matched_count=int(matched),
+            modified_count=int(matched and before != after),
+            upserted_id=upserted_id,
+            acknowledged=True,
+        )
+
+    async def find_one_and_update(
+        self, query: dict, update: dict, projection: Optional[dict] = None, sort=None,
+        upsert: bool = False, return_document=ReturnDocument.BEFORE, **kwargs
+    ) -> Optional[dict]:
+        await self.round_trip()
+        before, after, _ = self._update(query, update, upsert, sort)
+        result = after if return_document == ReturnDocument.AFTER else before
+        return _project(result, projection) if result is not None else None
+
+    async def find_one_and_delete(self, query: dict, projection: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        await self.round_trip()
+        doc = self._first(query, kwargs.get("sort"))
+        if doc is None:
+            return None
+        del self.docs[doc["_id"]]
+        return _project(doc, projection)
+
+    async def replace_one(self, query: dict, replacement: dict, upsert: bool = False):
+        await self.round_trip()
+        doc = self._first(query)
+        if doc is not None:
+            replacement = {**copy.deepcopy(replacement), "_id": doc["_id"]}
+            self._check_unique(replacement, ignore_id=doc["_id"])
+            self.docs[doc["_id"]] = replacement
+            return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None, acknowledged=True)
+        if not upsert:
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None, acknowledged=True)
+        upserted_id = self._insert(replacement)
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=upserted_id, acknowledged=True)
+
+    async def delete_one(self, query: dict):
+        await self.round_trip()
+        doc = self._first(query)
+        if doc is not None:
+            del self.docs[doc["_id"]]
+        return SimpleNamespace(deleted_count=int(doc is not None), acknowledged=True)
+
+    async def update_many(self, query: dict, update: dict):
+        await self.round_trip()
+        matched = modified = 0
+        for doc in [doc for doc in self.candidates(query) if matches(doc, query)]:
+            updated = copy.deepcopy(doc)
+            _apply_update(updated, update, inserting=False)
+            self._check_unique(updated, ignore_id=doc["_id"])
+            matched += 1
+            modified += int(updated != doc)
+            self.docs[doc["_id"]] = updated
+        return SimpleNamespace(matched_count=matched, modified_count=modified, acknowledged=True)
+
+    async def delete_many(self, query: dict):
+        await self.round_trip()
+        doomed = [doc["_id"] for doc in self.candidates(query) if matches(doc, query)]
+        for doc_id in doomed:
+            del self.docs[doc_id]
+        return SimpleNamespace(deleted_count=len(doomed), acknowledged=True)
+
+    async def bulk_write(self, operations, ordered: bool = True):
+        await self.round_trip()
+        modified = upserted = 0
+        for operation in operations:
+            before, after, upserted_id = self._update(operation._filter, operation._doc, operation._upsert)
+            modified += int(before is not None and before != after)
+            upserted += int(upserted_id is not None)
+        return SimpleNamespace(modified_count=modified, upserted_count=upserted, acknowledged=True)
+
+
+class MemoryDatabase:
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def operation_counts(self) -> Dict[str, int]:
+        return {name: collection.operations for name, collection in self._collections.items()}
+
+
+class MemoryClient:
+    """Drop-in for AsyncIOMotorClient: one shared in-memory database per name."""
+
+    latency_seconds = 0.0
+    databases: Dict[str, MemoryDatabase] = {}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self.databases:
+            self.databases[name] = MemoryDatabase(self.latency_seconds)
+        return self.databases[name]
+
+    def close(self):
+        pass
+
+
+# --- Milvus ------------------------------------------------------------------
+
+_HASH_EXPR = re.compile(r'content_hash == "([0-9a-f]+)"')
+
+
+class _Hit:
+    def __init__(self, hit_id: int, distance: float, text: str):
+        self.id = hit_id
+        self.distance = distance
+        self.entity = {"text": text}
+
+
+class MemoryMilvusCollection:
+    """
+    Brute-force stand-in for the pooled chunk collection. Vectors are kept
+    per content hash, like the partition-key layout of the real collection.
+    """
+
+    def __init__(self, search_latency_seconds: float = 0.0, insert_latency_seconds: float = 0.0):
+        self.search_latency_seconds = search_latency_seconds
+        self.insert_latency_seconds = insert_latency_seconds
+        self.index_type = "FLAT"
+        self._texts: Dict[str, List[str]] = {}
+        self._vectors: Dict[str, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.search_vectors = 0
+        self.inserts = 0
+
+    def search_params(self, **overrides) -> dict:
+        return {"metric_type": "IP", "params": overrides}
+
+    def search(self, data, anns_field: str, param: dict, limit: int, expr: str, output_fields=None):
+        time.sleep(self.search_latency_seconds)
+        content_hash = _HASH_EXPR.fullmatch(expr).group(1)
+        with self._lock:
+            self.searches += 1
+            self.search_vectors += len(data)
+            texts = list(self._texts.get(content_hash, []))
+            vectors = np.vstack(self._vectors[content_hash]) if texts else None
+        results = []
+        for query in np.asarray(data, dtype=np.float32):
+            if vectors is None:
+                results.append([])
+                continue
+            scores = vectors @ query
+            best = np.argsort(-scores)[:limit]
+            results.append([_Hit(int(i), float(scores[i]), texts[i]) for i in best])
+        return results
+
+    def insert(self, columns):
+        time.sleep(self.insert_latency_seconds)
+        hashes, texts, vectors = columns
+        with self._lock:
+            self.inserts += 1
+            for content_hash, text, vector in zip(hashes, texts, np.asarray(vectors, dtype=np.float32)):
+                self._texts.setdefault(content_hash, []).append(text)
+                self._vectors.setdefault(content_hash, []).append(vector)
+
+    def delete(self, expr: str):
+        content_hash = _HASH_EXPR.fullmatch(expr).group(1)
+        with self._lock:
+            self._texts.pop(content_hash, None)
+            self._vectors.pop(content_hash, None)
+
+    def stats(self) -> dict:
+        return {
+            "searches": self.searches,
+            "search_vectors": self.search_vectors,
+            "inserts": self.inserts,
+            "documents": len(self._texts),
+        }
+
+
+# --- Models ------------------------------------------------------------------
+
+_WORD = re.compile(r"\w+")
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class FakeEmbedder:
+    """
+    Deterministic bag-of-words embedder (feature hashing), so texts sharing
+    words get similar vectors. Latency is modelled as a fixed cost per call
+    plus a cost per text, which is what makes batching pay off.
+    """
+
+    def __init__(self, dim: int, seconds_per_call: float = 0.0, seconds_per_text: float = 0.0):
+        self.dim = dim
+        self.seconds_per_call = seconds_per_call
+        self.seconds_per_text = seconds_per_text
+        self.calls = 0
+        self.texts = 0
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        self.calls += 1
+        self.texts += len(texts)
+        time.sleep(self.seconds_per_call + self.seconds_per_text * len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                h = _stable_hash(word)
+                vectors[row, h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        return vectors
+
+
+class FakeGenerator:
+    """
+    Deterministic text2text pipeline stand-in. Produces well-formed
+    flashcard/quiz JSON or a tutor answer derived from the prompt.
+    """
+
+    def __init__(self, seconds_per_call: float = 0.0):
+        self.seconds_per_call = seconds_per_call
+        self.calls = 0
+
+    def __call__(self, prompt: str, max_new_tokens: int = 512, **kwargs) -> List[dict]:
+        import json
+
+        self.calls += 1
+        time.sleep(self.seconds_per_call)
+        body = prompt.split("\n\n", 1)[-1]
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", body) if len(s.strip()) > 20][:3]
+        if prompt.startswith("Create study flashcards"):
+            items = [{"question": f"Explain: {s[:60]}?", "answer": s} for s in sentences]
+            text = json.dumps(items)
+        elif prompt.startswith("Create quiz questions"):
+            items = [
+                {
+                    "question_type": "MCQ",
+                    "difficulty": "Medium",
+                    "question": f"Which statement is true about {s.split()[0]}?",
+                    "options": [s[:40], "None of the above"],
+                    "correct_answer": s[:40],
+                }
+                for s in sentences
+            ]
+            text = json.dumps(items)
+        else:
+            text = "Step 1: " + (sentences[0] if sentences else "Review the notes.")
+        return [{"generated_text": text}]
+
+
+class FakeModelRegistry(ModelRegistry):
+    """ModelRegistry whose load() installs the fake models instead of downloading weights."""
+
+    def __init__(self, dim: int, embed_call_ms: float = 0.0, embed_text_ms: float = 0.0, generate_ms: float = 0.0):
+        super().__init__(embedding_model_name="fake-embedder", generation_model_name="fake-generator")
+        self._fakes = (
+            FakeEmbedder(dim, embed_call_ms / 1000, embed_text_ms / 1000),
+            FakeGenerator(generate_ms / 1000),
+        )
+
+    def load(self) -> "FakeModelRegistry":
+        self.embedding_model, self.generation_model = self._fakes
+        self.load_seconds = {"embedding": 0.0, "generation": 0.0}
+        return self
@@ -0,0 +1,31 @@
+# study-assistant-backend/gunicorn.conf.py
+"""
+Multi-worker serving with models shared between workers:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The master imports the app and loads the model weights once, then forks
+the workers, which share those pages copy-on-write (app.services.preload).
+Each worker still opens its own MongoDB and Milvus connections and starts
+its own executors in the startup event.
+
+`uvicorn --workers N` spawns fresh interpreters instead of forking, so
+every worker there imports everything and loads its own models.
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Import main:app in the master so workers are forked from a warm process
+preload_app = True
+# Model loading happens before the workers exist, so they boot quickly
+timeout = int(os.getenv("WORKER_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", 30))
+
+
+def on_starting(server):
+    from app.services.preload import preload_for_workers
+
+    preload_for_workers()
@@ -8,11 +8,26 @@ import os
 load_dotenv()
 
 # Import database connections
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_mongo_db
 from app.db.milvus import connect_to_milvus, disconnect_from_milvus
 
+# Import the shared model registry and AI executor
+from app.services.model_registry import load_model_registry
+from app.services.executor import start_ai_executor, shutdown_ai_executor
+
+# Import the background ingestion workers
+from app.services.ingestion_queue import start_ingestion_workers, stop_ingestion_workers
+
+# Import the usage accounting engine
+from app.services.usage_tracker import start_usage_tracker, stop_usage_tracker
+
+# Import request instrumentation
+from app.core.middleware import RequestMetricsMiddleware
+from app.services.metrics import start_loop_lag_monitor, stop_loop_lag_monitor
+from app.services.profiler import start_slow_request_profiler, stop_slow_request_profiler
+
 # Import API routers
-from app.api import auth, files, ai, payments
+from app.api import auth, files, ai, payments, metrics
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -21,23 +36,41 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Per-route latency, status and in-flight counts for /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
 # Connect to databases on startup
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
     await connect_to_milvus()
+    # Load the embedding and generation models once, before serving requests
+    load_model_registry()
+    start_ai_executor()
+    # Resume any queued or interrupted ingestion jobs
+    start_ingestion_workers(get_mongo_db())
+    start_usage_tracker(get_mongo_db())
+    start_loop_lag_monitor()
+    start_slow_request_profiler()
 
 # Disconnect from databases on shutdown
 @app.on_event("shutdown")
 async def shutdown_event():
+    stop_slow_request_profiler()
+    await stop_loop_lag_monitor()
+    await stop_ingestion_workers()
+    # Flush pending usage counters before the database connection closes
+    await stop_usage_tracker()
     await close_mongo_connection()
     await disconnect_from_milvus()
+    shutdown_ai_executor()
 
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(files.router, prefix="/api/v1/files", tags=["Files"])
 app.include_router(ai.router, prefix="/api/v1/ai", tags=["AI Services"])
 app.include_router(payments.router, prefix="/api/v1/payments", tags=["Payments"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 @app.get("/")
 def read_root():
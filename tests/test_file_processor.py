@@ -0,0 +1,61 @@
+# study-assistant-backend/tests/test_file_processor.py
+
+import asyncio
+import random
+from typing import List
+from app.services.file_processor import _SectionWriter
+
+
+class _RecordingSections:
+    """Stands in for ContentSectionCRUD and keeps the sections in order."""
+
+    def __init__(self):
+        self.sections: List[str] = []
+
+    async def insert_sections(self, content_hash: str, first_seq: int, texts: List[str]) -> bool:
+        assert first_seq == len(self.sections)
+        self.sections.extend(texts)
+        return True
+
+
+def _document(chars: int = 150_000, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    paragraphs, length = [], 0
+    while length < chars:
+        paragraph = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(40, 120))) + ".\n\n"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return "".join(paragraphs)
+
+
+def _sections(text: str, piece_chars: int) -> List[str]:
+    async def write():
+        recorder = _RecordingSections()
+        writer = _SectionWriter(recorder, "content-hash")
+        for start in range(0, len(text), piece_chars):
+            await writer.write([text[start:start + piece_chars]])
+        await writer.close()
+        return recorder.sections
+
+    return asyncio.run(write())
+
+
+def test_sections_cover_the_text_regardless_of_piece_size():
+    text = _document()
+    by_block = _sections(text, 64 * 1024)
+    assert "".join(by_block) == text
+    assert _sections(text, 3 * 1024) == by_block
+    assert len(by_block) > 5
+
+
+def test_small_edit_reuses_untouched_sections():
+    text = _document()
+    edited = text[:500] + "a small insert " + text[500:]
+    for piece_chars in (64 * 1024, 3 * 1024):
+        before = _sections(text, piece_chars)
+        after = _sections(edited, piece_chars)
+        changed = [section for section in after if section not in set(before)]
+        # Only the section holding the edit differs
+        assert len(changed) == 1
+        assert "a small insert" in changed[0]
@@ -0,0 +1,34 @@
+# study-assistant-backend/tests/test_hybrid_retrieval.py
+
+import asyncio
+from app.services.hybrid_retrieval import KeywordIndexStore
+
+
+def test_waiters_load_the_index_themselves_when_the_leader_is_cancelled():
+    async def scenario():
+        store = KeywordIndexStore()
+        leader_started = asyncio.Event()
+        loads = []
+
+        async def slow_load(content_hash):
+            loads.append(content_hash)
+            leader_started.set()
+            await asyncio.sleep(3600)
+
+        async def empty_load(content_hash):
+            loads.append(content_hash)
+            return None
+
+        leader = asyncio.create_task(store.get_or_load("content-hash", slow_load))
+        await leader_started.wait()
+        waiter = asyncio.create_task(store.get_or_load("content-hash", empty_load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        # The waiter must not hang on the abandoned load
+        assert await asyncio.wait_for(waiter, timeout=1) is None
+        assert leader.cancelled()
+        assert loads == ["content-hash", "content-hash"]
+        assert store.stats()["missing"] == 1
+
+    asyncio.run(scenario())
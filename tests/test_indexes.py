@@ -0,0 +1,66 @@
+# study-assistant-backend/tests/test_indexes.py
+
+import asyncio
+import os
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+from benchmarks.dedupe_unique_keys import dedupe
+from benchmarks.standins import MemoryDatabase
+from app.core.config import MONGO_URI
+from app.db.indexes import EXPLAIN_QUERIES, ensure_indexes, verify_indexes
+
+# explain() needs a real query planner; the in-memory stand-ins have none
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI", MONGO_URI)
+MONGO_TEST_DB = "study_assistant_index_test"
+
+
+def _insert(collection, **fields):
+    doc_id = ObjectId()
+    collection.docs[doc_id] = {"_id": doc_id, **fields}
+    return doc_id
+
+
+def test_duplicates_are_reported_and_merged_instead_of_failing_startup():
+    db = MemoryDatabase()
+    kept = _insert(db.users, email="a@example.com", plan="free")
+    duplicate = _insert(db.users, email="a@example.com", plan="free")
+    _insert(db.usage_logs, user_id=str(kept), date="2026-01-01", qna_count=1, flashcard_count=0)
+    _insert(db.usage_logs, user_id=str(duplicate), date="2026-01-01", qna_count=2, flashcard_count=1)
+    _insert(db.files, user_id=str(duplicate))
+
+    conflicts = asyncio.run(ensure_indexes(db))
+    assert conflicts == {"users.email_unique": [{"email": "a@example.com"}]}
+
+    assert asyncio.run(dedupe(db, apply=True))
+    assert list(db.users.docs) == [kept]
+    (log_doc,) = db.usage_logs.docs.values()
+    assert (log_doc["user_id"], log_doc["qna_count"], log_doc["flashcard_count"]) == (str(kept), 3, 1)
+    assert [file_doc["user_id"] for file_doc in db.files.docs.values()] == [str(kept)]
+    assert asyncio.run(ensure_indexes(db)) == {}
+
+
+async def _explain_probes():
+    client = AsyncIOMotorClient(MONGO_TEST_URI, serverSelectionTimeoutMS=2000)
+    try:
+        try:
+            await client.admin.command("ping")
+        except PyMongoError:
+            return None
+        await client.drop_database(MONGO_TEST_DB)
+        db = client[MONGO_TEST_DB]
+        assert await ensure_indexes(db) == {}
+        results = await verify_indexes(db)
+        await client.drop_database(MONGO_TEST_DB)
+        return results
+    finally:
+        client.close()
+
+
+def test_representative_queries_use_their_indexes():
+    results = asyncio.run(_explain_probes())
+    if results is None:
+        pytest.skip(f"no MongoDB reachable at {MONGO_TEST_URI} (set MONGO_TEST_URI to run the explain() check)")
+    assert set(results) == {f"{collection}.{index}" for collection, index in EXPLAIN_QUERIES}
+    assert [name for name, used in results.items() if not used] == []
@@ -0,0 +1,67 @@
+# study-assistant-backend/tests/test_ingestion_queue.py
+
+import asyncio
+from benchmarks.standins import MemoryDatabase
+from app.crud.jobs import JobCRUD
+from app.services import ingestion_queue
+from app.services.ingestion_queue import INGEST_JOB, IngestionWorkerPool
+
+
+def _run(monkeypatch, tmp_path, process_seconds: float, extend_lease):
+    """Runs one claimed job on a pool with a short lease; returns (job after, processing finished, spool kept)."""
+    spool = tmp_path / "upload.txt"
+    spool.write_text("notes")
+    finished = []
+
+    async def process(file_path, content_hash, db):
+        await asyncio.sleep(process_seconds)
+        finished.append(content_hash)
+
+    monkeypatch.setattr(ingestion_queue, "process_and_embed_file", process)
+
+    async def scenario():
+        db = MemoryDatabase()
+        pool = IngestionWorkerPool(db, concurrency=1, lease_seconds=0.3)
+        monkeypatch.setattr(pool.jobs_crud, "extend_lease", extend_lease)
+        await pool.jobs_crud.create_job(INGEST_JOB, {"file_path": str(spool), "content_hash": "content-hash"})
+        job = await pool.jobs_crud.claim_next(INGEST_JOB, pool.worker_id, pool.lease_seconds)
+        await asyncio.wait_for(pool._run_job(job), timeout=5)
+        return await pool.jobs_crud.get_job_by_id(job.id)
+
+    job = asyncio.run(scenario())
+    return job, bool(finished), spool.exists()
+
+
+def test_job_stops_when_its_lease_cannot_be_renewed(monkeypatch, tmp_path):
+    async def unreachable(*args):
+        raise ConnectionError("mongo unreachable")
+
+    job, finished, spool_kept = _run(monkeypatch, tmp_path, 3600, unreachable)
+    # Left running for the lease to lapse and another worker to reclaim, with its upload intact
+    assert (job.status, finished, spool_kept) == ("running", False, True)
+
+
+def test_transient_renewal_errors_are_retried(monkeypatch, tmp_path):
+    calls = []
+
+    async def flaky(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise ConnectionError("mongo blip")
+        return True
+
+    job, finished, spool_kept = _run(monkeypatch, tmp_path, 0.5, flaky)
+    assert (job.status, finished, spool_kept) == ("done", True, False)
+    assert len(calls) > 1
+
+
+def test_only_the_lease_owner_can_complete_a_job():
+    async def scenario():
+        jobs_crud = JobCRUD(MemoryDatabase().jobs)
+        await jobs_crud.create_job(INGEST_JOB, {})
+        job = await jobs_crud.claim_next(INGEST_JOB, "worker-a", 60)
+        assert not await jobs_crud.mark_done(job.id, "worker-b")
+        assert not await jobs_crud.mark_failed(job.model_copy(update={"worker_id": "worker-b"}), "boom", 0)
+        assert await jobs_crud.mark_done(job.id, "worker-a")
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+# study-assistant-backend/tests/test_middleware.py
+
+import asyncio
+from fastapi import APIRouter, FastAPI
+from benchmarks.bench_api import ASGIClient
+from app.core.middleware import RequestMetricsMiddleware
+from app.services.metrics import metrics
+
+
+def test_requests_are_labelled_by_route_template():
+    router = APIRouter()
+
+    @router.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {}
+
+    @router.get("/{file_id}/quizzes")
+    async def get_quizzes(file_id: str):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/files")
+    app.add_middleware(RequestMetricsMiddleware)
+
+    async def scenario():
+        client = ASGIClient(app)
+        # Parameter values equal to literal segments of the path
+        for path in ("/api/v1/files/jobs/jobs", "/api/v1/files/quizzes/quizzes", "/missing"):
+            await client.request("GET", path)
+
+    metrics.requests.clear()
+    asyncio.run(scenario())
+    assert sorted(route for _, route, _ in metrics.requests) == [
+        "/api/v1/files/jobs/{job_id}", "/api/v1/files/{file_id}/quizzes", "unmatched"
+    ]
@@ -0,0 +1,52 @@
+# study-assistant-backend/tests/test_usage_logs.py
+
+import asyncio
+from datetime import date
+from benchmarks.standins import MemoryCollection, MemoryDatabase
+from app.crud.usage_logs import UsageLogCRUD
+from app.db.indexes import INDEXES
+
+
+class _LosingRaceCollection(MemoryCollection):
+    """Lets a concurrent request insert the day's log between our filter miss and our upsert."""
+
+    def _insert(self, doc: dict) -> object:
+        if not self.docs:
+            super()._insert({"user_id": doc["user_id"], "date": doc["date"], "qna_count": 1, "flashcard_count": 0})
+        return super()._insert(doc)
+
+
+def _crud(collection: MemoryCollection) -> UsageLogCRUD:
+    asyncio.run(collection.create_indexes(INDEXES["usage_logs"]))
+    return UsageLogCRUD(collection)
+
+
+def _count(collection: MemoryCollection) -> int:
+    (log_doc,) = collection.docs.values()
+    return log_doc["qna_count"]
+
+
+def test_losing_the_first_insert_of_the_day_still_consumes():
+    collection = _LosingRaceCollection(MemoryDatabase(), "usage_logs")
+    crud = _crud(collection)
+    assert asyncio.run(crud.try_consume("user", "qna", 20)) == date.today().isoformat()
+    assert _count(collection) == 2
+
+
+def test_consume_stops_at_the_limit():
+    collection = MemoryCollection(MemoryDatabase(), "usage_logs")
+    crud = _crud(collection)
+    today = date.today().isoformat()
+    assert [asyncio.run(crud.try_consume("user", "qna", 2)) for _ in range(3)] == [today, today, None]
+    assert asyncio.run(crud.try_consume("other", "qna", 0)) is None
+    assert _count(collection) == 2
+
+
+def test_refund_credits_the_day_that_was_charged():
+    collection = MemoryCollection(MemoryDatabase(), "usage_logs")
+    crud = _crud(collection)
+    # Charged just before midnight, failed just after: today's log holds a different use
+    collection._insert({"user_id": "user", "date": "2000-01-01", "qna_count": 1, "flashcard_count": 0})
+    asyncio.run(crud.try_consume("user", "qna", 20))
+    assert asyncio.run(crud.refund("user", "qna", "2000-01-01"))
+    assert sorted(log_doc["qna_count"] for log_doc in collection.docs.values()) == [0, 1]